@@ -0,0 +1,3 @@
+"""
+Benchmarks of the ftcli commands. Run them with ``python -m benchmarks`` from the project folder.
+"""
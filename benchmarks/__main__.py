@@ -0,0 +1,216 @@
+import fnmatch
+import json
+import os
+
+import click
+
+from benchmarks.corpus import build_corpus
+from benchmarks.scaling import SCALING_BENCHMARKS, SCALING_SIZES, get_growth_exponent, is_superlinear
+from benchmarks.suite import (
+    BENCHMARKS,
+    DEFAULT_BASELINE_FILE,
+    DEFAULT_CORPUS_DIR,
+    DEFAULT_MIN_DELTA,
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    BenchmarkError,
+    get_environment,
+    get_regressions,
+)
+from ftCLI.Lib.utils.click_tools import (
+    generic_error_message,
+    generic_info_message,
+    generic_success_message,
+    generic_warning_message,
+)
+
+
+@click.command()
+@click.option(
+    "-k",
+    "--select",
+    "patterns",
+    multiple=True,
+    help="Pattern of the names of the benchmarks to run, where * matches any text (e.g.: 'converter *', '*[cjk]'). Can "
+    "be repeated.",
+)
+@click.option("--list", "list_only", is_flag=True, help="List the benchmarks and exit.")
+@click.option(
+    "--scaling",
+    is_flag=True,
+    help="Run the scaling benchmarks instead: run the commands on fonts with an increasing number of glyphs or "
+    "namerecords, and on folders with an increasing number of files, and flag the commands whose time grows faster "
+    "than n log n. The baseline is not used.",
+)
+@click.option(
+    "--corpus-dir",
+    type=click.Path(file_okay=False, resolve_path=True),
+    default=DEFAULT_CORPUS_DIR,
+    show_default=True,
+    help="Folder of the generated fonts. The fonts are generated if they're missing or out of date.",
+)
+@click.option(
+    "--baseline",
+    "baseline_file",
+    type=click.Path(dir_okay=False, resolve_path=True),
+    default=DEFAULT_BASELINE_FILE,
+    show_default=True,
+    help="The baseline JSON file.",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="Store the times in the baseline file instead of comparing them with it. Only the times of the benchmarks "
+    "that have been run are replaced.",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=DEFAULT_REPEAT,
+    show_default=True,
+    help="Number of runs of each benchmark. The time of the benchmark is the time of the fastest run.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Maximum slowdown of a benchmark, as a fraction of its baseline time.",
+)
+@click.option(
+    "--min-delta",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MIN_DELTA,
+    show_default=True,
+    help="Slowdowns shorter than this number of seconds are never reported.",
+)
+def main(
+    patterns=(),
+    list_only=False,
+    scaling=False,
+    corpus_dir=DEFAULT_CORPUS_DIR,
+    baseline_file=DEFAULT_BASELINE_FILE,
+    update_baseline=False,
+    repeat=DEFAULT_REPEAT,
+    threshold=DEFAULT_THRESHOLD,
+    min_delta=DEFAULT_MIN_DELTA,
+):
+    """
+    Times the ftcli commands on a generated font corpus, and compares the times with a baseline.
+
+    Each benchmark runs a command in a new interpreter, as it's run from the command line, on a fresh copy of a corpus
+    folder. Exits with status 1 if a benchmark fails, or if it's slower than its baseline time by more than THRESHOLD
+    and MIN_DELTA.
+
+    Baseline times depend on the machine: update the baseline (--update-baseline) on the machine where the benchmarks
+    are compared.
+    """
+    benchmarks = [
+        benchmark
+        for benchmark in (SCALING_BENCHMARKS if scaling else BENCHMARKS)
+        if not patterns or any(_matches(benchmark.name, pattern) for pattern in patterns)
+    ]
+    if list_only:
+        for benchmark in benchmarks:
+            click.echo(benchmark.name)
+        return
+    if not benchmarks:
+        generic_error_message("No benchmarks selected")
+        raise SystemExit(1)
+
+    if scaling:
+        _run_scaling_benchmarks(benchmarks, os.path.join(corpus_dir, "scaling"), repeat)
+        return
+
+    generic_info_message(f"Generating the corpus in {corpus_dir}")
+    fingerprint = build_corpus(corpus_dir)
+
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file, encoding="utf-8") as f:
+            baseline = json.load(f)
+    baseline_times = baseline.get("benchmarks", {})
+    if baseline and not update_baseline:
+        if baseline.get("corpus") != fingerprint:
+            generic_warning_message("The baseline has been measured on a different corpus")
+        if baseline.get("environment") != get_environment():
+            generic_warning_message("The baseline has been measured in a different environment")
+
+    times = {}
+    failures = []
+    width = max(len(benchmark.name) for benchmark in benchmarks)
+    for benchmark in benchmarks:
+        if not benchmark.is_available():
+            generic_warning_message(f"{benchmark.name} skipped, requires {', '.join(benchmark.requires)}")
+            continue
+        try:
+            times[benchmark.name] = benchmark.run(corpus_dir, repeat=repeat)
+        except BenchmarkError as e:
+            generic_error_message(f"{benchmark.name}: {e}")
+            failures.append(benchmark.name)
+            continue
+        line = f"{benchmark.name:<{width}}  {times[benchmark.name]:8.3f} s"
+        if benchmark.name in baseline_times:
+            change = times[benchmark.name] / baseline_times[benchmark.name] - 1
+            line += f"  {baseline_times[benchmark.name]:8.3f} s  {change:+7.1%}"
+        click.echo(line)
+
+    if update_baseline:
+        baseline_times.update({name: round(seconds, 3) for name, seconds in times.items()})
+        baseline = dict(
+            corpus=fingerprint, environment=get_environment(), benchmarks=dict(sorted(baseline_times.items()))
+        )
+        with open(baseline_file, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4)
+            f.write("\n")
+        generic_info_message(f"{baseline_file} saved")
+        regressions = []
+    else:
+        regressions = get_regressions(times, baseline_times, threshold=threshold, min_delta=min_delta)
+        for name in regressions:
+            generic_error_message(f"{name}: {times[name]:.3f} s, baseline {baseline_times[name]:.3f} s")
+
+    if failures or regressions:
+        raise SystemExit(1)
+    generic_success_message(f"{len(times)} benchmarks completed")
+
+
+def _matches(name: str, pattern: str) -> bool:
+    # Square brackets are matched literally, benchmark names end with the corpus name in brackets
+    return fnmatch.fnmatchcase(name, pattern.replace("[", "[[]"))
+
+
+def _run_scaling_benchmarks(benchmarks: list, corpus_dir: str, repeat: int) -> None:
+    generic_info_message(f"Scaling corpora are generated in {corpus_dir} when missing")
+    for kind, sizes in SCALING_SIZES.items():
+        generic_info_message(f"{kind}: {', '.join(str(size) for size in sizes)} (the first size is the reference)")
+
+    failures = []
+    superlinear = []
+    width = max(len(benchmark.name) for benchmark in benchmarks)
+    for benchmark in benchmarks:
+        try:
+            times = benchmark.run(corpus_dir, repeat=repeat)
+        except BenchmarkError as e:
+            generic_error_message(f"{benchmark.name}: {e}")
+            failures.append(benchmark.name)
+            continue
+        exponent, n_log_n_exponent = get_growth_exponent(times)
+        line = f"{benchmark.name:<{width}}  " + "  ".join(f"{seconds:8.3f}" for seconds in times.values())
+        if exponent is None:
+            line += "  too fast to fit"
+        else:
+            line += f"  n^{exponent:.2f} (n log n: n^{n_log_n_exponent:.2f})"
+        click.echo(line)
+        if is_superlinear(exponent, n_log_n_exponent):
+            superlinear.append(benchmark.name)
+
+    for name in superlinear:
+        generic_error_message(f"{name}: time grows faster than n log n")
+    if failures or superlinear:
+        raise SystemExit(1)
+    generic_success_message(f"{len(benchmarks)} scaling benchmarks completed")
+
+
+if __name__ == "__main__":
+    main()
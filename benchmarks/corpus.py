@@ -0,0 +1,527 @@
+import hashlib
+import json
+import os
+import random
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.boundsPen import ControlBoundsPen
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.reverseContourPen import ReverseContourPen
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables.TupleVariation import TupleVariation
+from fontTools.ttLib.tables._n_a_m_e import makeName
+from fontTools.ttLib.ttCollection import TTCollection
+
+# Number of glyphs of the generated fonts.
+LATIN_GLYPH_COUNT = 500
+CJK_GLYPH_COUNT = 30000
+
+UNITS_PER_EM = 1000
+
+# head.created and head.modified of the generated fonts (2023-01-01), so that the same corpus is generated every time.
+CORPUS_TIMESTAMP = 3755289600
+
+# File storing the fingerprint of a generated corpus, in the corpus folder.
+CORPUS_MANIFEST_FILE = "corpus.json"
+
+# Version of the corpus. Increase it when the generated fonts change, so that existing corpora are generated again and
+# baselines measured on a different corpus are detected.
+CORPUS_VERSION = 1
+
+LATIN_BASE_CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+# Combining marks used as the accents of the composite glyphs.
+MARK_CODEPOINTS = tuple(range(0x0300, 0x030A))
+
+# First code point of the composite glyphs: the Latin-1 Supplement letters, and the following Latin Extended blocks.
+COMPOSITE_FIRST_CODEPOINT = 0x00C0
+
+# Code points skipped when the composite glyphs reach them: the surrogates and the Private Use Area.
+SKIPPED_CODEPOINTS = range(0xD800, 0xF900)
+
+CJK_FIRST_CODEPOINT = 0x4E00
+
+# Axes (tag, minimum, default, maximum, name) and named instances of the variable font.
+VARIABLE_AXES = (
+    ("wght", 100, 400, 900, "Weight"),
+    ("wdth", 75, 100, 100, "Width"),
+    ("opsz", 8, 12, 72, "Optical size"),
+)
+VARIABLE_WEIGHTS = (
+    (100, "Thin"),
+    (200, "ExtraLight"),
+    (300, "Light"),
+    (400, "Regular"),
+    (500, "Medium"),
+    (600, "SemiBold"),
+    (700, "Bold"),
+    (800, "ExtraBold"),
+    (900, "Black"),
+)
+VARIABLE_WIDTHS = ((75, "Condensed"), (100, "Normal"))
+
+# Corpus folders and the fonts they contain.
+CORPUS_FOLDERS = {
+    "latin-ttf": ("BenchSans-Regular.ttf", "BenchSans-Bold.ttf"),
+    "latin-otf": ("BenchSans-Regular.otf", "BenchSans-Bold.otf"),
+    "web": ("BenchSans-Regular.woff", "BenchSans-Bold.woff2"),
+    "cjk": ("BenchCJK-Regular.ttf",),
+    "variable": ("BenchVariable[opsz,wdth,wght].ttf",),
+    "collection": ("BenchSans.ttc",),
+}
+
+
+class _Glyph(object):
+    """
+    A glyph of a generated font: its advance width, its outlines and its components.
+
+    Components are tuples of (glyph name, transformation), where the transformation is a 2x3 affine matrix.
+    """
+
+    def __init__(self, name: str, advance: int, unicode: int = None):
+        self.name = name
+        self.advance = advance
+        self.unicode = unicode
+        self.outline = RecordingPen()
+        self.components = []
+
+    def draw(self, pen, glyphs: dict, decompose=False) -> None:
+        self.outline.replay(pen)
+        for name, transformation in self.components:
+            if decompose:
+                glyphs[name].draw(TransformPen(pen, transformation), glyphs, decompose=True)
+            else:
+                pen.addComponent(name, transformation)
+
+    def get_bounds(self, glyphs: dict):
+        pen = ControlBoundsPen(None)
+        self.draw(pen, glyphs, decompose=True)
+        return pen.bounds
+
+
+def build_corpus(corpus_dir: str, force=False) -> str:
+    """
+    Generates the benchmark fonts in ``corpus_dir``, one subfolder for each entry of ``CORPUS_FOLDERS``. The fonts are
+    generated only if they are missing, or if they have been generated by a different version of this module.
+
+    :param corpus_dir: the corpus folder
+    :param force: if True, the fonts are always generated
+    :return: The fingerprint of the corpus (see ``get_corpus_fingerprint``).
+    """
+    manifest_file = os.path.join(corpus_dir, CORPUS_MANIFEST_FILE)
+    if not force and os.path.exists(manifest_file):
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == CORPUS_VERSION and all(
+            os.path.exists(os.path.join(corpus_dir, folder, file))
+            for folder, files in CORPUS_FOLDERS.items()
+            for file in files
+        ):
+            return manifest["fingerprint"]
+
+    for folder in CORPUS_FOLDERS:
+        os.makedirs(os.path.join(corpus_dir, folder), exist_ok=True)
+
+    latin_ttf, latin_otf = os.path.join(corpus_dir, "latin-ttf"), os.path.join(corpus_dir, "latin-otf")
+    for bold in (False, True):
+        style = "Bold" if bold else "Regular"
+        build_latin_font(os.path.join(latin_ttf, f"BenchSans-{style}.ttf"), bold=bold)
+        build_latin_font(os.path.join(latin_otf, f"BenchSans-{style}.otf"), cff=True, bold=bold)
+
+    web = os.path.join(corpus_dir, "web")
+    build_web_font(os.path.join(latin_ttf, "BenchSans-Regular.ttf"), os.path.join(web, "BenchSans-Regular.woff"))
+    build_web_font(os.path.join(latin_otf, "BenchSans-Bold.otf"), os.path.join(web, "BenchSans-Bold.woff2"))
+
+    build_cjk_font(os.path.join(corpus_dir, "cjk", "BenchCJK-Regular.ttf"))
+    build_variable_font(os.path.join(corpus_dir, "variable", "BenchVariable[opsz,wdth,wght].ttf"))
+    build_collection(
+        os.path.join(corpus_dir, "collection", "BenchSans.ttc"),
+        [os.path.join(latin_ttf, "BenchSans-Regular.ttf"), os.path.join(latin_ttf, "BenchSans-Bold.ttf")],
+    )
+
+    fingerprint = get_corpus_fingerprint(corpus_dir)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(dict(version=CORPUS_VERSION, fingerprint=fingerprint), f, indent=4)
+    return fingerprint
+
+
+def get_corpus_fingerprint(corpus_dir: str) -> str:
+    """
+    Returns the SHA-256 hash of the fonts of the corpus. The fonts are generated the same way every time, so the same
+    fingerprint means that the benchmarks have been run on the same fonts.
+    """
+    digest = hashlib.sha256()
+    for folder, files in sorted(CORPUS_FOLDERS.items()):
+        for file in files:
+            digest.update(f"{folder}/{file}".encode("utf-8"))
+            with open(os.path.join(corpus_dir, folder, file), "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def build_latin_font(file: str, cff=False, bold=False, num_glyphs: int = LATIN_GLYPH_COUNT) -> None:
+    """
+    Generates a Latin font: the basic Latin letters and digits, drawn as a bowl and an overlapping stem, a set of
+    combining marks, and accented letters made of a letter and a mark, up to ``num_glyphs`` glyphs.
+
+    In TrueType fonts, the accented letters are composite glyphs. Some of them have a duplicate component, or a flipped
+    component. In CFF fonts, they're decomposed.
+
+    :param file: the output file
+    :param cff: if True, a CFF flavored OpenType font is generated, otherwise a TrueType font
+    :param bold: if True, the font is bold
+    :param num_glyphs: the number of glyphs
+    """
+    glyphs = _get_latin_glyphs(num_glyphs, stem_width=140 if bold else 80)
+    style = "Bold" if bold else "Regular"
+    builder = _get_font_builder(glyphs, cff=cff)
+    _setup_names(builder, "Bench Sans", style)
+    _setup_metrics(builder, glyphs, weight=700 if bold else 400, bold=bold)
+    builder.save(file)
+
+
+def build_cjk_font(file: str, num_glyphs: int = CJK_GLYPH_COUNT) -> None:
+    """
+    Generates a TrueType font with the size of a CJK font: ``num_glyphs`` ideographs, each made of a few overlapping
+    strokes.
+
+    :param file: the output file
+    :param num_glyphs: the number of glyphs
+    """
+    glyphs = {".notdef": _get_notdef_glyph()}
+    for index in range(num_glyphs - 1):
+        codepoint = CJK_FIRST_CODEPOINT + index
+        glyph = _Glyph(f"uni{codepoint:04X}", UNITS_PER_EM, codepoint)
+        _draw_ideograph(glyph.outline, random.Random(codepoint))
+        glyphs[glyph.name] = glyph
+    builder = _get_font_builder(glyphs)
+    _setup_names(builder, "Bench CJK", "Regular")
+    _setup_metrics(builder, glyphs, weight=400)
+    builder.save(file)
+
+
+def build_variable_font(file: str, num_glyphs: int = LATIN_GLYPH_COUNT) -> None:
+    """
+    Generates a variable TrueType font with the glyphs of the Latin font (decomposed), the axes in ``VARIABLE_AXES``, a
+    named instance for each weight and width, and a STAT table.
+
+    :param file: the output file
+    :param num_glyphs: the number of glyphs
+    """
+    glyphs = _get_latin_glyphs(num_glyphs, stem_width=80)
+    builder = _get_font_builder(glyphs, decompose=True)
+    _setup_names(builder, "Bench Variable", "Regular")
+    _setup_metrics(builder, glyphs, weight=400)
+
+    instances = []
+    for width, width_name in VARIABLE_WIDTHS:
+        for weight, weight_name in VARIABLE_WEIGHTS:
+            style_name = weight_name if width == 100 else f"{width_name} {weight_name}"
+            instances.append(dict(location=dict(wght=weight, wdth=width, opsz=12), stylename=style_name))
+    builder.setupFvar(VARIABLE_AXES, instances)
+
+    glyf = builder.font["glyf"]
+    variations = {}
+    for name, glyph in glyphs.items():
+        coordinates = glyf[name].getCoordinates(glyf)[0] if glyf[name].numberOfContours > 0 else []
+        variations[name] = _get_glyph_variations(list(coordinates), glyph.advance)
+    builder.setupGvar(variations)
+
+    builder.setupStat(
+        [
+            dict(
+                tag="wght",
+                name="Weight",
+                values=[
+                    dict(value=weight, name=weight_name, flags=0x2 if weight == 400 else 0)
+                    for weight, weight_name in VARIABLE_WEIGHTS
+                ],
+            ),
+            dict(
+                tag="wdth",
+                name="Width",
+                values=[
+                    dict(value=width, name=width_name, flags=0x2 if width == 100 else 0)
+                    for width, width_name in VARIABLE_WIDTHS
+                ],
+            ),
+            dict(
+                tag="opsz",
+                name="Optical size",
+                values=[dict(value=12, name="Text", flags=0x2), dict(value=72, name="Display")],
+            ),
+        ]
+    )
+    builder.save(file)
+
+
+def build_web_font(source_file: str, file: str) -> None:
+    """
+    Compresses a font to WOFF or WOFF2, depending on the extension of ``file``.
+    """
+    font = TTFont(source_file, recalcTimestamp=False)
+    font.flavor = os.path.splitext(file)[1][1:].lower()
+    font.save(file)
+
+
+def build_names_font(file: str, num_names: int) -> None:
+    """
+    Generates a TrueType font with the glyphs of the Latin font and ``num_names`` additional namerecords, half of them
+    Macintosh namerecords and half Windows namerecords, with name IDs starting at 256.
+
+    :param file: the output file
+    :param num_names: the number of additional namerecords
+    """
+    glyphs = _get_latin_glyphs(0, stem_width=80)
+    builder = _get_font_builder(glyphs)
+    _setup_names(builder, "Bench Sans", "Regular")
+    _setup_metrics(builder, glyphs, weight=400)
+    names = builder.font["name"].names
+    for index in range(num_names):
+        # Appending the records directly, setName() looks for an existing record first
+        platform = (1, 0, 0) if index % 2 else (3, 1, 0x409)
+        names.append(makeName(f"Bench Sans {index % 100}", 256 + index // 2, *platform))
+    builder.save(file)
+
+
+def build_fonts_folder(folder: str, num_files: int) -> None:
+    """
+    Generates a folder of ``num_files`` copies of a small TrueType font.
+
+    :param folder: the output folder
+    :param num_files: the number of fonts
+    """
+    os.makedirs(folder, exist_ok=True)
+    file = os.path.join(folder, "BenchSans-00000.ttf")
+    build_latin_font(file, num_glyphs=0)
+    with open(file, "rb") as f:
+        data = f.read()
+    for index in range(1, num_files):
+        with open(os.path.join(folder, f"BenchSans-{index:05d}.ttf"), "wb") as f:
+            f.write(data)
+
+
+def build_collection(file: str, source_files: list) -> None:
+    """
+    Generates a font collection containing the fonts in ``source_files``, sharing their identical tables.
+    """
+    collection = TTCollection()
+    collection.fonts = [TTFont(source_file, recalcTimestamp=False) for source_file in source_files]
+    collection.save(file)
+
+
+def _get_font_builder(glyphs: dict, cff=False, decompose=False) -> FontBuilder:
+    builder = FontBuilder(UNITS_PER_EM, isTTF=not cff)
+    builder.updateHead(created=CORPUS_TIMESTAMP, modified=CORPUS_TIMESTAMP, fontRevision=1.0)
+    builder.setupGlyphOrder(list(glyphs))
+    builder.setupCharacterMap({glyph.unicode: name for name, glyph in glyphs.items() if glyph.unicode is not None})
+
+    if cff:
+        char_strings = {}
+        for name, glyph in glyphs.items():
+            pen = T2CharStringPen(glyph.advance, None)
+            # Glyphs are drawn with clockwise outer contours, as in TrueType fonts
+            glyph.draw(ReverseContourPen(pen), glyphs, decompose=True)
+            char_strings[name] = pen.getCharString()
+        builder.setupCFF("BenchFont", {}, char_strings, {})
+    else:
+        tt_glyphs = {}
+        for name, glyph in glyphs.items():
+            pen = TTGlyphPen(glyphs)
+            if decompose or not glyph.components:
+                glyph.draw(Cu2QuPen(pen, max_err=1), glyphs, decompose=True)
+            else:
+                glyph.draw(pen, glyphs)
+            tt_glyphs[name] = pen.glyph()
+        builder.setupGlyf(tt_glyphs)
+
+    metrics = {}
+    for name, glyph in glyphs.items():
+        bounds = glyph.get_bounds(glyphs)
+        metrics[name] = (glyph.advance, bounds[0] if bounds else 0)
+    builder.setupHorizontalMetrics(metrics)
+    return builder
+
+
+def _setup_names(builder: FontBuilder, family_name: str, style_name: str) -> None:
+    ps_name = f"{family_name.replace(' ', '')}-{style_name}"
+    builder.setupNameTable(
+        dict(
+            familyName=family_name,
+            styleName=style_name,
+            uniqueFontIdentifier=f"1.000;FTCL;{ps_name}",
+            fullName=f"{family_name} {style_name}",
+            psName=ps_name,
+            version="Version 1.000",
+            manufacturer="ftCLI",
+            designer="ftCLI",
+            vendorURL="https://github.com/ftCLI/ftCLI",
+        )
+    )
+    if "CFF " in builder.font:
+        cff = builder.font["CFF "].cff
+        cff.fontNames = [ps_name]
+        top_dict = cff.topDictIndex[0]
+        top_dict.FullName = f"{family_name} {style_name}"
+        top_dict.FamilyName = family_name
+        top_dict.Weight = style_name
+        top_dict.version = "1.000"
+
+
+def _setup_metrics(builder: FontBuilder, glyphs: dict, weight: int, bold=False) -> None:
+    builder.setupHorizontalHeader(ascent=950, descent=-250)
+    builder.setupOS2(
+        version=4,
+        usWeightClass=weight,
+        fsSelection=0x20 if bold else 0x40,
+        achVendID="FTCL",
+        sTypoAscender=750,
+        sTypoDescender=-250,
+        sTypoLineGap=200,
+        usWinAscent=950,
+        usWinDescent=250,
+        sxHeight=500,
+        sCapHeight=700,
+    )
+    builder.font["OS/2"].recalcUnicodeRanges(builder.font)
+    builder.updateHead(macStyle=0x1 if bold else 0)
+    builder.setupPost()
+
+
+def _get_latin_glyphs(num_glyphs: int, stem_width: int) -> dict:
+    glyphs = {".notdef": _get_notdef_glyph()}
+    glyphs["space"] = _Glyph("space", 250, 0x0020)
+    glyphs["uni00A0"] = _Glyph("uni00A0", 250, 0x00A0)
+
+    base_names = []
+    for character in LATIN_BASE_CHARACTERS:
+        codepoint = ord(character)
+        glyph = _Glyph(f"uni{codepoint:04X}", 600, codepoint)
+        _draw_letter(glyph.outline, random.Random(codepoint), stem_width)
+        glyphs[glyph.name] = glyph
+        if character.isalpha():
+            base_names.append(glyph.name)
+
+    mark_names = []
+    for codepoint in MARK_CODEPOINTS:
+        glyph = _Glyph(f"uni{codepoint:04X}", 0, codepoint)
+        _draw_mark(glyph.outline, random.Random(codepoint))
+        glyphs[glyph.name] = glyph
+        mark_names.append(glyph.name)
+
+    codepoint = COMPOSITE_FIRST_CODEPOINT
+    index = 0
+    while len(glyphs) < num_glyphs:
+        # Skip the code points of the combining marks
+        if _get_glyph_name(codepoint) in glyphs:
+            codepoint += 1
+            continue
+        base_name, mark_name = base_names[index % len(base_names)], mark_names[index % len(mark_names)]
+        glyph = _Glyph(_get_glyph_name(codepoint), glyphs[base_name].advance, codepoint)
+        glyph.components.append((base_name, (1, 0, 0, 1, 0, 0)))
+        if index % 11 == 0:
+            glyph.components.append((mark_name, (-1, 0, 0, 1, 300, 0)))
+        else:
+            glyph.components.append((mark_name, (1, 0, 0, 1, 300, 0)))
+        if index % 7 == 0:
+            glyph.components.append(glyph.components[-1])
+        glyphs[glyph.name] = glyph
+        codepoint += 1
+        if codepoint in SKIPPED_CODEPOINTS:
+            codepoint = SKIPPED_CODEPOINTS.stop
+        index += 1
+    return glyphs
+
+
+def _get_glyph_name(codepoint: int) -> str:
+    return f"uni{codepoint:04X}" if codepoint <= 0xFFFF else f"u{codepoint:X}"
+
+
+def _get_glyph_variations(coordinates: list, advance: int) -> list:
+    # The points on the right half of the glyph move right at the heaviest weight, and left at the lightest one, the
+    # glyph gets narrower at the narrowest width, and shorter at the largest optical size. The last four points are the
+    # phantom points, the second one is the advance width.
+    def get_deltas(delta, scale_x=0.0, scale_y=0.0, advance_delta=0):
+        deltas = [
+            (round(x * scale_x) + (delta if x > advance / 2 else 0), round(y * scale_y)) for x, y in coordinates
+        ]
+        return deltas + [(0, 0), (advance_delta, 0), (0, 0), (0, 0)]
+
+    return [
+        TupleVariation(dict(wght=(0.0, 1.0, 1.0)), get_deltas(60, advance_delta=60)),
+        TupleVariation(dict(wght=(-1.0, -1.0, 0.0)), get_deltas(-30, advance_delta=-30)),
+        TupleVariation(dict(wdth=(-1.0, -1.0, 0.0)), get_deltas(0, scale_x=-0.25, advance_delta=-round(advance / 4))),
+        TupleVariation(dict(opsz=(0.0, 1.0, 1.0)), get_deltas(0, scale_y=-0.05)),
+    ]
+
+
+def _get_notdef_glyph() -> _Glyph:
+    glyph = _Glyph(".notdef", 500)
+    _draw_rectangle(glyph.outline, 50, -200, 450, 800)
+    _draw_rectangle(glyph.outline, 100, -150, 400, 750, clockwise=False)
+    return glyph
+
+
+def _draw_letter(pen, rng: random.Random, stem_width: int) -> None:
+    # A bowl with a counter, and a stem overlapping its left side
+    center_x, center_y = rng.randrange(280, 320), rng.randrange(230, 270)
+    radius_x, radius_y = rng.randrange(200, 240), rng.randrange(220, 260)
+    _draw_ellipse(pen, center_x, center_y, radius_x, radius_y)
+    _draw_ellipse(pen, center_x, center_y, radius_x - stem_width, radius_y - stem_width // 2, clockwise=False)
+    stem_x = center_x - radius_x + rng.randrange(0, 20)
+    _draw_rectangle(pen, stem_x, 0, stem_x + stem_width, rng.randrange(500, 720))
+
+
+def _draw_mark(pen, rng: random.Random) -> None:
+    _draw_ellipse(pen, 0, rng.randrange(620, 660), rng.randrange(40, 60), rng.randrange(30, 50))
+
+
+def _draw_ideograph(pen, rng: random.Random) -> None:
+    for _ in range(rng.randrange(3, 8)):
+        if rng.random() < 0.5:
+            y = rng.randrange(50, 850)
+            _draw_rectangle(pen, rng.randrange(50, 300), y, rng.randrange(600, 950), y + rng.randrange(40, 80))
+        else:
+            x = rng.randrange(50, 850)
+            _draw_rectangle(pen, x, rng.randrange(-100, 300), x + rng.randrange(40, 80), rng.randrange(500, 850))
+
+
+def _draw_rectangle(pen, x_min: int, y_min: int, x_max: int, y_max: int, clockwise=True) -> None:
+    points = [(x_min, y_min), (x_min, y_max), (x_max, y_max), (x_max, y_min)]
+    if not clockwise:
+        points.reverse()
+    pen.moveTo(points[0])
+    for point in points[1:]:
+        pen.lineTo(point)
+    pen.closePath()
+
+
+def _draw_ellipse(pen, center_x: int, center_y: int, radius_x: int, radius_y: int, clockwise=True) -> None:
+    # Four cubic segments, with the handles at 0.5523 of the radius from the extrema
+    handle_x, handle_y = round(radius_x * 0.5523), round(radius_y * 0.5523)
+    left, right = center_x - radius_x, center_x + radius_x
+    top, bottom = center_y + radius_y, center_y - radius_y
+    points = [
+        (left, center_y),
+        (left, center_y + handle_y),
+        (center_x - handle_x, top),
+        (center_x, top),
+        (center_x + handle_x, top),
+        (right, center_y + handle_y),
+        (right, center_y),
+        (right, center_y - handle_y),
+        (center_x + handle_x, bottom),
+        (center_x, bottom),
+        (center_x - handle_x, bottom),
+        (left, center_y - handle_y),
+    ]
+    if not clockwise:
+        points = points[:1] + points[:0:-1]
+    pen.moveTo(points[0])
+    for index in range(1, len(points), 3):
+        pen.curveTo(points[index], points[index + 1], points[(index + 2) % len(points)])
+    pen.closePath()
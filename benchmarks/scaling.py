@@ -0,0 +1,158 @@
+import math
+import os
+import shutil
+
+from benchmarks.corpus import CORPUS_VERSION, build_fonts_folder, build_latin_font, build_names_font
+from benchmarks.suite import Benchmark
+
+# Sizes of the scaling corpora: number of glyphs, of namerecords, or of files. The first size is the reference size,
+# whose time is subtracted from the times of the other sizes, so that the time spent starting the interpreter and
+# reading the font doesn't hide how the rest grows. The offset of the strings in the name table is a 16-bit number
+# that follows the records, so a name table can't have more than about 5400 records.
+SCALING_SIZES = {
+    "glyphs-ttf": (0, 1000, 8000, 32000, 65000),
+    "glyphs-otf": (0, 1000, 8000, 32000, 65000),
+    "names": (0, 500, 1000, 2500, 5000),
+    "files": (1, 125, 1000, 4000, 8000),
+}
+
+# Times that exceed the reference time by less than this number of seconds are too noisy to fit the growth curve.
+MIN_FITTED_TIME = 0.05
+
+# A benchmark is flagged when its growth exponent exceeds the exponent of n log n over the same sizes by more than this.
+EXPONENT_TOLERANCE = 0.25
+
+
+class ScalingBenchmark(object):
+    """
+    A ftcli command run on corpora of increasing size, to check how its time grows with the number of glyphs, of
+    namerecords or of files.
+
+    :param args: the command line arguments of the command, as in ``Benchmark``
+    :param kind: the kind of corpus, a key of ``SCALING_SIZES``
+    :param sizes: the sizes of the corpora. If None, the sizes in ``SCALING_SIZES`` are used
+    """
+
+    def __init__(self, args: list, kind: str, sizes: tuple = None):
+        self.args = args
+        self.kind = kind
+        self.sizes = sizes or SCALING_SIZES[kind]
+
+    @property
+    def name(self) -> str:
+        return Benchmark(self.args, self.kind).name
+
+    def run(self, corpus_dir: str, repeat: int = 1) -> dict:
+        """
+        Runs the command on the corpus of each size, generating the corpora that are missing.
+
+        :param corpus_dir: the folder of the scaling corpora
+        :param repeat: the number of runs for each size
+        :return: A dictionary mapping each size to the time of the fastest run, in seconds.
+        :raises BenchmarkError: if the command fails
+        """
+        times = {}
+        for size in self.sizes:
+            corpus = build_scaling_corpus(corpus_dir, self.kind, size)
+            times[size] = Benchmark(self.args, corpus).run(corpus_dir, repeat=repeat)
+        return times
+
+
+# The commands whose time depends on the number of glyphs, of namerecords or of files.
+SCALING_BENCHMARKS = (
+    ScalingBenchmark(["converter", "ft2wf", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["converter", "otf2ttf", "{input}", "-out", "{output}"], "glyphs-otf"),
+    ScalingBenchmark(["converter", "ttf2otf", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "decompose-transformed", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "duplicate-components", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "monospace", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "nbsp-width", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "uprights", "{input}", "-out", "{output}"], "glyphs-otf"),
+    # makeotf can't build the temporary font used to recalculate the ranges when the font has 65000 glyphs
+    ScalingBenchmark(
+        ["os2", "{input}", "--recalc-unicode-ranges", "-out", "{output}"], "glyphs-ttf", sizes=(0, 1000, 8000, 32000)
+    ),
+    ScalingBenchmark(["print", "font-info", "{input}/BenchSans-Regular.ttf"], "glyphs-ttf"),
+    ScalingBenchmark(["utils", "cff-desubr", "{input}", "-out", "{output}"], "glyphs-otf"),
+    ScalingBenchmark(["utils", "scale-upm", "{input}", "-upm", "2048", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["utils", "ttf-dehint", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["utils", "ttf-remove-overlaps", "{input}", "-out", "{output}"], "glyphs-ttf"),
+    ScalingBenchmark(["fix", "strip-names", "{input}", "-out", "{output}"], "names"),
+    ScalingBenchmark(["name", "append", "{input}", "-n", "1", "--suffix", " Test", "-out", "{output}"], "names"),
+    ScalingBenchmark(["name", "del-mac-names", "{input}", "--del-all", "-out", "{output}"], "names"),
+    ScalingBenchmark(["name", "del-names", "{input}", "-n", "300", "-out", "{output}"], "names"),
+    ScalingBenchmark(["name", "find-replace", "{input}", "-os", "Bench", "-ns", "Test", "-out", "{output}"], "names"),
+    ScalingBenchmark(["name", "set-name", "{input}", "-n", "13", "-s", "Test", "-out", "{output}"], "names"),
+    ScalingBenchmark(["print", "font-names", "{input}/BenchSans-Regular.ttf"], "names"),
+    ScalingBenchmark(["name", "set-name", "{input}", "-n", "13", "-s", "Test", "-out", "{output}"], "files"),
+    ScalingBenchmark(["os2", "{input}", "--weight", "500", "-out", "{output}"], "files"),
+    ScalingBenchmark(["print", "fonts-list", "{input}"], "files"),
+)
+
+
+def build_scaling_corpus(corpus_dir: str, kind: str, size: int) -> str:
+    """
+    Generates a scaling corpus folder in ``corpus_dir``, if it doesn't exist.
+
+    :param corpus_dir: the folder of the scaling corpora
+    :param kind: the kind of corpus, a key of ``SCALING_SIZES``
+    :param size: the number of glyphs, of namerecords or of files
+    :return: The name of the corpus folder.
+    """
+    corpus = f"{kind}-{size}-v{CORPUS_VERSION}"
+    folder = os.path.join(corpus_dir, corpus)
+    if os.path.exists(folder):
+        return corpus
+
+    # The folder is generated with a temporary name, so that an interrupted run never leaves an incomplete corpus
+    temp_folder = f"{folder}.tmp"
+    shutil.rmtree(temp_folder, ignore_errors=True)
+    os.makedirs(temp_folder)
+    if kind == "glyphs-ttf":
+        build_latin_font(os.path.join(temp_folder, "BenchSans-Regular.ttf"), num_glyphs=size)
+    elif kind == "glyphs-otf":
+        build_latin_font(os.path.join(temp_folder, "BenchSans-Regular.otf"), cff=True, num_glyphs=size)
+    elif kind == "names":
+        build_names_font(os.path.join(temp_folder, "BenchSans-Regular.ttf"), num_names=size)
+    elif kind == "files":
+        build_fonts_folder(temp_folder, num_files=size)
+    else:
+        raise ValueError(f"Unknown scaling corpus: {kind}")
+    os.rename(temp_folder, folder)
+    return corpus
+
+
+def get_growth_exponent(times: dict):
+    """
+    Fits the times of a scaling benchmark to a power law, t = a * n^k, after subtracting the time of the reference size
+    (the smallest one). Times too close to the reference time are left out of the fit.
+
+    :param times: the time of each size, in seconds
+    :return: A tuple of the exponent k, and the exponent of n log n fitted on the same sizes. Both are None if fewer
+        than two sizes can be fitted.
+    """
+    sizes = sorted(times)
+    reference_time = times[sizes[0]]
+    points = [(size, times[size] - reference_time) for size in sizes[1:]]
+    points = [(size, seconds) for size, seconds in points if seconds >= MIN_FITTED_TIME]
+    if len(points) < 2:
+        return None, None
+    exponent = _fit_exponent(points)
+    n_log_n_exponent = _fit_exponent([(size, size * math.log(size)) for size, _ in points])
+    return exponent, n_log_n_exponent
+
+
+def is_superlinear(exponent, n_log_n_exponent) -> bool:
+    """
+    Returns True if the growth exponent of a benchmark exceeds the one of n log n by more than ``EXPONENT_TOLERANCE``.
+    """
+    return exponent is not None and exponent > n_log_n_exponent + EXPONENT_TOLERANCE
+
+
+def _fit_exponent(points: list) -> float:
+    # Least squares slope of log(time) over log(size)
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(value) for _, value in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
@@ -0,0 +1,220 @@
+import importlib.util
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+import fontTools
+
+# Folder of the ftCLI package, added to the PYTHONPATH of the benchmarked commands.
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(BENCHMARKS_DIR, "corpus")
+DEFAULT_BASELINE_FILE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+RECIPE_FILE = os.path.join(BENCHMARKS_DIR, "recipe.json")
+
+# A benchmark regresses when its time exceeds the baseline by more than DEFAULT_THRESHOLD (a fraction of the baseline)
+# and by more than DEFAULT_MIN_DELTA seconds, so that the noise of the fastest commands is not reported.
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 0.05
+
+DEFAULT_REPEAT = 3
+
+# Lines printed by the commands when a file can't be processed.
+_FAILURE_LINE = re.compile(r"^\[(FAIL|ERROR)\]", re.MULTILINE)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Benchmark(object):
+    """
+    A ftcli command run on a folder of the corpus.
+
+    In the command arguments, ``{input}`` is replaced by a copy of the corpus folder, made before each run, and
+    ``{output}`` by an empty output folder.
+
+    :param args: the command line arguments of the command
+    :param corpus: the name of the corpus folder
+    :param setup: the arguments of the commands run before each run of the benchmark, not timed
+    :param requires: the modules required by the command. The benchmark is skipped if they are not installed
+    """
+
+    def __init__(self, args: list, corpus: str, setup: list = (), requires: tuple = ()):
+        self.args = args
+        self.corpus = corpus
+        self.setup = setup
+        self.requires = requires
+
+    @property
+    def name(self) -> str:
+        # The command and subcommand names, and the corpus folder
+        command = []
+        for arg in self.args:
+            if arg.startswith("-") or "{" in arg or os.path.isabs(arg):
+                break
+            command.append(arg)
+        return f"{' '.join(command)} [{self.corpus}]"
+
+    def is_available(self) -> bool:
+        return all(importlib.util.find_spec(module) is not None for module in self.requires)
+
+    def run(self, corpus_dir: str, repeat: int = DEFAULT_REPEAT) -> float:
+        """
+        Runs the benchmark ``repeat`` times, each time on a new copy of the corpus folder.
+
+        :param corpus_dir: the corpus folder
+        :param repeat: the number of runs
+        :return: The time of the fastest run, in seconds.
+        :raises BenchmarkError: if the command fails
+        """
+        times = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix="ftcli-benchmark-") as temp_dir:
+                input_path = os.path.join(temp_dir, self.corpus)
+                shutil.copytree(os.path.join(corpus_dir, self.corpus), input_path)
+                output_path = os.path.join(temp_dir, "output")
+                for args in self.setup:
+                    run_ftcli(_format_args(args, input_path, output_path), cwd=temp_dir)
+                start = time.perf_counter()
+                run_ftcli(_format_args(self.args, input_path, output_path), cwd=temp_dir)
+                times.append(time.perf_counter() - start)
+        return min(times)
+
+
+# The benchmarks: at least one for each subcommand that processes fonts without user interaction.
+BENCHMARKS = (
+    Benchmark(["assistant", "init-data", "{input}", "-q"], "latin-ttf"),
+    Benchmark(
+        ["assistant", "commit", "{input}", "-out", "{output}"],
+        "latin-ttf",
+        setup=[["assistant", "init-data", "{input}", "-q"]],
+    ),
+    Benchmark(["cff", "del-names", "{input}", "--full-name", "-out", "{output}"], "latin-otf"),
+    Benchmark(["cff", "find-replace", "{input}", "-os", "Bench", "-ns", "Test", "-out", "{output}"], "latin-otf"),
+    Benchmark(["cff", "fix-version", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["cff", "set-names", "{input}", "--family-name", "Test Sans", "-out", "{output}"], "latin-otf"),
+    Benchmark(["converter", "ft2wf", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["converter", "ft2wf", "{input}", "-out", "{output}"], "cjk"),
+    Benchmark(["converter", "otf2ttf", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["converter", "ttc2sfnt", "{input}", "-out", "{output}"], "collection"),
+    Benchmark(["converter", "ttf2otf", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["converter", "ttf2otf", "{input}", "-out", "{output}"], "cjk"),
+    Benchmark(["converter", "var2static", "{input}", "-out", "{output}"], "variable"),
+    Benchmark(["converter", "wf2ft", "{input}", "-out", "{output}"], "web"),
+    Benchmark(["fix", "caret-offset", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["fix", "decompose-transformed", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "duplicate-components", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "italic-angle", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["fix", "kern-table", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "monospace", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "nbsp-missing", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "nbsp-width", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "os2-ranges", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["fix", "strip-names", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["fix", "uprights", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["hhea", "{input}", "--ascent", "900", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["metrics", "align", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(
+        ["metrics", "copy-metrics", "-s", "{input}/BenchSans-Regular.ttf", "-d", "{input}", "-o", "{output}"],
+        "latin-ttf",
+    ),
+    Benchmark(["metrics", "set-linegap", "{input}", "-p", "20", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "append", "{input}", "-n", "1", "--suffix", " Test", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "del-mac-names", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "del-names", "{input}", "-n", "11", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "find-replace", "{input}", "-os", "Bench", "-ns", "Test", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "set-name", "{input}", "-n", "13", "-s", "Test", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["name", "set-name", "{input}", "-n", "13", "-s", "Test", "-out", "{output}"], "cjk"),
+    Benchmark(["os2", "{input}", "--weight", "500", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["os2", "{input}", "--weight", "500", "-out", "{output}"], "cjk"),
+    Benchmark(["post", "{input}", "--ul-position", "-120", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["print", "font-info", "{input}/BenchSans-Regular.otf"], "latin-otf"),
+    Benchmark(["print", "font-names", "{input}/BenchSans-Regular.ttf"], "latin-ttf"),
+    Benchmark(["print", "fonts-list", "{input}"], "latin-ttf"),
+    Benchmark(["print", "os2-table", "{input}/BenchSans-Regular.ttf"], "latin-ttf"),
+    Benchmark(["run", RECIPE_FILE, "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["utils", "add-dsig", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["utils", "cff-autohint", "{input}", "-out", "{output}"], "latin-otf", requires=("psautohint",)),
+    Benchmark(["utils", "cff-check-outlines", "{input}"], "latin-otf"),
+    Benchmark(["utils", "cff-dehint", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["utils", "cff-desubr", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["utils", "cff-subr", "{input}", "-out", "{output}"], "latin-otf"),
+    Benchmark(["utils", "del-table", "{input}", "-t", "STAT", "-out", "{output}"], "variable"),
+    Benchmark(["utils", "font-organizer", "{input}"], "latin-ttf"),
+    Benchmark(["utils", "font-renamer", "{input}"], "latin-ttf"),
+    Benchmark(["utils", "scale-upm", "{input}", "-upm", "2048", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["utils", "ttf-autohint", "{input}", "-out", "{output}"], "latin-ttf", requires=("ttfautohint",)),
+    Benchmark(["utils", "ttf-dehint", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["utils", "ttf-remove-overlaps", "{input}", "-out", "{output}"], "latin-ttf"),
+    Benchmark(["utils", "ttf-remove-overlaps", "{input}", "-out", "{output}"], "cjk"),
+)
+
+
+def run_ftcli(args: list, cwd: str) -> None:
+    """
+    Runs ftcli in a new interpreter, as it's run from the command line.
+
+    :param args: the command line arguments
+    :param cwd: the working directory
+    :raises BenchmarkError: if the command exits with an error, or reports a file that can't be processed
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_DIR, env.get("PYTHONPATH")]))
+    process = subprocess.run(
+        [sys.executable, "-c", "from ftCLI.ftCLI import main; main()"] + args,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    if process.returncode != 0 or _FAILURE_LINE.search(click.unstyle(process.stdout)):
+        output = process.stdout.strip().splitlines()
+        raise BenchmarkError(f"ftcli {' '.join(args)} failed: {output[-1] if output else process.returncode}")
+
+
+def get_environment() -> dict:
+    """
+    Returns the versions of the software the benchmarks depend on, stored with the baseline.
+    """
+    return dict(
+        python=platform.python_version(),
+        fonttools=fontTools.version,
+        platform=platform.platform(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+    )
+
+
+def get_regressions(times: dict, baseline: dict, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA) -> list:
+    """
+    Compares the benchmark times with the baseline.
+
+    :param times: the time of each benchmark, by name
+    :param baseline: the baseline time of each benchmark, by name
+    :param threshold: the maximum slowdown, as a fraction of the baseline time
+    :param min_delta: the minimum slowdown reported, in seconds
+    :return: The names of the benchmarks that have regressed.
+    """
+    regressions = []
+    for name, seconds in times.items():
+        baseline_seconds = baseline.get(name)
+        if baseline_seconds is None:
+            continue
+        if seconds > baseline_seconds * (1 + threshold) and seconds - baseline_seconds > min_delta:
+            regressions.append(name)
+    return regressions
+
+
+def _format_args(args: list, input_path: str, output_path: str) -> list:
+    return [arg.replace("{input}", input_path).replace("{output}", output_path) for arg in args]
@@ -1,14 +1,16 @@
 import math
 import os
+import struct
+from io import BytesIO
 
 import click
-from beziers.path import BezierPath, Line, Point
-from fontTools.misc.timeTools import timestampToString
+from fontTools.misc.timeTools import timestampNow, timestampToString
 from fontTools.otlLib.maxContextCalc import maxCtxFont
 from fontTools.pens.boundsPen import BoundsPen
 from fontTools.pens.recordingPen import DecomposingRecordingPen
 from fontTools.pens.ttGlyphPen import TTGlyphPen
-from fontTools.ttLib import TTFont, registerCustomTableClass, newTable
+from fontTools.ttLib import TTFont, registerCustomTableClass, newTable, getSearchRange
+from fontTools.ttLib.sfnt import calcChecksum
 from ftCLI.Lib.utils.misc import int_list_to_num
 from ftCLI.Lib.utils.misc import calc_code_page_ranges
 
@@ -19,6 +21,8 @@ from ftCLI.Lib.tables.hhea import TableHhea
 from ftCLI.Lib.tables.name import TableName
 from ftCLI.Lib.tables.post import TablePost
 from ftCLI.Lib.utils.glyphs import get_glyph_bounds
+from ftCLI.Lib.utils.output_writer import save_font, write_file
+from ftCLI.Lib.utils.profiler import measure
 from ftCLI.Lib.utils.misc import is_nth_bit_set, unset_nth_bit
 
 registerCustomTableClass("OS/2", "ftCLI.Lib.tables.OS_2", "TableOS2")
@@ -27,17 +31,39 @@ registerCustomTableClass("name", "ftCLI.Lib.tables.name", "TableName")
 registerCustomTableClass("post", "ftCLI.Lib.tables.post", "TablePost")
 registerCustomTableClass("hhea", "ftCLI.Lib.tables.hhea", "TableHhea")
 
+# Tables whose compilation updates other tables. Fonts where one of them has been modified are saved with TTFont.save().
+DEPENDENT_TABLES = ("glyf", "loca", "maxp", "hmtx", "vmtx", "hdmx", "LTSH", "gvar", "cvar", "CFF2")
+
 
 class Font(TTFont):
     def __init__(self, file, recalcBBoxes=True, recalcTimestamp=False):
         super().__init__(file=file, recalcBBoxes=recalcBBoxes, recalcTimestamp=recalcTimestamp)
 
         self.file = file
-        self.name_table: TableName = self["name"]
-        self.os_2_table: TableOS2 = self["OS/2"]
-        self.head_table: TableHead = self["head"]
-        self.post_table: TablePost = self["post"]
-        self.hhea_table: TableHhea = self["hhea"]
+        self.__original_font = None
+
+    # Tables are decompiled by fontTools the first time they are accessed, and then kept in the TTFont tables cache. The
+    # following properties don't load anything until a command actually uses the table.
+
+    @property
+    def name_table(self) -> TableName:
+        return self["name"]
+
+    @property
+    def os_2_table(self) -> TableOS2:
+        return self["OS/2"]
+
+    @property
+    def head_table(self) -> TableHead:
+        return self["head"]
+
+    @property
+    def post_table(self) -> TablePost:
+        return self["post"]
+
+    @property
+    def hhea_table(self) -> TableHhea:
+        return self["hhea"]
 
     @property
     def is_cff(self) -> bool:
@@ -117,6 +143,151 @@ class Font(TTFont):
     def is_hinted_ttf(self) -> bool:
         return "fpgm" in self and self.is_true_type
 
+    def is_table_changed(self, tag: str) -> bool:
+        """
+        Checks if a table has been modified since the font was opened.
+
+        Tables that have never been loaded can't have been modified. Otherwise, the table is compiled once and compared
+        to the raw bytes stored in the source file. Only when they differ, because the source table was not compiled by
+        fontTools, the original table is decompiled again from the source file and compiled for comparison.
+
+        Tables deleted with ``del font[tag]`` are not reported as changed.
+
+        :param tag: the table tag
+        :return: True if the table has been modified or added, False otherwise.
+        """
+        if not self.isLoaded(tag):
+            return False
+
+        if self.reader is None or tag not in self.reader:
+            return True
+
+        with measure("compile", tag):
+            data = self[tag].compile(self)
+        if data == self.reader[tag]:
+            return False
+
+        original_font = self.__get_original_font()
+        original_font.recalcBBoxes = self.recalcBBoxes
+        original_font.recalcTimestamp = self.recalcTimestamp
+        original_table = original_font[tag]
+        with measure("compile", tag):
+            return data != original_table.compile(original_font)
+
+    def get_changed_tables(self, tags: list) -> list:
+        """
+        Returns the tags of the tables that have been modified since the font was opened.
+
+        Compiling a table may update the tables that depend on it (for example, compiling ``glyf`` updates ``loca`` and
+        ``head``), so only the tables a command actually edits should be checked.
+
+        :param tags: the tags of the tables to check
+        :return: A list of table tags.
+        """
+        return [tag for tag in tags if self.is_table_changed(tag)]
+
+    def save_tables(self, file, tags: list) -> None:
+        """
+        Saves the font recompiling only the tables in ``tags``. All the other tables are copied byte-for-byte from the
+        source file, even if they have been loaded to be read, and their checksums are taken from the source table
+        directory. Only the checksums of the recompiled tables and ``head.checkSumAdjustment`` are calculated.
+
+        Falls back to ``save()`` when the font can't be saved this way: web fonts, fonts that have not been read from a
+        file, fonts with added or deleted tables, or fonts where tables that update other tables when compiled (``glyf``,
+        ``hmtx``...) have been modified.
+
+        Output files are written by the output writer (see ``save_font``).
+
+        :param file: the output file path or a writable file object
+        :param tags: the tags of the modified tables
+        """
+        if not self.__can_save_tables(tags):
+            save_font(self, file)
+            return
+
+        with measure("write"):
+            data = self.__compile_tables(tags)
+
+        if hasattr(file, "write"):
+            file.write(data)
+        else:
+            write_file(file, data)
+
+    def __compile_tables(self, tags: list) -> bytes:
+        source_tags = sorted(self.reader.keys(), key=lambda t: self.reader.tables[t].offset)
+        tables = {}
+        for tag in source_tags:
+            if tag in tags:
+                with measure("compile", tag):
+                    data = self[tag].compile(self)
+                checksum = None
+            else:
+                data = self.reader[tag]
+                checksum = self.reader.tables[tag].checkSum
+
+            if tag == "head":
+                if self.recalcTimestamp and tag not in tags:
+                    modified = timestampNow()
+                    if self.isLoaded("head"):
+                        self.head_table.modified = modified
+                    data = data[:28] + struct.pack(">Q", modified) + data[36:]
+                # checkSumAdjustment must be zero when calculating the checksums
+                data = data[:8] + b"\0\0\0\0" + data[12:]
+                checksum = None
+
+            if checksum is None:
+                checksum = calcChecksum(data)
+            tables[tag] = (data, checksum)
+
+        num_tables = len(tables)
+        search_range, entry_selector, range_shift = getSearchRange(num_tables, 16)
+        directory = struct.pack(
+            ">4sHHHH", self.sfntVersion.encode("latin-1"), num_tables, search_range, entry_selector, range_shift
+        )
+        offset = 12 + 16 * num_tables
+        offsets = {}
+        for tag in source_tags:
+            offsets[tag] = offset
+            offset += (len(tables[tag][0]) + 3) & ~3
+        for tag in sorted(tables):
+            data, checksum = tables[tag]
+            directory += struct.pack(">4sLLL", tag.encode("latin-1"), checksum, offsets[tag], len(data))
+
+        checksum_adjustment = (0xB1B0AFBA - sum(c for _, c in tables.values()) - calcChecksum(directory)) & 0xFFFFFFFF
+
+        buffer = BytesIO()
+        buffer.write(directory)
+        for tag in source_tags:
+            data = tables[tag][0]
+            if tag == "head":
+                data = data[:8] + struct.pack(">L", checksum_adjustment) + data[12:]
+            buffer.write(data)
+            buffer.write(b"\0" * (-len(data) % 4))
+
+        return buffer.getvalue()
+
+    def __can_save_tables(self, tags: list) -> bool:
+        if self.reader is None or self.reader.flavor is not None or self.flavor is not None:
+            return False
+        if set(self.keys()) - {"GlyphOrder"} != set(self.reader.keys()):
+            return False
+        return not any(tag in DEPENDENT_TABLES for tag in tags)
+
+    def __get_original_font(self) -> TTFont:
+        """
+        Returns a TTFont that shares the reader of this font, so that tables can be decompiled again from the source
+        file without being affected by the changes made to this font.
+        """
+        if self.__original_font is None:
+            self.__original_font = TTFont()
+            # TTFont only initializes the table cache when it opens a file itself
+            self.__original_font._tableCache = None
+            self.__original_font.reader = self.reader
+            self.__original_font.sfntVersion = self.sfntVersion
+            self.__original_font.flavor = self.flavor
+            self.__original_font.flavorData = self.flavorData
+        return self.__original_font
+
     def set_bold(self):
         """
         Sets the bold bit in the OS/2 table and the head table, and clears the regular bit in the OS/2 table
@@ -220,6 +391,7 @@ class Font(TTFont):
 
         :return: The calculated italic angle.
         """
+        from beziers.path import BezierPath, Line, Point
 
         # Calculating italic angle from the font's glyph outlines
         def x_leftmost_intersection(paths, y):
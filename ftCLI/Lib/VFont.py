@@ -8,7 +8,10 @@ from ftCLI.Lib.Font import Font
 class VariableFont(Font):
     def __init__(self, file, recalcTimestamp=False):
         super().__init__(file=file, recalcTimestamp=recalcTimestamp)
-        self.fvar_table = self["fvar"]
+
+    @property
+    def fvar_table(self):
+        return self["fvar"]
 
     def get_axes(self) -> list:
         return [axis for axis in self["fvar"].axes if axis.flags == 0]
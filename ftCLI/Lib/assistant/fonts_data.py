@@ -11,12 +11,13 @@ from ftCLI.Lib.constants import (
     MAX_FULL_NAME_LEN,
     MAX_POSTSCRIPT_NAME_LEN,
 )
-from ftCLI.Lib.utils.cli_tools import get_fonts_list, get_style_mapping_file_path
+from ftCLI.Lib.utils.cli_tools import get_fonts_list, get_fonts_index, get_style_mapping_file_path
 from ftCLI.Lib.utils.click_tools import (
     generic_error_message,
     generic_info_message,
     generic_warning_message,
 )
+from ftCLI.Lib.utils.fonts_index import FontRecord, get_font_record
 
 
 class FontsDataFile(object):
@@ -67,6 +68,7 @@ class FontsDataFile(object):
                     if not font.is_cff:
                         source_type = 0
                 full_name = self.__normalize_string(font.get_file_name(source=source_type))
+                font_row = self.__get_font_row(FontRecord.from_font(font), styles_mapping_data)
                 family_name = row["family_name"]
                 style_name = full_name.replace(self.__normalize_string(family_name), "")
 
@@ -79,9 +81,9 @@ class FontsDataFile(object):
                     us_weight_class = self.__get_key_from_value(weights, weight_string)
                     wgt, weight = weights.get(us_weight_class)
                 else:
-                    us_weight_class = self.__get_font_row(font, styles_mapping_data)["us_weight_class"]
-                    wgt = self.__get_font_row(font, styles_mapping_data)["wgt"]
-                    weight = self.__get_font_row(font, styles_mapping_data)["weight"]
+                    us_weight_class = font_row["us_weight_class"]
+                    wgt = font_row["wgt"]
+                    weight = font_row["weight"]
                 row["us_weight_class"], row["wgt"], row["weight"] = (
                     us_weight_class,
                     wgt,
@@ -97,9 +99,9 @@ class FontsDataFile(object):
                     us_width_class = self.__get_key_from_value(widths, width_string)
                     wdt, width = widths.get(us_width_class)
                 else:
-                    us_width_class = self.__get_font_row(font, styles_mapping_data)["us_width_class"]
-                    wdt = self.__get_font_row(font, styles_mapping_data)["wdt"]
-                    width = self.__get_font_row(font, styles_mapping_data)["width"]
+                    us_width_class = font_row["us_width_class"]
+                    wdt = font_row["wdt"]
+                    width = font_row["width"]
                 row["us_width_class"], row["wdt"], row["width"] = (
                     us_width_class,
                     wdt,
@@ -510,14 +512,15 @@ class FontsDataFile(object):
         """
         fonts_path = os.path.dirname(os.path.dirname(self.file))
         files = get_fonts_list(fonts_path)
+        index = get_fonts_index(fonts_path)
         if not styles_mapping_file:
             styles_mapping_file = get_style_mapping_file_path(fonts_path)
         styles_mapping_data = StylesMappingFile(styles_mapping_file).get_data()
         rows = []
         for f in files:
             try:
-                font = Font(f)
-                font_row = self.__get_font_row(font, styles_mapping_data)
+                record = get_font_record(f, index=index)
+                font_row = self.__get_font_row(record, styles_mapping_data)
                 font_row["selected"] = 1
                 rows.append(font_row)
             except Exception as e:
@@ -525,23 +528,22 @@ class FontsDataFile(object):
         self.save(rows)
 
     @staticmethod
-    def __get_font_row(font: Font, styles_mapping_data: dict) -> dict:
+    def __get_font_row(record: FontRecord, styles_mapping_data: dict) -> dict:
         """
         Returns the row to write in the styles_mapping.json file.
 
-        :param font: a Font object
+        :param record: a FontRecord object, with metadata
         :param styles_mapping_data: a dictionary of the styles mapping file
         :return: A dictionary with the following keys:
         """
 
-        font_info = font.get_font_info()
-        file_name = font_info["file_name"]["value"]
-        family_name = font_info["family_name"]["value"]
-        is_bold = font_info["is_bold"]["value"]
-        is_italic = font_info["is_italic"]["value"]
-        is_oblique = font_info["is_oblique"]["value"]
-        us_weight_class = str(font_info["us_weight_class"]["value"])
-        us_width_class = str(font_info["us_width_class"]["value"])
+        file_name = record.file
+        family_name = record.best_family_name
+        is_bold = record.is_bold
+        is_italic = record.is_italic
+        is_oblique = record.is_oblique
+        us_weight_class = str(record.us_weight_class)
+        us_width_class = str(record.us_width_class)
         weights: dict = styles_mapping_data["weights"]
         widths: dict = styles_mapping_data["widths"]
         italics: list = styles_mapping_data["italics"]
@@ -0,0 +1,212 @@
+import abc
+import os
+import time
+
+from ftCLI.Lib.converters.manifest import ConversionManifest, get_manifest_file_path, skip_up_to_date_files
+from ftCLI.Lib.converters.options import Options
+from ftCLI.Lib.utils.cli_tools import process_files, get_journal, record_files, skip_completed_files
+from ftCLI.Lib.utils.click_tools import blank_line, generic_info_message, generic_error_message
+from ftCLI.Lib.utils.journal import get_options_fingerprint
+
+# Options that don't change the output files, and are left out of the conversion fingerprint
+FINGERPRINT_IGNORED_OPTIONS = ("backend", "incremental")
+
+
+class JobResult(object):
+    """
+    The result of the conversion of a single file.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.output_files = []
+        self.elapsed_time = 0.0
+        self.input_size = 0
+        self.output_size = 0
+        self.error = None
+
+    @property
+    def is_converted(self) -> bool:
+        return self.error is None and len(self.output_files) > 0
+
+
+class JobStats(object):
+    """
+    Aggregate statistics of a converter run. ``results`` only holds the processed files: files skipped because they
+    have been completed by a previous run, or because their outputs are up-to-date, are counted in ``skipped_files``.
+    """
+
+    def __init__(self, results: list, elapsed_time: float, skipped_files: int = 0):
+        self.results = results
+        self.elapsed_time = elapsed_time
+        self.skipped_files = skipped_files
+
+    @property
+    def total_files(self) -> int:
+        return self.processed_files + self.skipped_files
+
+    @property
+    def processed_files(self) -> int:
+        return len(self.results)
+
+    @property
+    def converted_files(self) -> int:
+        return len([r for r in self.results if r.is_converted])
+
+    @property
+    def failed_files(self) -> int:
+        return len([r for r in self.results if r.error is not None])
+
+    @property
+    def output_files(self) -> int:
+        return sum(len(r.output_files) for r in self.results)
+
+    @property
+    def input_size(self) -> int:
+        return sum(r.input_size for r in self.results)
+
+    @property
+    def output_size(self) -> int:
+        return sum(r.output_size for r in self.results)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.processed_files / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.input_size / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+
+class JobRunner(abc.ABC):
+    """
+    Base class of the converters job runners.
+
+    Subclasses implement ``convert()``, which converts a single file. ``run()`` converts all the files with the backend
+    set in ``options.backend`` (see ``process_files``), times each conversion, and prints the aggregate statistics.
+    Job runners are sent to the worker processes with their options, so they must be picklable.
+
+    ``operation`` is the operation type used to estimate the memory of each conversion under the ``--max-memory``
+    budget (see ``estimate_job_memory``). With the ``--resume`` option, files whose conversion has no error are recorded
+    in the journal, and are skipped by later runs. When ``options.incremental`` is True, files whose conversion is
+    up-to-date in the manifest of the output directory (see ``ConversionManifest``) are skipped too.
+    """
+
+    operation = "edit"
+
+    def __init__(self, options: Options):
+        self.options = options
+
+    @abc.abstractmethod
+    def convert(self, file) -> list:
+        """
+        Converts a single file.
+
+        :param file: the path to the input file
+        :return: The paths to the saved files, empty if the file has been skipped.
+        """
+
+    def run(self, files) -> JobStats:
+        """
+        Converts the files and prints the statistics of the run.
+
+        :param files: the paths to the input files, an iterable. Files found lazily (see ``check_input_path``) are
+            converted while the rest are still being found.
+        :return: A JobStats object.
+        """
+        start_time = time.time()
+
+        # Skipped files are left out before numbering the files, so that they're not counted in the statistics.
+        # process_files() is told not to look for them again. The files are counted as they are found.
+        input_files, files_to_convert = [], []
+        files = skip_completed_files(record_files(files, input_files), get_journal())
+        manifest = None
+        if self.options.incremental:
+            manifest = ConversionManifest(get_manifest_file_path(self.options.output_dir))
+            files = skip_up_to_date_files(files, manifest, self.get_fingerprint())
+
+        results = process_files(
+            self.run_job,
+            enumerate(record_files(files, files_to_convert), start=1),
+            backend=self.options.backend,
+            operation=self.operation,
+            is_completed=self.is_completed,
+            skip_completed=False,
+        )
+        skipped_files = len(input_files) - len(files_to_convert)
+        results = [
+            result if result is not None else self.get_failed_result(f) for f, result in zip(files_to_convert, results)
+        ]
+        # The output files are written in the background, and have all been written when process_files() returns
+        for result in results:
+            result.output_size = sum(os.path.getsize(f) for f in result.output_files if os.path.exists(f))
+        if manifest is not None:
+            for result in results:
+                if self.is_completed(result):
+                    manifest.update(result.file, self.get_fingerprint(), result.output_files)
+            manifest.save()
+        stats = JobStats(results, elapsed_time=time.time() - start_time, skipped_files=skipped_files)
+        self.print_stats(stats)
+        return stats
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns the fingerprint of the conversion and of the options that change its output files.
+        """
+        options = {k: v for k, v in vars(self.options).items() if k not in FINGERPRINT_IGNORED_OPTIONS}
+        return get_options_fingerprint(self.operation, options)
+
+    def run_job(self, job: tuple) -> JobResult:
+        """
+        Converts a single file and collects its timing and sizes.
+
+        :param job: a tuple with the number of the file and its path
+        :return: A JobResult object.
+        """
+        count, file = job
+        result = JobResult(file)
+        t = time.time()
+
+        blank_line()
+        generic_info_message(f"Converting file {count}: {os.path.basename(file)}")
+        try:
+            result.input_size = os.path.getsize(file)
+            result.output_files = self.convert(file) or []
+        except Exception as e:
+            result.error = str(e)
+            generic_error_message(e)
+
+        result.elapsed_time = time.time() - t
+        if result.is_converted:
+            generic_info_message(f"Elapsed time: {round(result.elapsed_time, 3)} seconds")
+        return result
+
+    @staticmethod
+    def is_completed(result: JobResult) -> bool:
+        return result is not None and result.error is None
+
+    @staticmethod
+    def get_failed_result(file) -> JobResult:
+        # run_job() catches all the exceptions, so results are None only if the output files couldn't be written, or if
+        # the worker process has been killed after a timeout or has crashed. The error has already been printed.
+        result = JobResult(file)
+        result.error = "The output files couldn't be written, or the worker process has timed out or crashed"
+        return result
+
+    @staticmethod
+    def print_stats(stats: JobStats) -> None:
+        blank_line()
+        generic_info_message(f"Total files       : {stats.total_files}")
+        if stats.skipped_files > 0:
+            generic_info_message(f"Processed files   : {stats.processed_files}")
+        generic_info_message(f"Converted files   : {stats.converted_files}")
+        if stats.failed_files > 0:
+            generic_info_message(f"Failed files      : {stats.failed_files}")
+        if stats.skipped_files > 0:
+            generic_info_message(f"Skipped files     : {stats.skipped_files}")
+        generic_info_message(f"Output files      : {stats.output_files}")
+        generic_info_message(f"Elapsed time      : {round(stats.elapsed_time, 3)} seconds")
+        generic_info_message(
+            f"Throughput        : {round(stats.files_per_second, 2)} files/s, "
+            f"{round(stats.bytes_per_second / 1024 / 1024, 2)} MB/s"
+        )
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+
+from ftCLI.Lib.utils.cli_tools import get_project_files_path
+from ftCLI.Lib.utils.click_tools import file_up_to_date_message
+from ftCLI.Lib.utils.journal import get_file_hash
+
+
+class ConversionManifest(object):
+    """
+    A JSON file, stored in the project files folder of the output directory, that maps each converted file to the hash
+    of its content, the fingerprint of the conversion options and the hashes of the saved files.
+
+    A conversion is up-to-date, and can be skipped, if the input file and the options haven't changed since it was
+    recorded and all its output files still exist unchanged.
+    """
+
+    def __init__(self, manifest_file):
+        self.file = manifest_file
+        self.entries = {}
+        try:
+            with open(self.file, encoding="utf-8") as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                self.entries = entries
+        except (OSError, ValueError):
+            pass
+
+    def is_up_to_date(self, file, fingerprint: str) -> bool:
+        """
+        Checks if the conversion of a file with the given options is up-to-date.
+
+        :param file: the path to the input file
+        :param fingerprint: the fingerprint of the conversion and its options (see ``get_options_fingerprint``)
+        :return: True if the conversion can be skipped.
+        """
+        entry = self.entries.get(os.path.abspath(file))
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return False
+        try:
+            if get_file_hash(file) != entry.get("hash"):
+                return False
+            for output_file, output_hash in entry.get("outputs", {}).items():
+                if get_file_hash(output_file) != output_hash:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    def update(self, file, fingerprint: str, output_files: list) -> None:
+        """
+        Records the conversion of a file.
+
+        :param file: the path to the input file
+        :param fingerprint: the fingerprint of the conversion options
+        :param output_files: the paths to the saved files
+        """
+        try:
+            self.entries[os.path.abspath(file)] = dict(
+                hash=get_file_hash(file),
+                fingerprint=fingerprint,
+                outputs={os.path.abspath(f): get_file_hash(f) for f in output_files},
+            )
+        except OSError:
+            self.entries.pop(os.path.abspath(file), None)
+
+    def save(self) -> None:
+        """
+        Writes the manifest. The file is replaced atomically, so an interrupted run can't leave a truncated manifest.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.file), exist_ok=True)
+            fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(self.file), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(temp_file, self.file)
+        except OSError:
+            pass
+
+
+def get_manifest_file_path(output_dir: str) -> str:
+    return os.path.join(get_project_files_path(output_dir), "conversions.json")
+
+
+def skip_up_to_date_files(files, manifest: ConversionManifest, fingerprint: str):
+    """
+    Yields the files whose conversion is not up-to-date, and prints a message for each skipped file.
+
+    :param files: the paths to the input files
+    :param manifest: a ConversionManifest object
+    :param fingerprint: the fingerprint of the conversion options
+    """
+    for file in files:
+        if manifest.is_up_to_date(file, fingerprint):
+            file_up_to_date_message(file)
+            continue
+        yield file
@@ -3,6 +3,8 @@ class Options(object):
         self.recalc_timestamp = False
         self.output_dir = None
         self.overwrite = True
+        self.backend = "process"
+        self.incremental = False
 
 
 class WebToSFNTOptions(Options):
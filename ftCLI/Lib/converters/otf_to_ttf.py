@@ -1,56 +1,34 @@
-import os
-import time
-
 from fontTools.misc.cliTools import makeOutputFileName
 from fontTools.pens.cu2quPen import Cu2QuPen
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTLibError, newTable
 
 from ftCLI.Lib.Font import Font
+from ftCLI.Lib.converters.job_runner import JobRunner
 from ftCLI.Lib.converters.options import CFFToTrueTypeOptions
-from ftCLI.Lib.utils.click_tools import generic_info_message, file_saved_message, generic_error_message
-
-
-class JobRunner_otf2ttf(object):
-    def __init__(self):
-        super().__init__()
-        self.options = CFFToTrueTypeOptions()
+from ftCLI.Lib.utils.click_tools import file_saved_message
+from ftCLI.Lib.utils.output_writer import save_font
 
-    def run(self, files) -> None:
-        count = 0
-        converted_files_count = 0
-        start_time = time.time()
 
-        for file in files:
-            t = time.time()
-            count += 1
+class JobRunner_otf2ttf(JobRunner):
+    operation = "otf2ttf"
 
-            try:
-                print()
-                generic_info_message(f"Converting file {count} of {len(files)}: {os.path.basename(file)}")
-
-                font = Font(file, recalcTimestamp=self.options.recalc_timestamp)
-
-                converter = CFFToTrueType(font=font)
-                converter.options.max_err = self.options.max_err
-                ttf_font = converter.run()
-
-                output_file = makeOutputFileName(
-                    file, outputDir=self.options.output_dir, overWrite=self.options.overwrite, extension=".ttf"
-                )
-                ttf_font.save(output_file)
+    def __init__(self):
+        super().__init__(options=CFFToTrueTypeOptions())
 
-                generic_info_message(f"Elapsed time: {round(time.time() - t, 3)} seconds")
-                file_saved_message(output_file)
-                converted_files_count += 1
+    def convert(self, file) -> list:
+        font = Font(file, recalcTimestamp=self.options.recalc_timestamp)
 
-            except Exception as e:
-                generic_error_message(e)
+        converter = CFFToTrueType(font=font)
+        converter.options.max_err = self.options.max_err
+        ttf_font = converter.run()
 
-        print()
-        generic_info_message(f"Total files       : {len(files)}")
-        generic_info_message(f"Converted files   : {converted_files_count}")
-        generic_info_message(f"Elapsed time      : {round(time.time() - start_time, 3)} seconds")
+        output_file = makeOutputFileName(
+            file, outputDir=self.options.output_dir, overWrite=self.options.overwrite, extension=".ttf"
+        )
+        save_font(ttf_font, output_file)
+        file_saved_message(output_file)
+        return [output_file]
 
 
 class CFFToTrueType(object):
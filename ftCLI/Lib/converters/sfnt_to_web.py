@@ -1,57 +1,37 @@
-import os
-import time
-
 from fontTools.misc.cliTools import makeOutputFileName
 
 from ftCLI.Lib.Font import Font
+from ftCLI.Lib.converters.job_runner import JobRunner
 from ftCLI.Lib.converters.options import SFNTToWebOptions
-from ftCLI.Lib.utils.click_tools import generic_info_message, file_saved_message, generic_error_message
-
-
-class JobRunner_ft2wf(object):
-    def __init__(self):
-        super().__init__()
-        self.options = SFNTToWebOptions()
-
-    def run(self, files) -> None:
+from ftCLI.Lib.utils.click_tools import file_saved_message
+from ftCLI.Lib.utils.output_writer import save_font
 
-        count = 0
-        for file in files:
-            t = time.time()
-            count += 1
-            print()
-            generic_info_message(f"Converting file {count} of {len(files)}: {os.path.basename(file)}")
 
-            try:
-                font = Font(file, recalcTimestamp=self.options.recalc_timestamp)
+class JobRunner_ft2wf(JobRunner):
+    operation = "ft2wf"
 
-                if font.flavor is not None:
-                    continue
-
-                if self.options.woff:
-                    converter = SFNTToWeb(font=font, flavor="woff")
-                    web_font = converter.run()
-                    extension = web_font.get_real_extension()
-                    output_file = makeOutputFileName(
-                        file, extension=extension, outputDir=self.options.output_dir, overWrite=self.options.overwrite
-                    )
-                    web_font.save(output_file, reorderTables=False)
-                    file_saved_message(output_file)
-                    generic_info_message(f"Elapsed time: {round(time.time() - t, 3)} seconds")
-
-                if self.options.woff2:
-                    converter = SFNTToWeb(font=font, flavor="woff2")
-                    web_font = converter.run()
-                    extension = web_font.get_real_extension()
-                    output_file = makeOutputFileName(
-                        file, extension=extension, outputDir=self.options.output_dir, overWrite=self.options.overwrite
-                    )
-                    web_font.save(output_file, reorderTables=False)
-                    file_saved_message(output_file)
-                    generic_info_message(f"Elapsed time: {round(time.time() - t, 3)} seconds")
-
-            except Exception as e:
-                generic_error_message(e)
+    def __init__(self):
+        super().__init__(options=SFNTToWebOptions())
+
+    def convert(self, file) -> list:
+        font = Font(file, recalcTimestamp=self.options.recalc_timestamp)
+        if font.flavor is not None:
+            return []
+
+        output_files = []
+        flavors = [flavor for flavor in ("woff", "woff2") if getattr(self.options, flavor)]
+        for flavor in flavors:
+            converter = SFNTToWeb(font=font, flavor=flavor)
+            web_font = converter.run()
+            extension = web_font.get_real_extension()
+            output_file = makeOutputFileName(
+                file, extension=extension, outputDir=self.options.output_dir, overWrite=self.options.overwrite
+            )
+            save_font(web_font, output_file, reorderTables=False)
+            file_saved_message(output_file)
+            output_files.append(output_file)
+
+        return output_files
 
 
 class SFNTToWeb(object):
@@ -1,4 +1,3 @@
-import time
 from io import BytesIO
 
 import pathops
@@ -12,104 +11,87 @@ from fontTools.ttLib import TTFont
 from fontTools.ttLib.scaleUpem import scale_upem
 
 from ftCLI.Lib.Font import Font
+from ftCLI.Lib.converters.job_runner import JobRunner
 from ftCLI.Lib.converters.options import TrueTypeToCFFOptions
 from ftCLI.Lib.utils.click_tools import file_saved_message, generic_info_message, generic_error_message
+from ftCLI.Lib.utils.output_writer import save_font, flush_output_files
 from ftCLI.Lib.utils.subsetter import BaseSubsetter
 
 
-class JobRunner_ttf2otf(object):
-    def __init__(self):
-        super().__init__()
-        self.options = TrueTypeToCFFOptions()
-
-    def run(self, files) -> None:
-        count = 0
-        converted_files_count = 0
-        start_time = time.time()
+class JobRunner_ttf2otf(JobRunner):
+    operation = "ttf2otf"
 
-        for file in files:
-            t = time.time()
-            count += 1
-
-            try:
-                print()
-                generic_info_message(f"Converting file {count} of {len(files)}: {file}")
-
-                # Temporary workaround, waiting to understand the reason why, if we scale the UPM of a Font object
-                # instead of a TTFont object, the new UPM values is wrong
-                if self.options.scale_upm:
-                    generic_info_message("Scaling source font to 1000 units-per-em")
-                    tmp_font = TTFont(file, recalcTimestamp=self.options.recalc_timestamp)
-                    scale_upem(tmp_font, 1000)
-                    buf = BytesIO()
-                    tmp_font.save(buf)
-                    data = buf.getvalue()
-                    source_font = Font(BytesIO(data), recalcTimestamp=self.options.recalc_timestamp)
-
-                else:
-                    source_font = Font(file, recalcBBoxes=False, recalcTimestamp=self.options.recalc_timestamp)
-
-                # Set tolerance as a ratio of unitsPerEm
-                tolerance = self.options.tolerance / 1000 * source_font.head_table.unitsPerEm
-
-                ext = ".otf" if source_font.flavor is None else '.' + str(source_font.flavor)
-                suffix = "" if source_font.flavor is None else ".otf"
-                output_file = makeOutputFileName(
-                    file,
-                    suffix=suffix,
-                    extension=ext,
-                    outputDir=self.options.output_dir,
-                    overWrite=self.options.overwrite,
-                )
-
-                if self.options.safe_mode:
-                    # Create a temporary OTF file with T2CharStringPen...
-                    from ftCLI.Lib.converters.otf_to_ttf import CFFToTrueType
-
-                    ttf2otf_converter_temp = TrueTypeToCFF(source_font)
-                    ttf2otf_converter_temp.options.charstring_source = "t2"
-                    ttf2otf_converter_temp.options.subroutinize = False
-                    ttf2otf_converter_temp.options.purge_glyphs = self.options.remove_glyphs
-                    temp_cff_font = ttf2otf_converter_temp.run()
-
-                    # ... and convert it back to a temporary TTF file that will be used for conversion
-                    otf_to_ttf_converter = CFFToTrueType(temp_cff_font)
-                    # since the temp CFF font has many more points than needed, increase max_err from 1.0 to 2.0
-                    otf_to_ttf_converter.options.max_err = 2.0
-                    input_font = otf_to_ttf_converter.run()
-
-                else:
-                    input_font = source_font
-
-                ttf2otf_converter = TrueTypeToCFF(font=input_font)
-                ttf2otf_converter.options.charstring_source = "qu2cu"
-                ttf2otf_converter.options.tolerance = tolerance
-                ttf2otf_converter.options.subroutinize = self.options.subroutinize
-                ttf2otf_converter.options.purge_glyphs = self.options.remove_glyphs
-                ttf2otf_converter.options.check_outlines = self.options.check_outlines
-                generic_info_message("Converting outlines")
-                cff_font = ttf2otf_converter.run()
-
-                cff_font.save(output_file)
-
-                if self.options.check_outlines:
-                    generic_info_message("Checking outlines with checkoutlinesufo")
-                    run_shell_command(
-                        args=["checkoutlinesufo", output_file, "--error-correction-mode", "--quiet-mode"],
-                        suppress_output=True
-                    )
-
-                generic_info_message(f"Elapsed time: {round(time.time() - t, 3)} seconds")
-                file_saved_message(output_file)
-                converted_files_count += 1
-
-            except Exception as e:
-                generic_error_message(e)
+    def __init__(self):
+        super().__init__(options=TrueTypeToCFFOptions())
+
+    def convert(self, file) -> list:
+        # Temporary workaround, waiting to understand the reason why, if we scale the UPM of a Font object
+        # instead of a TTFont object, the new UPM values is wrong
+        if self.options.scale_upm:
+            generic_info_message("Scaling source font to 1000 units-per-em")
+            tmp_font = TTFont(file, recalcTimestamp=self.options.recalc_timestamp)
+            scale_upem(tmp_font, 1000)
+            buf = BytesIO()
+            tmp_font.save(buf)
+            data = buf.getvalue()
+            source_font = Font(BytesIO(data), recalcTimestamp=self.options.recalc_timestamp)
+
+        else:
+            source_font = Font(file, recalcBBoxes=False, recalcTimestamp=self.options.recalc_timestamp)
+
+        # Set tolerance as a ratio of unitsPerEm
+        tolerance = self.options.tolerance / 1000 * source_font.head_table.unitsPerEm
+
+        ext = ".otf" if source_font.flavor is None else '.' + str(source_font.flavor)
+        suffix = "" if source_font.flavor is None else ".otf"
+        output_file = makeOutputFileName(
+            file,
+            suffix=suffix,
+            extension=ext,
+            outputDir=self.options.output_dir,
+            overWrite=self.options.overwrite,
+        )
 
-        print()
-        generic_info_message(f"Total files       : {len(files)}")
-        generic_info_message(f"Converted files   : {converted_files_count}")
-        generic_info_message(f"Elapsed time      : {round(time.time() - start_time, 3)} seconds")
+        if self.options.safe_mode:
+            # Create a temporary OTF file with T2CharStringPen...
+            from ftCLI.Lib.converters.otf_to_ttf import CFFToTrueType
+
+            ttf2otf_converter_temp = TrueTypeToCFF(source_font)
+            ttf2otf_converter_temp.options.charstring_source = "t2"
+            ttf2otf_converter_temp.options.subroutinize = False
+            ttf2otf_converter_temp.options.purge_glyphs = self.options.remove_glyphs
+            temp_cff_font = ttf2otf_converter_temp.run()
+
+            # ... and convert it back to a temporary TTF file that will be used for conversion
+            otf_to_ttf_converter = CFFToTrueType(temp_cff_font)
+            # since the temp CFF font has many more points than needed, increase max_err from 1.0 to 2.0
+            otf_to_ttf_converter.options.max_err = 2.0
+            input_font = otf_to_ttf_converter.run()
+
+        else:
+            input_font = source_font
+
+        ttf2otf_converter = TrueTypeToCFF(font=input_font)
+        ttf2otf_converter.options.charstring_source = "qu2cu"
+        ttf2otf_converter.options.tolerance = tolerance
+        ttf2otf_converter.options.subroutinize = self.options.subroutinize
+        ttf2otf_converter.options.purge_glyphs = self.options.remove_glyphs
+        ttf2otf_converter.options.check_outlines = self.options.check_outlines
+        generic_info_message("Converting outlines")
+        cff_font = ttf2otf_converter.run()
+
+        save_font(cff_font, output_file)
+
+        if self.options.check_outlines:
+            generic_info_message("Checking outlines with checkoutlinesufo")
+            flush_output_files()
+            run_shell_command(
+                args=["checkoutlinesufo", output_file, "--error-correction-mode", "--quiet-mode"],
+                suppress_output=True
+            )
+
+        file_saved_message(output_file)
+        return [output_file]
 
 
 class TrueTypeToCFF(object):
@@ -7,18 +7,20 @@ from pathvalidate import sanitize_filename
 from ftCLI.Lib.VFont import VariableFont
 from ftCLI.Lib.converters.options import Var2StaticOptions
 from ftCLI.Lib.utils.click_tools import (
+    blank_line,
     generic_warning_message,
     generic_info_message,
     file_saved_message,
     generic_error_message,
 )
+from ftCLI.Lib.utils.output_writer import save_font
 
 
 class VariableToStatic(object):
     def __init__(self):
         self.options = Var2StaticOptions()
 
-    def run(self, variable_font: VariableFont, instances: list = None):
+    def run(self, variable_font: VariableFont, instances: list = None) -> list:
         start_time = time.time()
 
         if not instances:
@@ -26,7 +28,7 @@ class VariableToStatic(object):
 
         if len(instances) == 0:
             generic_error_message("No instances found")
-            return
+            return []
 
         if self.options.update_name_table:
             if "STAT" not in variable_font:
@@ -36,12 +38,13 @@ class VariableToStatic(object):
                 self.options.update_name_table = False
                 generic_warning_message("Cannot update name table if there are no STAT Axis Values.")
 
+        output_files = []
         instance_count = 0
         for instance in instances:
             t = time.time()
             instance_count += 1
 
-            print()
+            blank_line()
             generic_info_message(f"Exporting instance {instance_count} of {len(instances)}")
 
             static_instance = instantiateVariableFont(
@@ -73,11 +76,14 @@ class VariableToStatic(object):
                 outputDir=self.options.output_dir,
                 overWrite=self.options.overwrite,
             )
-            static_instance.save(output_file)
+            save_font(static_instance, output_file)
 
             generic_info_message(f"Done in {round(time.time() - t, 3)} seconds")
             file_saved_message(output_file)
+            output_files.append(output_file)
 
-        print()
+        blank_line()
         generic_info_message(f"Total instances : {len(instances)}")
         generic_info_message(f"Elapsed time    : {round(time.time() - start_time, 3)} seconds")
+
+        return output_files
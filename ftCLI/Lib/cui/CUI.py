@@ -21,8 +21,10 @@ from ftCLI.Lib.utils.cli_tools import (
     get_style_mapping_file_path,
     get_fonts_data_file_path,
     get_fonts_list,
+    get_fonts_index,
 )
 from ftCLI.Lib.utils.click_tools import generic_error_message, no_valid_fonts_message, OptionalParamType
+from ftCLI.Lib.utils.fonts_index import FontsIndex, get_font_record
 from ftCLI.Lib.utils.misc import wrap_string
 
 
@@ -48,7 +50,7 @@ class AssistantUI(object):
         click.clear()
         self.console.set_window_title("ftCLI assistant UI")
 
-        rows = get_fonts_list_rows(files=get_fonts_list(self.input_path))
+        rows = get_fonts_list_rows(files=get_fonts_list(self.input_path), index=get_fonts_index(self.input_path))
         table = get_fonts_list_table(rows=rows)
         table.title = "ftCLI Assistant - Main"
         table.title_style = "bold green"
@@ -578,20 +580,27 @@ def get_commands_tree(commands: dict) -> Tree:
     return commands_tree
 
 
-def get_fonts_list_rows(files) -> list:
+def get_fonts_list_rows(files, index: FontsIndex = None) -> list:
+    """
+    Returns the rows of the fonts list table.
+
+    :param files: the font files
+    :param index: the fonts index where to read the fonts data from. If None, the fonts are parsed.
+    :return: A list of dictionaries.
+    """
     rows = []
     for file in files:
         try:
-            font = Font(file)
+            record = get_font_record(file, index=index)
             row = dict(
-                file_name=os.path.basename(font.file),
-                family_name=font.name_table.getBestFamilyName(),
-                subfamily_name=font.name_table.getBestSubFamilyName(),
-                us_width_class=str(font.os_2_table.usWidthClass),
-                us_weight_class=str(font.os_2_table.usWeightClass),
-                is_bold=str(int(font.is_bold)),
-                is_italic=str(int(font.is_italic)),
-                is_oblique=str(int(font.is_oblique)),
+                file_name=os.path.basename(record.file),
+                family_name=record.best_family_name,
+                subfamily_name=record.best_subfamily_name,
+                us_width_class=str(record.us_width_class),
+                us_weight_class=str(record.us_weight_class),
+                is_bold=str(int(record.is_bold)),
+                is_italic=str(int(record.is_italic)),
+                is_oblique=str(int(record.is_oblique)),
             )
             rows.append(row)
         except Exception as e:
@@ -628,13 +637,13 @@ def get_fonts_list_table(rows: list) -> Table:
     return table
 
 
-def print_fonts_list(files: list):
+def print_fonts_list(files: list, index: FontsIndex = None):
     """
     Prints list of fonts in `input_path` with basic information: Family name, Style name, usWidthClass, usWeightClass,
     Bold value, Italic value, Oblique value
     """
 
-    rows = get_fonts_list_rows(files)
+    rows = get_fonts_list_rows(files, index=index)
     table = get_fonts_list_table(rows)
     table.header_style = "bold cyan"
     console = Console()
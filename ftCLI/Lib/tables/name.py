@@ -52,9 +52,7 @@ class TableName(table__n_a_m_e):
         """
 
         names = self.filter_namerecords(name_ids=name_ids, platform_id=platform_id, lang_string=language_string)
-
-        for name in names:
-            self.removeNames(name.nameID, name.platformID, name.platEncID, name.langID)
+        self.remove_namerecords(names)
 
     def del_all_names(self, platform_id=None, language_string=None):
         """
@@ -65,9 +63,20 @@ class TableName(table__n_a_m_e):
         """
 
         names = self.filter_namerecords(platform_id=platform_id, lang_string=language_string)
+        self.remove_namerecords(names)
 
-        for name in names:
-            self.removeNames(name.nameID, name.platformID, name.platEncID, name.langID)
+    def remove_namerecords(self, names) -> None:
+        """
+        Removes the given namerecords, and any other namerecord with the same name ID, platform ID, encoding ID and
+        language ID, in a single pass over the table.
+
+        :param names: the namerecords to remove
+        """
+        keys = {(name.nameID, name.platformID, name.platEncID, name.langID) for name in names}
+        if keys:
+            self.names = [
+                name for name in self.names if (name.nameID, name.platformID, name.platEncID, name.langID) not in keys
+            ]
 
     def find_replace(
         self,
@@ -93,37 +102,24 @@ class TableName(table__n_a_m_e):
         :type platform_id: int
         """
 
-        name_ids = [name.nameID for name in self.names]
+        name_ids = set(name.nameID for name in self.names)
 
         if name_ids_to_include != ():
-            name_ids = [name.nameID for name in self.names if name.nameID in name_ids_to_include]
+            name_ids = set(name.nameID for name in self.names if name.nameID in name_ids_to_include)
 
         if name_ids_to_skip != ():
-            name_ids = [name.nameID for name in self.names if name.nameID not in name_ids_to_skip]
+            name_ids = set(name.nameID for name in self.names if name.nameID not in name_ids_to_skip)
 
         names = self.filter_namerecords(name_ids=name_ids, platform_id=platform_id)
 
-        for name in self.names:
-            if name in names:
-                if old_string in str(name):
-                    string = str(name).replace(old_string, new_string).replace("  ", " ").strip()
-                    self.setName(
-                        string,
-                        name.nameID,
-                        name.platformID,
-                        name.platEncID,
-                        name.langID,
-                    )
+        # The records are changed directly: setName() would look for each record in the whole table
+        for name in names:
+            if old_string in str(name):
+                name.string = str(name).replace(old_string, new_string).replace("  ", " ").strip()
 
     def remove_leading_trailing_spaces(self):
         for name in self.names:
-            self.setName(
-                str(name).strip(),
-                name.nameID,
-                name.platformID,
-                name.platEncID,
-                name.langID,
-            )
+            name.string = str(name).strip()
 
     def append_string(self, name_ids, platform_id=None, language_string=None, prefix=None, suffix=None) -> None:
         """
@@ -145,14 +141,7 @@ class TableName(table__n_a_m_e):
                 string = f"{prefix}{string}"
             if suffix is not None:
                 string = f"{string}{suffix}"
-
-            self.setName(
-                string=string,
-                nameID=name.nameID,
-                platformID=name.platformID,
-                platEncID=name.platEncID,
-                langID=name.langID,
-            )
+            name.string = string
 
     def filter_namerecords(
         self,
@@ -174,6 +163,7 @@ class TableName(table__n_a_m_e):
         """
         filtered_names = self.names
         if name_ids is not None:
+            name_ids = set(name_ids)
             filtered_names = [name for name in filtered_names if name.nameID in name_ids]
         if platform_id is not None:
             filtered_names = [name for name in filtered_names if name.platformID == platform_id]
@@ -1,10 +1,79 @@
+import atexit
+import collections
+import contextlib
+import fnmatch
+import io
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import itertools
+import multiprocessing
+import multiprocessing.connection
 import os
+import sqlite3
 import sys
+import threading
+import time
+from typing import Iterator
 
+import click
+from fontTools.misc.cliTools import makeOutputFileName
 from fontTools.ttLib import TTLibError
 
-from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.click_tools import no_valid_fonts_message, generic_error_message
+from ftCLI.Lib.utils.click_tools import (
+    SCAN_OPTIONS_KEY,
+    blank_line,
+    file_already_completed_message,
+    no_valid_fonts_message,
+    generic_error_message,
+    generic_info_message,
+    file_saved_message,
+    file_not_changed_message,
+    get_log_options,
+    log_file,
+    set_log_options,
+)
+from ftCLI.Lib.utils.font_header import FontHeader
+from ftCLI.Lib.utils.fonts_index import FontsIndex, open_fonts_index
+from ftCLI.Lib.utils.job_memory import estimate_job_memory
+from ftCLI.Lib.utils.journal import Journal, open_journal
+from ftCLI.Lib.utils.output_writer import (
+    flush_output_files,
+    get_output_files_checkpoint,
+    is_fsync_enabled,
+    report_output_files,
+    set_fsync,
+)
+from ftCLI.Lib.utils.process_memory import MAX_RSS_EXIT_CODE, MaxRssExceeded, exit_on_max_rss, format_size, limit_rss
+from ftCLI.Lib.utils.profiler import (
+    FileProfile,
+    MemoryReport,
+    ProfileReport,
+    enable_profiling,
+    is_memory_tracking_enabled,
+    is_profiling_enabled,
+    measure,
+    profile_file,
+    time_discovery,
+)
+
+# Fonts indexes opened by get_fonts_index, keyed on the index file path
+_fonts_indexes = {}
+
+# Number of files queued for each worker when processing fonts with more than one job
+PROCESSING_QUEUE_SIZE = 2
+
+# Backends of process_files
+PROCESSING_BACKENDS = ("serial", "thread", "process")
+
+# Scan options read by process_files, not by the directory scan
+PROCESSING_OPTIONS = (
+    "jobs", "timeout", "max_memory", "max_rss", "resume", "fsync", "profile", "mem_report", "progress"
+)
+
+# Command parameters that don't change the result of a run, and are left out of the journal fingerprint
+JOURNAL_IGNORED_PARAMS = ("input_path", "backend")
+
+# Folder of the files written by ftCLI (fonts index, journal, manifests...), never scanned for fonts
+PROJECT_FILES_FOLDER = "ftCLI_files"
 
 
 def check_input_path(
@@ -15,20 +84,67 @@ def check_input_path(
     allow_static=True,
     allow_variable=True,
 ):
-    files = get_fonts_list(
+    """
+    Returns an iterator over the valid font files found in ``input_path``, or exits if no valid font is found.
+
+    The directory scan is lazy: only the first valid font is looked for before returning, so that commands can start
+    processing it while the rest of the directory is still being scanned. Commands that need the total number of files
+    must convert the result to a list.
+
+    The ``--recursive``, ``--include`` and ``--exclude`` options of the current command, if any, are applied. The
+    output directory of the command is not scanned: since the scan is lazy, it would find the files that the command
+    has already saved there.
+    """
+    scan_options = get_scan_options()
+    profile = scan_options.get("profile")
+    for name in PROCESSING_OPTIONS:
+        scan_options.pop(name, None)
+    output_dir = get_output_dir_param()
+
+    files = iter_fonts_list(
         input_path,
         allow_extensions=allow_extensions,
         allow_ttf=allow_ttf,
         allow_cff=allow_cff,
         allow_static=allow_static,
         allow_variable=allow_variable,
+        exclude_dirs=(output_dir,) if output_dir else (),
+        **scan_options,
     )
+    if profile is not None:
+        files = time_discovery(files)
 
-    if not len(files) > 0:
+    first_file = next(files, None)
+    if first_file is None:
         no_valid_fonts_message(input_path)
         sys.exit()
 
-    return files
+    return itertools.chain([first_file], files)
+
+
+def get_scan_options() -> dict:
+    """
+    Returns the directory scan options (``recursive``, ``include``, ``exclude``) and the processing options (``jobs``,
+    ``timeout``, ``max_memory``, ``max_rss``, ``resume``, ``fsync``, ``profile``, ``mem_report``, ``progress``) passed
+    to the current command.
+
+    :return: A dictionary of the scan options, empty if not running inside a click command.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return {}
+    return dict(ctx.meta.get(SCAN_OPTIONS_KEY, {}))
+
+
+def get_output_dir_param():
+    """
+    Returns the value of the ``-out`` option of the current command, or None if it's not set, or if not running inside
+    a click command.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    return ctx.params.get("outputDir")
 
 
 def check_output_dir(input_path, output_path: None):
@@ -63,6 +179,10 @@ def get_fonts_list(
     allow_cff=True,
     allow_static=True,
     allow_variable=True,
+    recursive=False,
+    include: tuple = (),
+    exclude: tuple = (),
+    exclude_dirs: tuple = (),
 ) -> list:
     """
     Takes a path to a file, or a folder of font files, and returns a list of all valid font files that match the
@@ -78,55 +198,912 @@ def get_fonts_list(
     :param allow_static: If True, only static fonts will be returned, defaults to True (optional). If False, static
         fonts are not added to the list
     :param allow_variable: True/False, defaults to True (optional). If False, variable fonts are not added to the list
+    :param recursive: If True, subdirectories are scanned too, defaults to False (optional)
+    :param include: glob patterns of the file names to include. If empty, all file names are included
+    :param exclude: glob patterns of the file and directory names to exclude
+    :param exclude_dirs: paths of the directories not to scan
     :return: A list of font files that meet the criteria of the function.
     """
 
-    files = []
-    files_to_remove = []
+    return list(
+        iter_fonts_list(
+            input_path,
+            allow_extensions=allow_extensions,
+            allow_ttf=allow_ttf,
+            allow_cff=allow_cff,
+            allow_static=allow_static,
+            allow_variable=allow_variable,
+            recursive=recursive,
+            include=include,
+            exclude=exclude,
+            exclude_dirs=exclude_dirs,
+        )
+    )
 
-    if os.path.isfile(input_path):
-        files = [input_path]
 
-    if os.path.isdir(input_path):
-        files = [os.path.join(input_path, file) for file in os.listdir(input_path)]
+def iter_fonts_list(
+    input_path: str,
+    allow_extensions: list = None,
+    allow_ttf=True,
+    allow_cff=True,
+    allow_static=True,
+    allow_variable=True,
+    recursive=False,
+    include: tuple = (),
+    exclude: tuple = (),
+    exclude_dirs: tuple = (),
+) -> Iterator[str]:
+    """
+    Lazy version of ``get_fonts_list``: yields the valid font files as soon as they are found.
+
+    Only the header and the table directory of each file are read (see ``FontHeader``), no table is decompiled. The
+    results are cached in the fonts index of ``input_path`` (see ``get_fonts_index``), so unchanged files are not read
+    again on later runs.
+    """
+
+    index = get_fonts_index(input_path)
+    files = walk_files(input_path, recursive=recursive, include=include, exclude=exclude, exclude_dirs=exclude_dirs)
+    criteria = dict(
+        allow_extensions=allow_extensions,
+        allow_ttf=allow_ttf,
+        allow_cff=allow_cff,
+        allow_static=allow_static,
+        allow_variable=allow_variable,
+    )
+
+    for file in files:
+        if is_allowed_font(file, index=index, **criteria):
+            yield file
+
+
+def is_allowed_font(
+    file: str,
+    allow_extensions: list = None,
+    allow_ttf=True,
+    allow_cff=True,
+    allow_static=True,
+    allow_variable=True,
+    index: FontsIndex = None,
+) -> bool:
+    """
+    Checks if a file is a valid font file that matches the criteria. See ``get_fonts_list`` for the parameters.
+
+    :param index: the fonts index where to look for the file before reading it, if any
+    :return: True if the file is a valid font file that matches the criteria, False otherwise.
+    """
+    try:
+        font = _get_record(index, file)
+        if font is None:
+            font = FontHeader(file)
+        elif not font.is_valid:
+            return False
+    except (TTLibError, OSError):
+        return False
+
+    return is_matching_font(
+        font,
+        allow_extensions=allow_extensions,
+        allow_ttf=allow_ttf,
+        allow_cff=allow_cff,
+        allow_static=allow_static,
+        allow_variable=allow_variable,
+    )
+
+
+def _get_record(index: FontsIndex, file: str):
+    # Returns the record of the file in the index, or None if there is no index or if it can't be read. A locked or
+    # damaged index doesn't prevent the file from being read.
+    if index is None:
+        return None
+    try:
+        return index.get_record(file)
+    except sqlite3.Error:
+        return None
+
+
+def is_matching_font(
+    font,
+    allow_extensions: list = None,
+    allow_ttf=True,
+    allow_cff=True,
+    allow_static=True,
+    allow_variable=True,
+) -> bool:
+    """
+    Checks if an already read font matches the criteria. See ``get_fonts_list`` for the parameters.
+
+    :param font: a FontHeader or FontRecord object
+    :return: True if the font matches the criteria, False otherwise.
+    """
+    if not font.has_required_tables():
+        return False
+
+    if allow_extensions is not None:
+        if font.get_real_extension() not in allow_extensions:
+            return False
+
+    if allow_ttf is False:
+        if font.is_true_type:
+            return False
+
+    if allow_cff is False:
+        if font.is_cff is True:
+            return False
+
+    if allow_variable is False:
+        if font.is_variable:
+            return False
+
+    if allow_static is False:
+        if font.is_static:
+            return False
+
+    return True
+
+
+def process_files(
+    function,
+    files,
+    backend: str = "process",
+    operation: str = "edit",
+    is_completed=None,
+    skip_completed=True,
+    **kwargs,
+) -> list:
+    """
+    Calls ``function(file, **kwargs)`` for each file, and returns the results in the same order as ``files``.
+
+    Exceptions raised by ``function`` are printed with ``generic_error_message``, and the result of the file is None.
+    When the ``--jobs`` option of the current command is greater than 1, the files are processed by a pool of workers.
+    The messages printed by each worker are captured and printed by the main process when the file is done, in the
+    same order as with a single job.
+
+    When the ``--timeout`` option is set and the backend is "process", each file is processed by a new worker process,
+    which is killed if it takes longer than the timeout. Files whose worker is killed or crashes are reported as
+    failures, their result is None, and the other files are processed anyway.
+
+    When the ``--max-memory`` option is set, the peak memory of each file is estimated (see ``estimate_job_memory``)
+    and a file is started only if the estimates of the files being processed, plus its own, fit in the budget. A file
+    whose estimate exceeds the whole budget is processed when no other file is running.
+
+    Output files are written in the background (see ``OutputWriter``): a file is recorded as completed, in the journal
+    and in the reports, only when its output files have been written, but the next file doesn't wait for them, so
+    the saved message of an output file can follow the messages of the next file. A file whose output files can't be
+    written is reported as a failure, and its result is None. All the output files have been written when this function
+    returns. With the ``--fsync`` option, each output file is flushed to disk.
+
+    When the ``--resume`` option is set, completed files are recorded in the journal of INPUT_PATH (see
+    ``get_journal``), and the files already completed by the same command with the same options are skipped (see
+    ``skip_completed_files``), and their result is None. Skipped files are looked for before processing the others,
+    unless ``skip_completed`` is False.
+
+    When the ``--max-rss`` option is set, a file whose processing makes the peak RSS of the process exceed the limit is
+    stopped. With the "process" backend, each file is processed by a new worker process, as with ``--timeout``, and a
+    worker that exceeds the limit is stopped and its file is reported as a failure. With the other backends, the files
+    are processed by the main process, and the command is aborted.
+
+    When the ``--profile`` option is set, the time spent in each stage of the processing of each file (see
+    ``FileProfile``) is appended to the profile report, in the same order as the input files. When the ``--mem-report``
+    option is set, the peak memory of each stage (see ``MemoryProfile``) is appended to the memory report.
 
+    When the ``--progress`` option is set, the progress of the batch is displayed while the files are processed (see
+    ``ProgressDisplay``). Files found lazily are counted while they are processed, so the total is shown when the last
+    one has been found.
+
+    :param function: the function processing a single file. With the "process" backend, ``function`` and its arguments
+        must be picklable, so ``function`` must be a module-level function or a method of a picklable object
+    :param files: the files to process. Items can also be tuples whose last item is the file to process
+    :param backend: "process" to use a pool of worker processes, "thread" to use a pool of threads (better suited to
+        functions that wait for external programs), or "serial" to process the files one by one in any case
+    :param operation: the operation type used to estimate the memory of each file, one of the keys of
+        ``JOB_MEMORY_COSTS``
+    :param is_completed: a function that takes the result of a file and returns True if the file has been completed.
+        By default, a file is completed if ``function`` doesn't raise an exception
+    :param skip_completed: if False, the files completed in the journal are not looked for, because the caller has
+        already left them out. Completed files are still recorded
+    :return: A list of the values returned by ``function``.
+    """
+    if backend not in PROCESSING_BACKENDS:
+        raise ValueError(f"Invalid backend: {backend}")
+
+    scan_options = get_scan_options()
+    jobs = scan_options.get("jobs", 1)
+    timeout = scan_options.get("timeout")
+    max_rss = scan_options.get("max_rss")
+    budget = _MemoryBudget(scan_options.get("max_memory"), operation)
+    writer = _ResultsWriter(get_journal(), is_completed, get_profile_report(), get_memory_report())
+    show_progress = scan_options.get("progress", False)
+    set_fsync(scan_options.get("fsync", False))
+
+    if writer.journal is None or not skip_completed:
+        with _show_progress(files, writer, show_progress) as counted_files:
+            _dispatch_files(function, counted_files, kwargs, backend, jobs, timeout, max_rss, budget, writer)
+        return writer.close()
+
+    files = list(files)
+    files_to_process = list(skip_completed_files(files, writer.journal))
+    with _show_progress(files_to_process, writer, show_progress) as counted_files:
+        _dispatch_files(function, counted_files, kwargs, backend, jobs, timeout, max_rss, budget, writer)
+    results = writer.close()
+
+    # skip_completed_files() yields the same objects in the same order, so skipped files are the ones missing from it
+    processed = iter(zip(files_to_process, results))
+    next_processed = next(processed, None)
+    all_results = []
     for file in files:
+        if next_processed is not None and next_processed[0] is file:
+            all_results.append(next_processed[1])
+            next_processed = next(processed, None)
+        else:
+            all_results.append(None)
+    return all_results
+
+
+@contextlib.contextmanager
+def _show_progress(files, writer: "_ResultsWriter", show_progress: bool):
+    # Yields the files to process, counted by the progress display if it's shown
+    if not show_progress:
+        yield files
+        return
+
+    from ftCLI.Lib.utils.progress import ProgressDisplay
+
+    with ProgressDisplay(len(files) if hasattr(files, "__len__") else None) as progress:
+        writer.progress = progress
         try:
-            font = Font(file)
+            yield progress.count_files(files)
+        finally:
+            writer.progress = None
+
+
+def _dispatch_files(
+    function,
+    files,
+    kwargs: dict,
+    backend: str,
+    jobs: int,
+    timeout: float,
+    max_rss: int,
+    budget: "_MemoryBudget",
+    writer,
+) -> list:
+    if (timeout is not None or max_rss is not None) and backend == "process":
+        return _process_files_in_isolation(function, files, kwargs, jobs, timeout, max_rss, budget, writer)
+
+    try:
+        with limit_rss(max_rss):
+            return _dispatch_files_in_process(function, files, kwargs, backend, jobs, budget, writer)
+    except MaxRssExceeded as e:
+        generic_error_message(f"Command aborted: {e}")
+        sys.exit(1)
+
+
+def _dispatch_files_in_process(
+    function, files, kwargs: dict, backend: str, jobs: int, budget: "_MemoryBudget", writer
+) -> list:
+    if jobs <= 1 or backend == "serial":
+        for file in files:
+            writer.start(file)
+            result, completed, profile, written = _process_file(function, file, kwargs)
+            writer.add(file, result, completed, profile=profile, written=written)
+        return writer.results
+
+    if backend == "thread":
+        stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                task = (_process_file_in_thread, function, kwargs, stdout, stderr)
+                return _process_files_in_pool(executor, jobs, files, task, budget, writer)
+
+    initargs = (is_profiling_enabled(), is_memory_tracking_enabled(), get_log_options(), is_fsync_enabled())
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+        task = (_process_file_in_worker, function, kwargs, sys.stdout.isatty(), sys.stderr.isatty())
+        return _process_files_in_pool(executor, jobs, files, task, budget, writer)
+
+
+def get_profile_report():
+    """
+    Returns the profile report of the current command, and enables profiling, if the ``--profile`` option is set.
 
-            if allow_extensions is not None:
-                if font.get_real_extension() not in allow_extensions:
-                    files_to_remove.append(file)
-                    continue
+    :return: A ProfileReport object, or None.
+    """
+    ctx = click.get_current_context(silent=True)
+    report_file = get_scan_options().get("profile")
+    if ctx is None or report_file is None:
+        return None
+    enable_profiling()
+    return ProfileReport(report_file, ctx.command_path)
+
+
+def get_memory_report():
+    """
+    Returns the memory report of the current command, and enables the memory tracking, if the ``--mem-report`` option
+    is set.
 
-            if allow_ttf is False:
-                if font.is_true_type:
-                    files_to_remove.append(file)
-                    continue
+    :return: A MemoryReport object, or None.
+    """
+    ctx = click.get_current_context(silent=True)
+    report_file = get_scan_options().get("mem_report")
+    if ctx is None or report_file is None:
+        return None
+    enable_profiling(track_memory=True)
+    return MemoryReport(report_file, ctx.command_path)
+
+
+def get_journal():
+    """
+    Returns the journal of the INPUT_PATH of the current command, stored in the project files folder, if the
+    ``--resume`` option is set. Without it, completed files are neither recorded nor hashed.
 
-            if allow_cff is False:
-                if font.is_cff is True:
-                    files_to_remove.append(file)
-                    continue
+    :return: A Journal object, or None if the ``--resume`` option is not set, if not running inside a command with an
+        INPUT_PATH argument, or if the journal can't be written.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is None or ctx.params.get("input_path") is None or not get_scan_options().get("resume"):
+        return None
+    params = {k: v for k, v in ctx.params.items() if k not in JOURNAL_IGNORED_PARAMS}
+    return open_journal(get_journal_file_path(ctx.params["input_path"]), ctx.command_path, params)
 
-            if allow_variable is False:
-                if font.is_variable:
-                    files_to_remove.append(file)
-                    continue
 
-            if allow_static is False:
-                if font.is_static:
-                    files_to_remove.append(file)
-                    continue
+def record_files(files, recorded: list) -> Iterator:
+    """
+    Yields the files, and appends each of them to ``recorded``, so that files found lazily (see ``check_input_path``)
+    can be counted, or matched with the results of ``process_files``, once they have been processed, without listing
+    them beforehand.
 
-            del font
+    :param files: the files, an iterable
+    :param recorded: the list the files are appended to
+    """
+    for file in files:
+        recorded.append(file)
+        yield file
 
-        except (TTLibError, PermissionError, Exception):
-            files_to_remove.append(file)
 
-    files = [f for f in files if f not in files_to_remove]
+def skip_completed_files(files, journal: Journal) -> Iterator:
+    """
+    Yields the files that are not completed in the journal, and prints a message for each skipped file.
 
-    return files
+    :param files: the files to check. Items can also be tuples whose last item is the file
+    :param journal: a Journal object. If None, all files are yielded
+    """
+    for file in files:
+        path = file[-1] if isinstance(file, tuple) else file
+        if journal is not None and journal.is_completed(path):
+            file_already_completed_message(path)
+            continue
+        yield file
+
+
+def edit_font_file(
+    file,
+    apply_function,
+    params: dict = None,
+    output_dir=None,
+    recalcTimestamp=False,
+    overWrite=True,
+    show_file_name=False,
+    patch_in_place=False,
+) -> bool:
+    """
+    Loads a font, applies one of the ``apply_*`` functions of the commands to it and saves the modified tables, if any.
+    Used with ``process_files`` by the commands that edit fonts.
+
+    :param file: the path to the font file
+    :param apply_function: a function that takes a Font object and returns the tags of the modified tables
+    :param params: the keyword arguments of ``apply_function``
+    :param output_dir: the output directory
+    :param recalcTimestamp: if True, head.modified is set to the current time
+    :param overWrite: if False, existing output files are not overwritten
+    :param show_file_name: if True, the name of the file is printed before applying the function
+    :param patch_in_place: if True, ``apply_function`` only changes fixed-size fields and the font is edited with a
+        FontPatcher when possible (see ``get_font_patcher``)
+    :return: True if the font has been saved, False otherwise.
+    """
+    if show_file_name:
+        blank_line()
+        generic_info_message(f"Checking file: {os.path.basename(file)}")
+
+    from ftCLI.Lib.Font import Font
+
+    font = None
+    if patch_in_place:
+        from ftCLI.Lib.utils.font_patcher import get_font_patcher
+
+        font = get_font_patcher(file, recalcTimestamp=recalcTimestamp)
+    if font is None:
+        font = Font(file, recalcTimestamp=recalcTimestamp)
+    changed_tables = apply_function(font, **(params or {}))
+    if not changed_tables:
+        file_not_changed_message(file)
+        return False
+
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    font.save_tables(output_file, tags=changed_tables)
+    file_saved_message(output_file)
+    return True
+
+
+class _MemoryBudget(object):
+    """
+    Keeps track of the estimated memory of the files being processed. With no budget, every file fits.
+    """
+
+    def __init__(self, max_memory: int, operation: str):
+        self.max_memory = max_memory
+        self.operation = operation
+        self.in_use = 0
+
+    @property
+    def is_set(self) -> bool:
+        return self.max_memory is not None
+
+    def estimate(self, file) -> int:
+        if not self.is_set:
+            return 0
+        return estimate_job_memory(file[-1] if isinstance(file, tuple) else file, self.operation)
+
+    def fits(self, memory: int, running: int) -> bool:
+        # A file that doesn't fit in the whole budget is started anyway when nothing else is running
+        return not self.is_set or running == 0 or self.in_use + memory <= self.max_memory
+
+    def acquire(self, memory: int) -> None:
+        self.in_use += memory
+
+    def release(self, memory: int) -> None:
+        self.in_use -= memory
+
+
+def _process_files_in_pool(
+    executor, jobs: int, files, task: tuple, budget: _MemoryBudget, writer: "_ResultsWriter"
+) -> list:
+    # Only a few files per worker are submitted at once, so that the input files can still be found lazily and the
+    # messages of the first files are printed as soon as they are ready. With a memory budget, no file is queued in
+    # the executor, so that the files submitted are the files actually running.
+    pending = collections.deque()
+    running = {}
+    files = iter(files)
+    next_file = None
+    max_running = jobs if budget.is_set else jobs * PROCESSING_QUEUE_SIZE
+
+    while True:
+        while len(pending) < jobs * PROCESSING_QUEUE_SIZE and len(running) < max_running:
+            if next_file is None:
+                file = next(files, None)
+                if file is None:
+                    break
+                next_file = (file, budget.estimate(file))
+            file, memory = next_file
+            if not budget.fits(memory, len(running)):
+                break
+            future = executor.submit(*task, file)
+            writer.start(file)
+            budget.acquire(memory)
+            running[future] = memory
+            pending.append((file, future))
+            next_file = None
+        if not pending:
+            break
+
+        file, future = pending[0]
+        if not future.done():
+            wait(running, return_when=FIRST_COMPLETED)
+        for f in [f for f in running if f.done()]:
+            budget.release(running.pop(f))
+        if not future.done():
+            continue
+
+        pending.popleft()
+        writer.add(file, *future.result())
+
+    return writer.results
+
+
+def _process_files_in_isolation(
+    function,
+    files,
+    kwargs: dict,
+    jobs: int,
+    timeout: float,
+    max_rss: int,
+    budget: _MemoryBudget,
+    writer: "_ResultsWriter",
+) -> list:
+    # Each file is processed by a new process, so that a worker that hangs, or uses too much memory, can be stopped, and
+    # a worker that crashes doesn't break the other jobs like it would do in a ProcessPoolExecutor. Results are kept
+    # until the results of all the previous files are ready, so that messages are printed in the same order as with a
+    # single job.
+    context = multiprocessing.get_context()
+    stdout_isatty, stderr_isatty = sys.stdout.isatty(), sys.stderr.isatty()
+    worker_options = (is_profiling_enabled(), is_memory_tracking_enabled(), get_log_options(), is_fsync_enabled())
+    files = iter(files)
+    running = {}
+    done = {}
+    next_job = 0
+    next_file = None
+    exhausted = False
+
+    while True:
+        while len(running) < jobs and next_job - len(writer.results) < jobs * PROCESSING_QUEUE_SIZE:
+            if next_file is None:
+                file = next(files, None)
+                if file is None:
+                    exhausted = True
+                    break
+                next_file = (file, budget.estimate(file))
+            file, memory = next_file
+            if not budget.fits(memory, len(running)):
+                break
+            next_file = None
+            budget.acquire(memory)
+            connection, child_connection = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_process_file_in_isolation,
+                args=(function, kwargs, stdout_isatty, stderr_isatty, worker_options, max_rss, file, child_connection),
+                daemon=True,
+            )
+            process.start()
+            writer.start(file, worker=f"pid {process.pid}")
+            child_connection.close()
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            running[next_job] = (file, process, connection, deadline, memory)
+            next_job += 1
+
+        while len(writer.results) in done:
+            writer.add(*done.pop(len(writer.results)))
+
+        if not running:
+            if exhausted and len(writer.results) == next_job:
+                break
+            continue
+
+        deadlines = [job[3] for job in running.values() if job[3] is not None]
+        multiprocessing.connection.wait(
+            [job[2] for job in running.values()],
+            timeout=max(0.0, min(deadlines) - time.monotonic()) if deadlines else None,
+        )
+
+        for job_id, (file, process, connection, deadline, memory) in list(running.items()):
+            error = None
+            if connection.poll():
+                try:
+                    done[job_id] = (file, *connection.recv())
+                except EOFError:
+                    process.join()
+                    if max_rss is not None and process.exitcode == MAX_RSS_EXIT_CODE:
+                        error = f"stopped after exceeding the memory limit of {format_size(max_rss)}"
+                    else:
+                        error = f"the worker process has crashed (exit code {process.exitcode})"
+            elif deadline is not None and time.monotonic() >= deadline:
+                process.kill()
+                error = f"timed out after {timeout} seconds"
+            else:
+                continue
+
+            if error is not None:
+                # The failure is printed in place of the messages of the file, which are lost
+                stdout = _CapturedOutput(stdout_isatty)
+                path = file[-1] if isinstance(file, tuple) else file
+                with contextlib.redirect_stdout(stdout), log_file(path):
+                    generic_error_message(f"{os.path.basename(path)}: {error}")
+                done[job_id] = (file, None, False, stdout.getvalue(), "")
+
+            process.join()
+            connection.close()
+            budget.release(memory)
+            del running[job_id]
+
+    return writer.results
+
+
+def _process_file_in_isolation(
+    function,
+    kwargs: dict,
+    stdout_isatty: bool,
+    stderr_isatty: bool,
+    worker_options: tuple,
+    max_rss: int,
+    file,
+    connection,
+):
+    _init_worker(*worker_options)
+    exit_on_max_rss(max_rss)
+    connection.send(_process_file_in_worker(function, kwargs, stdout_isatty, stderr_isatty, file))
+    connection.close()
+
+
+def _process_file(function, file, kwargs: dict, wait_for_outputs=False) -> tuple:
+    # Returns the result of the file, whether the function has completed without raising an exception, the profile of
+    # the file, if profiling is enabled, and a future that is done when the output files of the file have been written.
+    # The profile is returned as a FileProfile object, whose write time is complete only when the future is done.
+    # Worker processes can't report the output files written after they have returned a file, so with
+    # wait_for_outputs they wait for them, return the profile as a dictionary, and no future.
+    with log_file(file[-1] if isinstance(file, tuple) else file) as file_log:
+        if not is_profiling_enabled():
+            result, completed = _call_function(function, file, kwargs, wait_for_outputs)
+            profile = None
+        else:
+            with profile_file() as file_profile:
+                result, completed = _call_function(function, file, kwargs, wait_for_outputs)
+            profile = file_profile.to_dict() if wait_for_outputs else file_profile
+        file_log.completed = completed
+    # A checkpoint is taken even if the function has failed, so that the errors of the files it has queued are not
+    # reported with the next file
+    written = None if wait_for_outputs else get_output_files_checkpoint()
+    return result, completed, profile, written
+
+
+def _call_function(function, file, kwargs: dict, wait_for_outputs=False) -> tuple:
+    try:
+        result, completed = function(file, **kwargs), True
+    except Exception as e:
+        generic_error_message(e)
+        result, completed = None, False
+    if wait_for_outputs:
+        checkpoint = get_output_files_checkpoint()
+        with measure("wait"):
+            checkpoint.result()
+        if not report_output_files(checkpoint, report_error=completed):
+            result, completed = None, False
+    return result, completed
+
+
+class _ResultsWriter(object):
+    """
+    Collects the results of ``process_files`` in the same order as the input files, prints the messages captured while
+    processing each file, records the completed files in the journal and writes the profile and the peak memory of
+    each file.
+
+    Files are recorded when their output files have been written, still in the same order as the input files, so a
+    file can be recorded after the next ones have been added. ``close()`` waits for the output files, and records the
+    remaining files.
+    """
+
+    def __init__(
+        self,
+        journal: Journal,
+        is_completed=None,
+        profile_report: ProfileReport = None,
+        memory_report: MemoryReport = None,
+    ):
+        self.journal = journal
+        self.is_completed = is_completed
+        self.profile_report = profile_report
+        self.memory_report = memory_report
+        self.progress = None
+        self.results = []
+        self.__pending = collections.deque()
+
+    def start(self, file, worker: str = None) -> None:
+        if self.progress is not None:
+            self.progress.start(file, worker=worker)
+
+    def add(
+        self,
+        file,
+        result,
+        completed: bool,
+        stdout: str = "",
+        stderr: str = "",
+        profile=None,
+        written: Future = None,
+    ) -> None:
+        """
+        Adds the result of the next file.
+
+        :param file: the processed file
+        :param result: the value returned by the function
+        :param completed: True if the function has completed without raising an exception
+        :param stdout: the messages printed by the function, if they have been captured
+        :param stderr: the errors printed by the function, if they have been captured
+        :param profile: the profile of the file, as a FileProfile object or as a dictionary, if profiling is enabled
+        :param written: a future that is done when the output files of the file have been written, or None if they
+            already have been
+        """
+        if stdout:
+            click.echo(stdout, nl=False)
+        if stderr:
+            click.echo(stderr, nl=False, err=True)
+        self.results.append(result)
+        if self.progress is not None:
+            self.progress.finish(file)
+
+        self.__pending.append((len(self.results) - 1, file, completed, profile, written))
+        while self.__pending and (self.__pending[0][4] is None or self.__pending[0][4].done()):
+            self.__record(*self.__pending.popleft())
+
+    def close(self) -> list:
+        """
+        Waits until the output files have been written, and records the remaining files.
+
+        :return: The results of the files.
+        """
+        try:
+            flush_output_files()
+        except Exception as e:
+            # Errors of the files processed by process_files are reported by their checkpoints
+            generic_error_message(e)
+        while self.__pending:
+            self.__record(*self.__pending.popleft())
+        return self.results
+
+    def __record(self, index: int, file, completed: bool, profile, written: Future) -> None:
+        path = file[-1] if isinstance(file, tuple) else file
+        if written is not None:
+            # The saved messages of the file are printed once its output files have been written. The summary of the
+            # file has already been printed in ndjson mode, unless it's turned into a failure here.
+            with log_file(path, summary=completed and written.result()[1] is not None):
+                if not report_output_files(written, report_error=completed):
+                    self.results[index] = None
+                    completed = False
+        if isinstance(profile, FileProfile):
+            profile = profile.to_dict()
+
+        if profile is not None and self.profile_report is not None:
+            try:
+                self.profile_report.add(path, profile, completed)
+            except OSError:
+                pass
+        if profile is not None and "memory" in profile and self.memory_report is not None:
+            try:
+                self.memory_report.add(path, profile["memory"], completed)
+            except OSError:
+                pass
+
+        if completed and self.is_completed is not None:
+            completed = self.is_completed(self.results[index])
+        if completed and self.journal is not None:
+            try:
+                self.journal.add(path)
+            except OSError:
+                pass
+
+
+class _CapturedOutput(io.StringIO):
+    """
+    Text buffer replacing the standard streams in worker processes. It reports whether the stream of the main process is
+    a terminal, so that click keeps or strips the ANSI colors as it would do in the main process.
+    """
+
+    def __init__(self, is_terminal: bool):
+        super().__init__()
+        self.is_terminal = is_terminal
+
+    def isatty(self) -> bool:
+        return self.is_terminal
+
+
+def _process_file_in_worker(function, kwargs: dict, stdout_isatty: bool, stderr_isatty: bool, file) -> tuple:
+    stdout, stderr = _CapturedOutput(stdout_isatty), _CapturedOutput(stderr_isatty)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        result, completed, profile, _ = _process_file(function, file, kwargs, wait_for_outputs=True)
+    return result, completed, stdout.getvalue(), stderr.getvalue(), profile
+
+
+class _ThreadOutput(object):
+    """
+    Replaces a standard stream while files are processed by a pool of threads. What a worker thread writes while
+    capturing is stored in a buffer of the thread, everything else is written to the original stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    @contextlib.contextmanager
+    def capture(self):
+        self.local.buffer = _CapturedOutput(self.stream.isatty())
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+    def write(self, s):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(s)
+
+    def flush(self):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _process_file_in_thread(function, kwargs: dict, stdout: _ThreadOutput, stderr: _ThreadOutput, file) -> tuple:
+    with stdout.capture() as captured_stdout, stderr.capture() as captured_stderr:
+        result, completed, profile, written = _process_file(function, file, kwargs)
+    return result, completed, captured_stdout.getvalue(), captured_stderr.getvalue(), profile, written
+
+
+def _init_worker(profile=False, track_memory=False, log_options: dict = None, fsync=False):
+    set_fsync(fsync)
+    if log_options is not None:
+        set_log_options(**log_options)
+    if profile:
+        enable_profiling(track_memory=track_memory)
+
+
+def walk_files(
+    input_path: str, recursive=False, include: tuple = (), exclude: tuple = (), exclude_dirs: tuple = ()
+) -> Iterator[str]:
+    """
+    Yields the files found in ``input_path``. If ``input_path`` is a file, it's yielded as is.
+
+    Directories are scanned in the same order as ``os.listdir``. Symbolic links to directories are followed, but each
+    directory is visited only once, so that symlink loops can't cause infinite recursion. The ``ftCLI_files``
+    subdirectories, and the subdirectories in ``exclude_dirs``, are never scanned.
+
+    :param input_path: The path to the file or folder
+    :param recursive: If True, subdirectories are scanned too
+    :param include: glob patterns of the file names to include. If empty, all file names are included
+    :param exclude: glob patterns of the file and directory names to exclude
+    :param exclude_dirs: paths of the subdirectories not to scan
+    """
+
+    if os.path.isfile(input_path):
+        yield input_path
+        return
+
+    if not os.path.isdir(input_path):
+        return
+
+    excluded_dirs = {os.path.realpath(d) for d in exclude_dirs}
+    visited_dirs = set()
+    dirs_to_scan = [input_path]
+
+    while dirs_to_scan:
+        directory = dirs_to_scan.pop()
+
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            continue
+        if (stat.st_dev, stat.st_ino) in visited_dirs:
+            continue
+        visited_dirs.add((stat.st_dev, stat.st_ino))
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            relative_path = os.path.relpath(entry.path, input_path)
+            if _match_any(entry.name, relative_path, exclude):
+                continue
+
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                if recursive and not _is_excluded_dir(entry, excluded_dirs):
+                    subdirs.append(entry.path)
+                continue
+
+            if include and not _match_any(entry.name, relative_path, include):
+                continue
+
+            yield entry.path
+
+        # Subdirectories are pushed in reverse order to be popped in the same order they were found
+        dirs_to_scan.extend(reversed(subdirs))
+
+
+def _is_excluded_dir(entry: os.DirEntry, excluded_dirs: set) -> bool:
+    if entry.name == PROJECT_FILES_FOLDER:
+        return True
+    return bool(excluded_dirs) and os.path.realpath(entry.path) in excluded_dirs
+
+
+def _match_any(name: str, relative_path: str, patterns: tuple) -> bool:
+    return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(relative_path, p) for p in patterns)
 
 
 def get_output_dir(input_path: str, output_dir: str = None) -> str:
@@ -151,13 +1128,53 @@ def get_output_dir(input_path: str, output_dir: str = None) -> str:
 
 def get_project_files_path(input_path: str) -> str:
     if os.path.isfile(input_path):
-        project_files_path = os.path.join(os.path.dirname(input_path), "ftCLI_files")
+        project_files_path = os.path.join(os.path.dirname(input_path), PROJECT_FILES_FOLDER)
     else:
-        project_files_path = os.path.join(input_path, "ftCLI_files")
+        project_files_path = os.path.join(input_path, PROJECT_FILES_FOLDER)
 
     return project_files_path
 
 
+def get_fonts_index_file_path(input_path: str) -> str:
+    project_files_dir = get_project_files_path(input_path)
+    fonts_index_file = os.path.join(project_files_dir, "fonts_index.db")
+
+    return fonts_index_file
+
+
+def get_fonts_index(input_path: str) -> FontsIndex:
+    """
+    Returns the fonts index stored in the project files folder of ``input_path``.
+
+    The same FontsIndex object is returned to all callers in the process, and it's closed at exit.
+
+    :param input_path: The path to the input file or directory
+    :return: A FontsIndex object, or None if the index can't be created (for example, if the folder is read-only).
+    """
+    index_file = get_fonts_index_file_path(input_path)
+    if index_file not in _fonts_indexes:
+        _fonts_indexes[index_file] = open_fonts_index(index_file)
+    return _fonts_indexes[index_file]
+
+
+@atexit.register
+def _close_fonts_indexes():
+    for index in _fonts_indexes.values():
+        if index is not None:
+            try:
+                index.close()
+            except sqlite3.Error:
+                pass
+    _fonts_indexes.clear()
+
+
+def get_journal_file_path(input_path: str) -> str:
+    project_files_dir = get_project_files_path(input_path)
+    journal_file = os.path.join(project_files_dir, "journal.jsonl")
+
+    return journal_file
+
+
 def get_style_mapping_file_path(input_path: str) -> str:
     project_files_dir = get_project_files_path(input_path)
     styles_mapping_file = os.path.join(project_files_dir, "styles_mapping.json")
@@ -1,4 +1,10 @@
+import contextlib
+import json
 import os.path
+import re
+import sys
+import threading
+import time
 
 import click
 
@@ -12,6 +18,157 @@ def add_options(options):
     return _add_options
 
 
+# Key of the click context `meta` dictionary where the directory scan options are stored.
+SCAN_OPTIONS_KEY = "ftCLI.scan_options"
+
+# Formats of the messages: colored lines of text, or one JSON object per line.
+LOG_FORMATS = ("text", "ndjson")
+
+# Number of decimal places of the elapsed times in the events (microseconds).
+EVENT_TIME_PRECISION = 6
+
+# How the messages are printed, set by the --log-format and --quiet options of ftcli and passed to the worker processes.
+_log_options = dict(log_format="text", quiet=False)
+
+# Statuses of the messages printed in quiet mode.
+_QUIET_STATUSES = ("WARN", "FAIL")
+
+_local = threading.local()
+
+
+def _store_scan_option(ctx, param, value):
+    ctx.meta.setdefault(SCAN_OPTIONS_KEY, {})[param.name] = value
+    return value
+
+
+def _store_log_option(ctx, param, value):
+    _log_options[param.name] = value
+    return value
+
+
+def get_log_options() -> dict:
+    return dict(_log_options)
+
+
+def set_log_options(log_format="text", quiet=False) -> None:
+    _log_options.update(log_format=log_format, quiet=quiet)
+
+
+def add_log_options():
+    """
+    Returns the options that control how the messages of the commands are printed. The options are not passed to the
+    command function: their values are read by the message functions.
+    """
+    _log_options_list = [
+        click.option(
+            "--log-format",
+            type=click.Choice(LOG_FORMATS),
+            default="text",
+            show_default=True,
+            expose_value=False,
+            is_eager=True,
+            callback=_store_log_option,
+            help="Format of the messages. With 'ndjson', each message is printed as a JSON object on its own line, "
+            "with its status, the input file, the output file, the elapsed time and the error, if any, and the result "
+            "of each processed file is printed as a 'file' event.",
+        ),
+        click.option(
+            "--quiet",
+            is_flag=True,
+            default=False,
+            expose_value=False,
+            is_eager=True,
+            callback=_store_log_option,
+            help="Print only warnings and errors.",
+        ),
+    ]
+    return add_options(_log_options_list)
+
+
+class FileLog(object):
+    """
+    The messages printed while processing a file. In ndjson mode, the events printed while the file is processed have
+    the path of the file and the elapsed time, and a "file" event sums up the result of the file at the end.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.start = time.perf_counter()
+        self.completed = False
+        self.outputs = []
+        self.errors = []
+
+    @property
+    def elapsed(self) -> float:
+        return round(time.perf_counter() - self.start, EVENT_TIME_PRECISION)
+
+
+@contextlib.contextmanager
+def log_file(file, summary=True):
+    """
+    Adds the messages printed by the current thread in the block to the log of ``file``. Set ``completed`` on the
+    yielded FileLog object when the file has been processed without errors.
+
+    :param file: the path to the input file
+    :param summary: if False, the summary event of the file is not printed in ndjson mode (for example, because it has
+        already been printed)
+    :return: A context manager yielding the FileLog object.
+    """
+    file_log = FileLog(file)
+    _local.file_log = file_log
+    try:
+        yield file_log
+    finally:
+        _local.file_log = None
+        failed = not file_log.completed or file_log.errors
+        if summary and _log_options["log_format"] == "ndjson" and not (_log_options["quiet"] and not failed):
+            _print_event(
+                "file",
+                "FAIL" if failed else "DONE",
+                path=os.path.abspath(file),
+                outputs=file_log.outputs,
+                elapsed=file_log.elapsed,
+                error=file_log.errors[0] if file_log.errors else None,
+            )
+
+
+def _log_event(event: str, status: str, message: str = None, **fields) -> bool:
+    # Adds the message to the log of the current file, and prints it as an event in ndjson mode. Returns True if the
+    # message must not be printed as text.
+    file_log = getattr(_local, "file_log", None)
+    if file_log is not None:
+        if "output" in fields and os.path.abspath(fields["output"]) not in file_log.outputs:
+            file_log.outputs.append(os.path.abspath(fields["output"]))
+        if status == "FAIL":
+            file_log.errors.append(message)
+    if _log_options["quiet"] and status not in _QUIET_STATUSES:
+        return True
+    if _log_options["log_format"] != "ndjson":
+        return False
+
+    if file_log is not None:
+        fields.setdefault("path", os.path.abspath(file_log.file))
+        fields["elapsed"] = file_log.elapsed
+    if status == "FAIL":
+        fields["error"] = message
+    elif message is not None:
+        fields["message"] = message
+    _print_event(event, status, **fields)
+    return True
+
+
+def _print_event(event: str, status: str, **fields) -> None:
+    click.echo(json.dumps(dict(event=event, status=status.lower(), **fields)))
+
+
+def _store_max_rss_option(ctx, param, value):
+    from ftCLI.Lib.utils.process_memory import get_peak_rss
+
+    if value is not None and get_peak_rss() is None:
+        raise click.BadParameter("the memory used by the process can't be measured on this system", ctx, param)
+    return _store_scan_option(ctx, param, value)
+
+
 def add_file_or_path_argument(dir_okay=True, file_okay=True):
     _file_or_path_argument = [
         click.argument(
@@ -19,9 +176,151 @@ def add_file_or_path_argument(dir_okay=True, file_okay=True):
             type=click.Path(exists=True, resolve_path=True, dir_okay=dir_okay, file_okay=file_okay),
         )
     ]
+    if dir_okay:
+        _file_or_path_argument.append(add_scan_options())
     return add_options(_file_or_path_argument)
 
 
+def add_scan_options():
+    """
+    Returns the options that control how a directory passed as INPUT_PATH is scanned. The options are not passed to the
+    command function: their values are stored in the click context and read by ``check_input_path``.
+    """
+    _scan_options = [
+        click.option(
+            "--recursive",
+            is_flag=True,
+            default=False,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Look for font files also in the subdirectories of INPUT_PATH.",
+        ),
+        click.option(
+            "--include",
+            multiple=True,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Glob pattern (e.g.: '*.otf') of the file names to process. Can be repeated.",
+        ),
+        click.option(
+            "--exclude",
+            multiple=True,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Glob pattern of the file or directory names to skip. Can be repeated.",
+        ),
+        click.option(
+            "--jobs",
+            type=click.IntRange(min=1),
+            default=1,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Number of processes used to process the font files found in INPUT_PATH.",
+        ),
+        click.option(
+            "--timeout",
+            type=click.FloatRange(min=0, min_open=True),
+            default=None,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Maximum number of seconds spent processing each font file. When set, each file is processed in its "
+            "own worker process, and files that take longer, or that crash the worker, are reported as failures.",
+        ),
+        click.option(
+            "--max-memory",
+            type=MemorySizeType(),
+            default=None,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Memory budget of the parallel jobs (e.g.: 512M, 4G; default unit: MB). The peak memory of each job "
+            "is estimated from the size and the number of glyphs of the font, and jobs are started only while the "
+            "estimates of the running jobs fit in the budget.",
+        ),
+        click.option(
+            "--max-rss",
+            type=MemorySizeType(),
+            default=None,
+            expose_value=False,
+            callback=_store_max_rss_option,
+            help="Maximum resident memory of the process processing each font file (e.g.: 2G; default unit: MB). When "
+            "set, each file is processed in its own worker process, which is stopped if it exceeds the limit, and the "
+            "file is reported as a failure. Commands that process the files in the main process are aborted.",
+        ),
+        click.option(
+            "--resume",
+            is_flag=True,
+            default=False,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Record the completed files in the ftCLI_files/journal.jsonl file of INPUT_PATH, and skip the files "
+            "already completed by a previous run of the same command with the same options and --resume. Files "
+            "changed since then are processed again.",
+        ),
+        click.option(
+            "--fsync",
+            is_flag=True,
+            default=False,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Flush each output file to disk before it's recorded as saved, so that the saved files survive a "
+            "power failure. Saving is much slower.",
+        ),
+        click.option(
+            "--profile",
+            type=click.Path(dir_okay=False, resolve_path=True),
+            default=None,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Append the time spent in each stage of the processing of each font file (discovery, load, decompile "
+            "and compile of each table, transform, write) to the given file, as JSON lines.",
+        ),
+        click.option(
+            "--progress",
+            is_flag=True,
+            default=False,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Show the progress of the batch: the files, glyphs and bytes processed per second, the time remaining "
+            "and the files being processed. The progress is displayed live in a terminal, and printed every 10 "
+            "seconds otherwise.",
+        ),
+        click.option(
+            "--mem-report",
+            type=click.Path(dir_okay=False, resolve_path=True),
+            default=None,
+            expose_value=False,
+            callback=_store_scan_option,
+            help="Append the peak memory of each font file, and of each stage of its processing, to the given file, as "
+            "JSON lines: the memory allocated by Python (traced by tracemalloc) and the peak resident memory of the "
+            "process. Tracing the allocations makes the processing much slower.",
+        ),
+    ]
+    return add_options(_scan_options)
+
+
+def add_backend_option():
+    return click.option(
+        "--backend",
+        type=click.Choice(["process", "thread", "serial"]),
+        default="process",
+        show_default=True,
+        help="How files are converted when --jobs is greater than 1: by a pool of processes, by a pool of threads "
+        "(better when most of the time is spent in external programs), or one by one. --timeout is only applied to the "
+        "process backend.",
+    )
+
+
+def add_incremental_option():
+    return click.option(
+        "--incremental",
+        is_flag=True,
+        default=False,
+        help="Skip the files whose output files are up-to-date: the input file and the options haven't changed since "
+        "the last conversion, and the output files still exist unchanged. Conversions are recorded in the "
+        "ftCLI_files/conversions.json file of the output directory.",
+    )
+
+
 def add_file_argument():
     return add_file_or_path_argument(dir_okay=False)
 
@@ -93,7 +392,15 @@ def file_overwrite_prompt(input_file) -> bool:
     return click.confirm(f"{input_file} already exists. Do you want to overwrite it?")
 
 
+def blank_line():
+    # Separates the messages of the files, in text mode only
+    if _log_options["log_format"] == "text" and not _log_options["quiet"]:
+        click.echo()
+
+
 def file_not_selected_message(file):
+    if _log_event("skipped", "SKIP", "file is not selected", path=os.path.abspath(file)):
+        return
     click.secho(
         f"[{click.style('SKIP', fg='yellow')}] {os.path.basename(file)} "
         f"{click.style('file is not selected', fg='yellow')}"
@@ -101,6 +408,8 @@ def file_not_selected_message(file):
 
 
 def file_not_changed_message(file):
+    if _log_event("unchanged", "SKIP", "no changes made", path=os.path.abspath(file)):
+        return
     click.secho(
         f"[{click.style('SKIP', fg='yellow')}] {os.path.basename(file)} "
         f"{click.style('no changes made', fg='yellow')}"
@@ -112,33 +421,92 @@ def no_valid_fonts_message(input_path):
         message = f"No valid font files found in {input_path}"
     else:
         message = f"{input_path} is not a valid font file"
+    if _log_event("error", "FAIL", message, path=os.path.abspath(input_path)):
+        return
     click.secho(f"[{click.style('FAIL', fg='red')}] {message}")
 
 
 def file_not_exists_message(file):
+    if _log_event("warning", "WARN", "file does not exist", path=os.path.abspath(file)):
+        return
     click.secho(
         f"[{click.style('WARN', fg='yellow')}] {os.path.basename(file)} "
         f"{click.style('file does not exist', fg='yellow')}"
     )
 
 
-def file_saved_message(file):
+def file_already_completed_message(file):
+    if _log_event("skipped", "SKIP", "already completed", path=os.path.abspath(file)):
+        return
+    click.secho(
+        f"[{click.style('SKIP', fg='yellow')}] {os.path.basename(file)} "
+        f"{click.style('already completed', fg='yellow')}"
+    )
+
+
+def file_up_to_date_message(file):
+    if _log_event("skipped", "SKIP", "up-to-date", path=os.path.abspath(file)):
+        return
+    click.secho(
+        f"[{click.style('SKIP', fg='yellow')}] {os.path.basename(file)} "
+        f"{click.style('is up-to-date', fg='yellow')}"
+    )
+
+
+def file_saved_message(file, defer=True):
+    """
+    Prints that ``file`` has been saved. If the file is still queued on the output writer, the message is printed when
+    it has been written (see ``OutputWriter.defer_saved_message``), but the file is listed in the outputs of the current
+    input file right away.
+
+    :param file: the path to the output file
+    :param defer: if False, the message is printed immediately
+    """
+    if defer and _defer_saved_message(file):
+        return
+    if _log_event("saved", "DONE", output=file):
+        return
     click.secho(f"[{click.style('DONE', fg='green')}] {file} {click.style('saved', fg='green')}")
 
 
+def _defer_saved_message(file) -> bool:
+    # The output writer is only imported by the commands that save files, and it imports this module
+    output_writer = sys.modules.get("ftCLI.Lib.utils.output_writer")
+    if output_writer is None or not output_writer.defer_saved_message(file):
+        return False
+    file_log = getattr(_local, "file_log", None)
+    if file_log is not None and os.path.abspath(file) not in file_log.outputs:
+        file_log.outputs.append(os.path.abspath(file))
+    return True
+
+
 def generic_success_message(success_message):
+    if _log_event("success", "PASS", str(success_message)):
+        return
     click.secho(f"[{click.style('PASS', fg='green')}] {success_message}")
 
 
 def generic_info_message(info_message, nl=True):
+    if _log_event("info", "INFO", str(info_message)):
+        return
     click.secho(f"[{click.style('INFO', fg='cyan')}] {info_message}", nl=nl)
 
 
+def progress_message(progress, **fields):
+    if _log_event("progress", "INFO", str(progress), **fields):
+        return
+    click.secho(f"[{click.style('INFO', fg='cyan')}] {progress}")
+
+
 def generic_error_message(error_message):
+    if _log_event("error", "FAIL", str(error_message)):
+        return
     click.secho(f"[{click.style('FAIL', fg='red')}] {error_message}")
 
 
 def generic_warning_message(warning_message):
+    if _log_event("warning", "WARN", str(warning_message)):
+        return
     click.secho(f"[{click.style('WARN', fg='yellow')}] {warning_message}")
 
 
@@ -169,3 +537,17 @@ class OptionalParamType(click.ParamType):
         if not value:
             return
         return self.param_type.convert(value, param, ctx)
+
+
+# Converts sizes like "512M", "4G" or "2.5GB" to bytes. Numbers without a unit are megabytes.
+class MemorySizeType(click.ParamType):
+    name = "size"
+    units = {"": 1024**2, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        match = re.fullmatch(r"([0-9]*\.?[0-9]+)\s*([KMGT]?)(?:I?B)?", str(value).strip().upper())
+        if match is None or float(match.group(1)) <= 0:
+            self.fail(f"{value!r} is not a valid size (e.g.: 512M, 4G)", param, ctx)
+        return int(float(match.group(1)) * self.units[match.group(2)])
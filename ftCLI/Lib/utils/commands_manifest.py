@@ -0,0 +1,216 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+import click
+
+from ftCLI.Lib.utils.click_tools import generic_error_message, generic_info_message
+
+# The generated manifest, read by ``FtCLI`` to list the commands and show their help without importing them.
+COMMANDS_MANIFEST_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "commands", "manifest.py"
+)
+
+MAX_LINE_LENGTH = 120
+
+COMMANDS_MANIFEST_HEADER = """\
+# Generated by `python -m ftCLI.Lib.utils.commands_manifest`, do not edit. Run it again after adding a command, or
+# changing the first paragraph of the help of a command.
+
+"""
+
+# Commands run by ``check_import_time``, with the maximum time, in seconds, spent importing modules, and the modules
+# that they must not import. The times are generous upper bounds: modules imported when they are not needed are the
+# regressions to catch, and they are reported regardless of the time. ``{font}`` is replaced with the path to a small
+# font saved by ``build_fixture_font``.
+HEAVY_MODULES = (
+    "afdko", "beziers", "cffsubr", "defcon", "dehinter", "pathops", "pathvalidate", "psautohint", "ttfautohint"
+)
+IMPORT_TIME_CHECKS = (
+    (["--help"], 0.25, ("fontTools", "rich", "ftCLI.commands.ftcli_utils")),
+    (["print", "font-info", "--help"], 0.75, HEAVY_MODULES),
+    (["print", "font-info", "{font}"], 0.75, HEAVY_MODULES),
+)
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+
+def get_command_names() -> list:
+    """
+    Returns the names of the commands found in the ``commands`` folder: each ``ftcli_<name>.py`` module is a command.
+    """
+    commands_folder = os.path.dirname(COMMANDS_MANIFEST_FILE)
+    names = []
+    for filename in os.listdir(commands_folder):
+        if filename.endswith(".py") and filename.startswith("ftcli_"):
+            names.append(filename[6:-3])
+    names.sort()
+    return names
+
+
+def read_commands_help() -> dict:
+    """
+    Imports the command modules and reads the first paragraph of the help of each command, which is the only part
+    shown in the commands list.
+
+    :return: A dictionary mapping each command name to its help.
+    """
+    from ftCLI.ftCLI import cli
+
+    ctx = click.Context(cli)
+    commands = {}
+    for name in get_command_names():
+        command = cli.get_command(ctx, name)
+        if command is None:
+            raise click.ClickException(f"Can't import the {name} command")
+        text = command.short_help or command.help or ""
+        commands[name] = " ".join(text.split("\n\n")[0].split())
+    return commands
+
+
+def get_commands_manifest_source(commands: dict) -> str:
+    items = []
+    for name, text in sorted(commands.items()):
+        item = f"    {json.dumps(name)}: {json.dumps(text)},"
+        if len(item) > MAX_LINE_LENGTH:
+            # Long help strings are split on more lines, as the other sources
+            lines = textwrap.wrap(text, width=MAX_LINE_LENGTH - 12, drop_whitespace=False)
+            lines = [f"        {json.dumps(line)}" for line in lines]
+            item = "\n".join([f"    {json.dumps(name)}: ("] + lines + ["    ),"])
+        items.append(item + "\n")
+    return f"{COMMANDS_MANIFEST_HEADER}COMMANDS = {{\n{''.join(items)}}}\n"
+
+
+def write_commands_manifest() -> None:
+    with open(COMMANDS_MANIFEST_FILE, "w", encoding="utf-8") as f:
+        f.write(get_commands_manifest_source(read_commands_help()))
+
+
+def check_commands_manifest() -> list:
+    """
+    Checks that the manifest matches the command modules.
+
+    :return: The errors found.
+    """
+    try:
+        with open(COMMANDS_MANIFEST_FILE, encoding="utf-8") as f:
+            source = f.read()
+    except OSError as e:
+        return [f"Can't read the commands manifest: {e}"]
+    if source != get_commands_manifest_source(read_commands_help()):
+        return ["The commands manifest is out of date"]
+    return []
+
+
+def build_fixture_font(file: str) -> None:
+    """
+    Saves a small TrueType font, with an empty glyph for the space, to run the commands that read a font.
+
+    :param file: the output file
+    """
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder([".notdef", "space"])
+    builder.setupCharacterMap({0x20: "space"})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in (".notdef", "space")})
+    builder.setupHorizontalMetrics({".notdef": (500, 0), "space": (250, 0)})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable(dict(familyName="Fixture", styleName="Regular"))
+    builder.setupOS2(sTypoAscender=800, sTypoDescender=-200, usWinAscent=800, usWinDescent=200)
+    builder.setupPost()
+    builder.save(file)
+
+
+def get_import_times(args: list) -> dict:
+    """
+    Runs ftcli in a new interpreter with ``python -X importtime``.
+
+    :param args: the command line arguments
+    :return: A dictionary mapping the name of each imported module to its cumulative import time, in seconds.
+    :raises click.ClickException: if the command fails
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from ftCLI.ftCLI import main; main()"] + args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if process.returncode != 0:
+        raise click.ClickException(f"exit status {process.returncode}")
+    import_times = {}
+    for line in process.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            import_times[match.group(4)] = (int(match.group(2)), len(match.group(3)))
+    # Top level imports have the least indentation, and their cumulative times include the nested imports
+    min_level = min((level for _, level in import_times.values()), default=0)
+    return {
+        name: cumulative / 1_000_000 if level == min_level else None
+        for name, (cumulative, level) in import_times.items()
+    }
+
+
+def check_import_time() -> list:
+    """
+    Checks the import time and the imported modules of the commands in ``IMPORT_TIME_CHECKS``.
+
+    :return: The errors found.
+    """
+    errors = []
+    with tempfile.TemporaryDirectory(prefix="ftCLI-") as temp_dir:
+        font_file = os.path.join(temp_dir, "Fixture-Regular.ttf")
+        build_fixture_font(font_file)
+        for args, max_time, forbidden_modules in IMPORT_TIME_CHECKS:
+            errors.extend(_check_import_time(args, font_file, max_time, forbidden_modules))
+    return errors
+
+
+def _check_import_time(args: list, font_file: str, max_time: float, forbidden_modules: tuple) -> list:
+    errors = []
+    command = " ".join(["ftcli"] + [arg.format(font=os.path.basename(font_file)) for arg in args])
+    try:
+        import_times = get_import_times([arg.format(font=font_file) for arg in args])
+    except click.ClickException as e:
+        return [f"{command}: {e.message}"]
+    total_time = sum(t for t in import_times.values() if t is not None)
+    generic_info_message(f"{command}: {total_time * 1000:.0f} ms spent importing {len(import_times)} modules")
+    if total_time > max_time:
+        errors.append(f"{command}: import time exceeds {max_time * 1000:.0f} ms")
+    for name in import_times:
+        if name.split(".")[0] in forbidden_modules or name in forbidden_modules:
+            errors.append(f"{command}: {name} should not be imported")
+    return errors
+
+
+@click.command()
+@click.option(
+    "--check",
+    is_flag=True,
+    help="""
+    Don't write the manifest. Check that it's up to date, and that the import time of ftcli and of a simple command
+    stay within bounds.""",
+)
+def main(check=False):
+    """
+    Writes the manifest of the ftcli commands.
+    """
+    if not check:
+        write_commands_manifest()
+        generic_info_message(f"{COMMANDS_MANIFEST_FILE} saved")
+        return
+
+    errors = check_commands_manifest() + check_import_time()
+    for error in errors:
+        generic_error_message(error)
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+import array
+import atexit
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+
+from ftCLI.Lib.utils.click_tools import generic_info_message
+
+# Environment variable that overrides the default path of the server socket.
+SOCKET_ENV_VAR = "FTCLI_SOCKET"
+
+# Modules that the commands import only when they need them. The server imports them at startup, so that they're
+# already loaded in every request. Modules that are not installed are ignored.
+PRELOAD_MODULES = (
+    "afdko.checkoutlinesufo",
+    "afdko.fdkutils",
+    "beziers.path",
+    "cffsubr",
+    "dehinter.font",
+    "fontTools.cffLib.specializer",
+    "fontTools.varLib.instancer",
+    "fontTools.ttLib.removeOverlaps",
+    "pathops",
+    "pathvalidate",
+    "psautohint.autohint",
+    "ttfautohint",
+    "ftCLI.Lib.converters.otf_to_ttf",
+    "ftCLI.Lib.converters.ttf_to_otf",
+    "ftCLI.Lib.converters.sfnt_to_web",
+    "ftCLI.Lib.converters.web_to_sfnt",
+    "ftCLI.Lib.converters.ttc_to_sfnt",
+    "ftCLI.Lib.converters.variable_to_static",
+    "ftCLI.Lib.VFont",
+    "ftCLI.Lib.utils.font_patcher",
+)
+
+# Requests start with the length of the JSON request data, and the response is the exit status of the command.
+HEADER_FORMAT = ">I"
+STATUS_FORMAT = ">i"
+
+# The standard streams of the client, sent to the server with the request.
+STANDARD_FDS = (0, 1, 2)
+
+# Seconds given to a command to stop after the client has been interrupted, before it's killed.
+INTERRUPT_GRACE_PERIOD = 5
+
+
+def get_socket_path() -> str:
+    """
+    Returns the path of the server socket: the value of the FTCLI_SOCKET environment variable if set, otherwise a file
+    in the runtime directory of the user or, if there is none, in a private ``ftcli-<uid>`` folder of the temporary
+    directory (see ``get_private_dir``).
+
+    :raises OSError: if the private folder can't be created, or is not private
+    """
+    if os.environ.get(SOCKET_ENV_VAR):
+        return os.environ[SOCKET_ENV_VAR]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], f"ftcli-{os.getuid()}.sock")
+    return os.path.join(get_private_dir(), "ftcli.sock")
+
+
+def get_private_dir() -> str:
+    """
+    Returns the ``ftcli-<uid>`` folder of the temporary directory, creating it if needed. The temporary directory is
+    shared by all users, so the folder is only used if it belongs to the current user and no other user can access it:
+    otherwise, another user could create the server socket there, and receive the environment and the standard
+    streams of the clients.
+
+    :return: The path to the folder.
+    :raises OSError: if the folder can't be created, or is not private
+    """
+    private_dir = os.path.join(tempfile.gettempdir(), f"ftcli-{os.getuid()}")
+    try:
+        os.mkdir(private_dir, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(private_dir)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"{private_dir} is not a private folder of the current user")
+    return private_dir
+
+
+def is_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+def run_client(args: list, socket_path: str = None):
+    """
+    Runs a command on the ftcli server. The standard streams of the client are passed to the server, so the command
+    reads and writes them directly, as if it was running in the client process.
+
+    :param args: the command line arguments of the command
+    :param socket_path: the path to the server socket. If None, ``get_socket_path()`` is used
+    :return: The exit status of the command, or None if no server is running.
+    """
+    if not is_supported():
+        return None
+
+    if socket_path is None:
+        try:
+            socket_path = get_socket_path()
+        except OSError as e:
+            sys.stderr.write(f"ftcli: {e}\n")
+            return None
+    try:
+        st = os.stat(socket_path)
+    except OSError:
+        return None
+    # The environment and the standard streams are only sent to a server run by the same user
+    if st.st_uid != os.getuid():
+        sys.stderr.write(f"ftcli: ignoring {socket_path}, which is not owned by the current user\n")
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        peer_uid = get_peer_uid(sock)
+        if peer_uid is not None and peer_uid != os.getuid():
+            sys.stderr.write(f"ftcli: ignoring the server on {socket_path}, which is run by another user\n")
+            return None
+
+        data = json.dumps(dict(argv=args, cwd=os.getcwd(), env=dict(os.environ))).encode("utf-8")
+        fds = array.array("i", STANDARD_FDS)
+        sock.sendmsg([struct.pack(HEADER_FORMAT, len(data)) + data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds)])
+        try:
+            response = _receive_exactly(sock, struct.calcsize(STATUS_FORMAT))
+        except KeyboardInterrupt:
+            # Closing the connection interrupts the command on the server
+            return 130
+
+    if response is None:
+        sys.stderr.write("ftcli: the server has closed the connection\n")
+        return 1
+    return struct.unpack(STATUS_FORMAT, response)[0]
+
+
+def serve(socket_path: str = None, preload=True) -> None:
+    """
+    Runs the ftcli server until it's interrupted.
+
+    The command modules, and the modules in ``PRELOAD_MODULES``, are imported once at startup. Each request is then run
+    in a child process forked from the server, so it starts with all modules already loaded, and it can't affect the
+    server or the other requests.
+
+    :param socket_path: the path to the server socket. If None, ``get_socket_path()`` is used
+    :param preload: if True, the modules are imported at startup
+    """
+    socket_path = socket_path or get_socket_path()
+    if os.path.exists(socket_path):
+        if is_server_running(socket_path):
+            raise OSError(f"A server is already listening on {socket_path}")
+        os.remove(socket_path)
+
+    if preload:
+        preload_modules()
+
+    # Only the user running the server can connect to the socket, because commands run with the server's permissions
+    umask = os.umask(0o177)
+    try:
+        server = _Server(socket_path, _RequestHandler)
+    finally:
+        os.umask(umask)
+
+    # Stopping the server with SIGTERM removes the socket too
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        generic_info_message(f"Listening on {socket_path}")
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def get_peer_uid(sock):
+    """
+    Returns the user id of the process at the other end of a Unix domain socket.
+
+    :return: The user id, or None if it can't be read on this system.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    except OSError:
+        return None
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+
+def is_server_running(socket_path: str) -> bool:
+    """
+    Checks if a server is listening on ``socket_path``.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def preload_modules() -> None:
+    from ftCLI.ftCLI import cli
+
+    import click
+
+    ctx = click.Context(cli)
+    for name in cli.list_commands(ctx):
+        cli.get_command(ctx, name)
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # Runs in the child process forked for the request
+        status = 1
+        done = threading.Event()
+        peer_uid = get_peer_uid(self.request)
+        if peer_uid is not None and peer_uid != os.getuid():
+            return
+        try:
+            request = _receive_request(self.request)
+            if request is not None:
+                status = _run_request(self.request, done, *request)
+        finally:
+            done.set()
+            try:
+                self.request.sendall(struct.pack(STATUS_FORMAT, status))
+            except OSError:
+                pass
+
+
+def _receive_request(sock):
+    fds = array.array("i")
+    data, ancdata, _, _ = sock.recvmsg(4096, socket.CMSG_LEN(len(STANDARD_FDS) * fds.itemsize))
+    for level, type_, fd_data in ancdata:
+        if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+            fds.frombytes(fd_data[: len(fd_data) - (len(fd_data) % fds.itemsize)])
+    if len(fds) != len(STANDARD_FDS) or len(data) < struct.calcsize(HEADER_FORMAT):
+        return None
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    (size,) = struct.unpack(HEADER_FORMAT, data[:header_size])
+    data = data[header_size:]
+    if len(data) < size:
+        rest = _receive_exactly(sock, size - len(data))
+        if rest is None:
+            return None
+        data += rest
+    request = json.loads(data.decode("utf-8"))
+    return request["argv"], request["cwd"], request["env"], list(fds)
+
+
+def _receive_exactly(sock, size: int):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _exit_on_signal(signum, frame):
+    sys.exit(0)
+
+
+def _run_request(sock, done: threading.Event, argv: list, cwd: str, env: dict, fds: list) -> int:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for target_fd, fd in zip(STANDARD_FDS, fds):
+        os.dup2(fd, target_fd)
+        os.close(fd)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False, buffering=1 if os.isatty(1) else -1)
+    sys.stderr = open(2, "w", closefd=False, buffering=1)
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    sys.argv = ["ftcli"] + argv
+
+    # The client closes the connection when it's interrupted (for example, with Ctrl+C), and the command is interrupted
+    # too. Each command has its own process group, so that the signal reaches its worker processes, as in a terminal.
+    os.setpgrp()
+    threading.Thread(target=_watch_client, args=(sock, done), daemon=True).start()
+
+    from ftCLI.ftCLI import cli, write_pending_output_files
+
+    try:
+        cli.main(args=argv, prog_name="ftcli")
+        status = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            sys.stderr.write(f"{e.code}\n")
+            status = 1
+    except KeyboardInterrupt:
+        status = 130
+    except Exception:
+        traceback.print_exc()
+        status = 1
+
+    if not write_pending_output_files() and not status:
+        status = 1
+    # The child process exits with os._exit(), which skips the exit handlers (for example, the ones writing the pending
+    # output files and closing the fonts indexes)
+    atexit._run_exitfuncs()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return status
+
+
+def _watch_client(sock, done: threading.Event) -> None:
+    try:
+        sock.recv(1)
+    except OSError:
+        pass
+    if done.is_set():
+        return
+    os.killpg(0, signal.SIGINT)
+    # KeyboardInterrupt can be swallowed, for example when it's raised in a callback of a C extension
+    if not done.wait(INTERRUPT_GRACE_PERIOD):
+        os.killpg(0, signal.SIGKILL)
@@ -0,0 +1,159 @@
+import os
+import struct
+
+from fontTools.ttLib import TTLibError
+
+SFNT_VERSIONS = ("\x00\x01\x00\x00", "OTTO", "true")
+
+# Tables that ftCLI.Lib.Font.Font loads when instantiated. A font missing any of them can't be opened as a Font object.
+REQUIRED_TABLES = ("name", "OS/2", "head", "post", "hhea")
+
+# Known table tags of the WOFF2 table directory, indexed by the lower 6 bits of the flags byte.
+# See: https://www.w3.org/TR/WOFF2/#table_dir_format
+WOFF2_KNOWN_TAGS = (
+    "cmap", "head", "hhea", "hmtx", "maxp", "name", "OS/2", "post", "cvt ", "fpgm", "glyf", "loca", "prep", "CFF ",
+    "VORG", "EBDT", "EBLC", "gasp", "hdmx", "kern", "LTSH", "PCLT", "VDMX", "vhea", "vmtx", "BASE", "GDEF", "GPOS",
+    "GSUB", "EBSC", "JSTF", "MATH", "CBDT", "CBLC", "COLR", "CPAL", "SVG ", "sbix", "acnt", "avar", "bdat", "bloc",
+    "bsln", "cvar", "fdsc", "feat", "fmtx", "fvar", "gvar", "hsty", "just", "lcar", "mort", "morx", "opbd", "prop",
+    "trak", "Zapf", "Silf", "Glat", "Gloc", "Feat", "Sill",
+)
+
+
+class FontHeader(object):
+    """
+    Reads only the header and the table directory of a SFNT, WOFF or WOFF2 font file.
+
+    It answers the same questions as the homonym ``Font`` properties (``is_cff``, ``is_true_type``, ``is_variable``,
+    ``get_real_extension()``...) without decompiling any table, so it can be used to filter large font libraries.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.flavor = None
+        self.sfntVersion = None
+        self.tables = {}
+
+        with open(file, "rb") as f:
+            self.__read_header(f)
+
+        if self.sfntVersion not in SFNT_VERSIONS:
+            raise TTLibError("Not a TrueType or OpenType font (bad sfntVersion)")
+
+    def __contains__(self, tag) -> bool:
+        return tag in self.tables
+
+    def keys(self) -> list:
+        return sorted(self.tables.keys())
+
+    @property
+    def is_cff(self) -> bool:
+        return self.sfntVersion == "OTTO"
+
+    @property
+    def is_true_type(self) -> bool:
+        return "glyf" in self
+
+    @property
+    def is_woff(self) -> bool:
+        return self.flavor == "woff"
+
+    @property
+    def is_woff2(self) -> bool:
+        return self.flavor == "woff2"
+
+    @property
+    def is_variable(self) -> bool:
+        return "fvar" in self
+
+    @property
+    def is_static(self) -> bool:
+        return "fvar" not in self
+
+    def get_real_extension(self) -> str:
+        if self.flavor is not None:
+            return f".{self.flavor}"
+        elif self.is_true_type:
+            return ".ttf"
+        elif self.is_cff:
+            return ".otf"
+
+    def has_required_tables(self) -> bool:
+        """
+        Checks if the tables eagerly loaded by the ``Font`` class are all present in the table directory.
+
+        :return: A boolean value.
+        """
+        return all(tag in self for tag in REQUIRED_TABLES)
+
+    def __read_header(self, f) -> None:
+        file_size = os.fstat(f.fileno()).st_size
+        signature = f.read(4)
+
+        if signature == b"wOFF":
+            self.flavor = "woff"
+            self.sfntVersion, num_tables = self.__unpack(f, ">4sxxxxHxx", 12)
+            f.seek(44)
+            for _ in range(num_tables):
+                tag, offset, length = self.__unpack(f, ">4sLLLL", 20)[:3]
+                self.__add_table(tag, offset, length, file_size)
+
+        elif signature == b"wOF2":
+            self.flavor = "woff2"
+            self.sfntVersion, num_tables = self.__unpack(f, ">4sxxxxHxx", 12)
+            f.seek(48)
+            for _ in range(num_tables):
+                (flags,) = self.__unpack(f, ">B", 1)
+                if flags & 0x3F == 0x3F:
+                    (tag,) = self.__unpack(f, ">4s", 4)
+                    tag = tag.decode("latin-1")
+                else:
+                    tag = WOFF2_KNOWN_TAGS[flags & 0x3F]
+                orig_length = self.__read_base_128(f)
+                transform_version = (flags >> 6) & 0x03
+                # glyf and loca are transformed when the transform version is 0, any other table when it's not 0
+                if (tag in ("glyf", "loca")) == (transform_version == 0):
+                    self.__read_base_128(f)
+                self.tables[tag] = (None, orig_length)
+
+        elif signature == b"ttcf":
+            raise TTLibError("Font collections are not supported")
+
+        else:
+            self.sfntVersion = signature.decode("latin-1")
+            if self.sfntVersion not in SFNT_VERSIONS:
+                return
+            (num_tables,) = self.__unpack(f, ">Hxxxxxx", 8)
+            for _ in range(num_tables):
+                tag, _, offset, length = self.__unpack(f, ">4sLLL", 16)
+                self.__add_table(tag, offset, length, file_size)
+
+        if isinstance(self.sfntVersion, bytes):
+            self.sfntVersion = self.sfntVersion.decode("latin-1")
+
+    def __add_table(self, tag: bytes, offset: int, length: int, file_size: int) -> None:
+        if offset + length > file_size:
+            raise TTLibError(f"Table '{tag.decode('latin-1')}' exceeds the file size")
+        self.tables[tag.decode("latin-1")] = (offset, length)
+
+    @staticmethod
+    def __unpack(f, fmt: str, size: int) -> tuple:
+        data = f.read(size)
+        if len(data) < size:
+            raise TTLibError("Not enough data to read the font header")
+        return struct.unpack(fmt, data)
+
+    @staticmethod
+    def __read_base_128(f) -> int:
+        result = 0
+        for i in range(5):
+            data = f.read(1)
+            if not data:
+                raise TTLibError("Not enough data to read the WOFF2 table directory")
+            code = ord(data)
+            # Leading zeros are invalid
+            if i == 0 and code == 0x80:
+                raise TTLibError("UIntBase128 value must not start with leading zeros")
+            result = (result << 7) | (code & 0x7F)
+            if not code & 0x80:
+                return result
+        raise TTLibError("UIntBase128 sequence exceeds 5 bytes")
@@ -0,0 +1,313 @@
+import os
+import shutil
+import struct
+
+from fontTools.misc.fixedTools import fixedToFloat, floatToFixed
+from fontTools.misc.textTools import Tag
+from fontTools.misc.timeTools import timestampNow
+from fontTools.ttLib import TTLibError
+from fontTools.ttLib.sfnt import calcChecksum
+
+from ftCLI.Lib.Font import Font
+from ftCLI.Lib.tables.OS_2 import TableOS2
+from ftCLI.Lib.tables.head import TableHead
+from ftCLI.Lib.tables.hhea import TableHhea
+from ftCLI.Lib.tables.post import TablePost
+from ftCLI.Lib.utils.font_header import SFNT_VERSIONS
+from ftCLI.Lib.utils.output_writer import get_temp_file_path, is_fsync_enabled, replace_file
+from ftCLI.Lib.utils.profiler import measure
+
+# Offsets and formats of the fixed-size fields that can be patched. "Fixed" is a 16.16 signed fixed-point number and
+# "Tag" a four-character identifier, all the other formats are struct formats.
+OS_2_FIELDS = {
+    "version": (0, ">H"),
+    "usWeightClass": (4, ">H"),
+    "usWidthClass": (6, ">H"),
+    "fsType": (8, ">H"),
+    "achVendID": (58, "Tag"),
+    "fsSelection": (62, ">H"),
+    "sTypoAscender": (68, ">h"),
+    "sTypoDescender": (70, ">h"),
+    "sTypoLineGap": (72, ">h"),
+    "usWinAscent": (74, ">H"),
+    "usWinDescent": (76, ">H"),
+}
+HEAD_FIELDS = {
+    "checkSumAdjustment": (8, ">L"),
+    "modified": (28, ">Q"),
+    "macStyle": (44, ">H"),
+}
+POST_FIELDS = {
+    "italicAngle": (4, "Fixed"),
+    "underlinePosition": (8, ">h"),
+    "underlineThickness": (10, ">h"),
+    "isFixedPitch": (12, ">L"),
+}
+HHEA_FIELDS = {
+    "ascent": (4, ">h"),
+    "descent": (6, ">h"),
+    "lineGap": (8, ">h"),
+    "caretSlopeRise": (18, ">h"),
+    "caretSlopeRun": (20, ">h"),
+    "caretOffset": (22, ">h"),
+}
+
+
+class PatchedTable(object):
+    """
+    Base class of the tables edited by ``FontPatcher``. The fields listed in ``fields`` are read from and written to the
+    raw table bytes, so the methods of the ftCLI table classes work unchanged on them.
+    """
+
+    fields = {}
+
+    def __init__(self, tag, data: bytes, length: int):
+        object.__setattr__(self, "original_data", data)
+        object.__setattr__(self, "data", bytearray(data))
+        object.__setattr__(self, "length", length)
+        super().__init__(tag)
+
+    def __getattr__(self, name):
+        if name not in self.fields:
+            raise AttributeError(name)
+        offset, fmt = self.fields[name]
+        if fmt == "Fixed":
+            return fixedToFloat(struct.unpack_from(">l", self.data, offset)[0], 16)
+        if fmt == "Tag":
+            return Tag(bytes(self.data[offset : offset + 4]))
+        return struct.unpack_from(fmt, self.data, offset)[0]
+
+    def __setattr__(self, name, value):
+        if name not in self.fields:
+            object.__setattr__(self, name, value)
+            return
+        offset, fmt = self.fields[name]
+        if fmt == "Fixed":
+            struct.pack_into(">l", self.data, offset, floatToFixed(value, 16))
+        elif fmt == "Tag":
+            self.data[offset : offset + 4] = Tag(value).tobytes().ljust(4)[:4]
+        else:
+            struct.pack_into(fmt, self.data, offset, value)
+
+    def __copy__(self):
+        # Copies are used by the table editors to check if a table has changed, so they can't share the table bytes
+        table = self.__class__.__new__(self.__class__)
+        table.__dict__.update(self.__dict__)
+        object.__setattr__(table, "data", bytearray(self.data))
+        return table
+
+    @property
+    def min_length(self) -> int:
+        return max(
+            offset + (4 if fmt in ("Fixed", "Tag") else struct.calcsize(fmt)) for offset, fmt in self.fields.values()
+        )
+
+    @property
+    def is_changed(self) -> bool:
+        return self.data != self.original_data
+
+
+class PatchedOS2(PatchedTable, TableOS2):
+    fields = OS_2_FIELDS
+
+
+class PatchedHead(PatchedTable, TableHead):
+    fields = HEAD_FIELDS
+
+
+class PatchedPost(PatchedTable, TablePost):
+    fields = POST_FIELDS
+
+
+class PatchedHhea(PatchedTable, TableHhea):
+    fields = HHEA_FIELDS
+
+
+PATCHED_TABLE_CLASSES = {"OS/2": PatchedOS2, "head": PatchedHead, "post": PatchedPost, "hhea": PatchedHhea}
+
+
+class FontPatcher(object):
+    """
+    Edits the fixed-size fields of the ``OS/2``, ``head``, ``post`` and ``hhea`` tables of a SFNT font file by rewriting
+    their bytes in place, without parsing the font with fontTools.
+
+    The tables are exposed through the same ``os_2_table``, ``head_table``, ``post_table`` and ``hhea_table`` properties
+    of the ``Font`` class, and ``get_changed_tables()`` and ``save_tables()`` work the same way, so table editors can
+    use either of them. Only the checksums of the patched tables and ``head.checkSumAdjustment`` are recalculated.
+    """
+
+    def __init__(self, file, recalcTimestamp=False):
+        self.file = file
+        self.recalcTimestamp = recalcTimestamp
+        self.sfntVersion = None
+        self.directory = {}
+        self.tables = {}
+
+        with open(file, "rb") as f:
+            with measure("load"):
+                self.__read_directory(f)
+            if "head" not in self.directory:
+                raise TTLibError("'head' table not found")
+            for tag, table_class in PATCHED_TABLE_CLASSES.items():
+                if tag in self.directory:
+                    with measure("decompile", tag):
+                        self.tables[tag] = self.__read_table(f, tag, table_class)
+
+    def __contains__(self, tag) -> bool:
+        return tag in self.directory
+
+    def __getitem__(self, tag):
+        if tag not in self.tables:
+            raise KeyError(f"'{tag}' table can't be patched in place")
+        return self.tables[tag]
+
+    @property
+    def os_2_table(self) -> PatchedOS2:
+        return self["OS/2"]
+
+    @property
+    def head_table(self) -> PatchedHead:
+        return self["head"]
+
+    @property
+    def post_table(self) -> PatchedPost:
+        return self["post"]
+
+    @property
+    def hhea_table(self) -> PatchedHhea:
+        return self["hhea"]
+
+    @property
+    def is_cff(self) -> bool:
+        return self.sfntVersion == "OTTO"
+
+    @property
+    def is_true_type(self) -> bool:
+        return "glyf" in self
+
+    # The style bits helpers of the Font class only use the tables above, so they work on patched tables too.
+    is_bold = Font.is_bold
+    is_italic = Font.is_italic
+    set_bold = Font.set_bold
+    unset_bold = Font.unset_bold
+    set_italic = Font.set_italic
+    unset_italic = Font.unset_italic
+    set_regular = Font.set_regular
+    set_oblique = Font.set_oblique
+    unset_oblique = Font.unset_oblique
+
+    def is_table_changed(self, tag: str) -> bool:
+        return tag in self.tables and self.tables[tag].is_changed
+
+    def get_changed_tables(self, tags: list) -> list:
+        return [tag for tag in tags if self.is_table_changed(tag)]
+
+    def save_tables(self, file, tags: list) -> None:
+        """
+        Writes the changes made to the tables in ``tags``. The source file is copied to a temporary file next to
+        ``file``, the copy is patched and then renamed to ``file``, so that the source file is never left half-patched,
+        even when it's overwritten.
+
+        The new ``head.checkSumAdjustment`` is derived from the old one and from the checksums of the patched bytes, so
+        the rest of the file is never read.
+
+        :param file: the output file path
+        :param tags: the tags of the modified tables
+        """
+        changed_tags = self.get_changed_tables(tags)
+        if self.recalcTimestamp:
+            self.head_table.modified = timestampNow()
+        if "head" not in changed_tags:
+            changed_tags.append("head")
+
+        # checkSumAdjustment is the difference between 0xB1B0AFBA and the checksum of the whole file calculated with
+        # checkSumAdjustment set to zero. Patching a table changes the file checksum by the difference between the new
+        # and the old checksums of the table bytes and of the table directory entry.
+        head = self.head_table
+        head.checkSumAdjustment = 0
+        delta = 0
+        for tag in changed_tags:
+            table = self.tables[tag]
+            original_data = table.original_data
+            if tag == "head":
+                original_data = original_data[:8] + b"\0\0\0\0" + original_data[12:]
+            checksum = calcChecksum(bytes(table.data[: table.length]))
+            delta += calcChecksum(bytes(table.data)) - calcChecksum(original_data)
+            delta += checksum - self.directory[tag][1]
+            self.directory[tag] = (self.directory[tag][0], checksum) + self.directory[tag][2:]
+        (checksum_adjustment,) = struct.unpack_from(">L", head.original_data, 8)
+        head.checkSumAdjustment = (checksum_adjustment - delta) & 0xFFFFFFFF
+
+        with measure("write"):
+            self.__patch_file(file, changed_tags)
+
+        for tag in changed_tags:
+            table = self.tables[tag]
+            object.__setattr__(table, "original_data", bytes(table.data))
+
+    def __patch_file(self, file, changed_tags: list) -> None:
+        temp_file = get_temp_file_path(file)
+        try:
+            shutil.copyfile(self.file, temp_file)
+            with open(temp_file, "r+b") as f:
+                for tag in changed_tags:
+                    index, checksum, offset, _ = self.directory[tag]
+                    f.seek(offset)
+                    f.write(self.tables[tag].data)
+                    f.seek(12 + 16 * index + 4)
+                    f.write(struct.pack(">L", checksum))
+                if is_fsync_enabled():
+                    f.flush()
+                    os.fsync(f.fileno())
+            replace_file(temp_file, file)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def close(self) -> None:
+        pass
+
+    def __read_directory(self, f) -> None:
+        data = f.read(12)
+        if len(data) < 12:
+            raise TTLibError("Not enough data to read the font header")
+        sfnt_version, num_tables = struct.unpack(">4sH", data[:6])
+        self.sfntVersion = sfnt_version.decode("latin-1")
+        if self.sfntVersion not in SFNT_VERSIONS:
+            raise TTLibError("Only TrueType and OpenType fonts can be patched in place")
+
+        data = f.read(16 * num_tables)
+        if len(data) < 16 * num_tables:
+            raise TTLibError("Not enough data to read the table directory")
+        for index in range(num_tables):
+            tag, checksum, offset, length = struct.unpack_from(">4sLLL", data, 16 * index)
+            self.directory[tag.decode("latin-1")] = (index, checksum, offset, length)
+
+    def __read_table(self, f, tag: str, table_class) -> PatchedTable:
+        _, _, offset, length = self.directory[tag]
+        # The table is read with its padding, so that the checksum of the patched words can be compared with the old one
+        padded_length = (length + 3) & ~3
+        f.seek(offset)
+        data = f.read(padded_length)
+        if len(data) < length:
+            raise TTLibError(f"'{tag}' table exceeds the file size")
+        table = table_class(tag, data.ljust(padded_length, b"\0"), length)
+        if length < table.min_length:
+            raise TTLibError(f"'{tag}' table is too short to be patched in place")
+        return table
+
+
+def get_font_patcher(file, recalcTimestamp=False):
+    """
+    Returns a FontPatcher for the given file, or None if the file can't be patched in place (web fonts, font
+    collections, fonts with missing or truncated tables).
+
+    :param file: the path to the font file
+    :param recalcTimestamp: if True, head.modified is set to the current time when the font is saved
+    :return: A FontPatcher object, or None.
+    """
+    try:
+        return FontPatcher(file, recalcTimestamp=recalcTimestamp)
+    except (OSError, TTLibError, struct.error):
+        return None
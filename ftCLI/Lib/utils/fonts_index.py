@@ -0,0 +1,342 @@
+import os
+import sqlite3
+
+from ftCLI.Lib.utils.font_header import FontHeader
+
+# Increase this value when the schema of the index changes: existing indexes will be rebuilt.
+SCHEMA_VERSION = 1
+
+# Number of writes after which pending changes are committed to the database.
+COMMIT_INTERVAL = 100
+
+HEADER_FIELDS = (
+    "is_valid",
+    "flavor",
+    "outline_format",
+    "is_variable",
+    "required_tables_found",
+)
+
+METADATA_FIELDS = (
+    "family_name",
+    "subfamily_name",
+    "best_family_name",
+    "best_subfamily_name",
+    "full_name",
+    "postscript_name",
+    "version_string",
+    "manufacturer",
+    "vendor_id",
+    "cff_font_name",
+    "cff_full_name",
+    "us_width_class",
+    "us_weight_class",
+    "is_bold",
+    "is_italic",
+    "is_oblique",
+)
+
+BOOLEAN_FIELDS = (
+    "is_valid",
+    "is_variable",
+    "required_tables_found",
+    "has_metadata",
+    "is_bold",
+    "is_italic",
+    "is_oblique",
+)
+
+CREATE_TABLE_QUERY = f"""
+CREATE TABLE IF NOT EXISTS fonts (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    has_metadata INTEGER NOT NULL DEFAULT 0,
+    {", ".join(HEADER_FIELDS + METADATA_FIELDS)}
+)
+"""
+
+
+class FontRecord(object):
+    """
+    The data of a font file stored in the fonts index.
+
+    Header fields (flavor, outline format...) are always available. Metadata fields (names, OS/2 values...) are only
+    available if ``has_metadata`` is True.
+    """
+
+    def __init__(self, file, **kwargs):
+        self.file = file
+        self.has_metadata = False
+        for field in HEADER_FIELDS + METADATA_FIELDS:
+            setattr(self, field, None)
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    @classmethod
+    def from_header(cls, header: FontHeader):
+        """
+        Creates a FontRecord from the header of a font file.
+
+        :param header: a FontHeader object
+        :return: A FontRecord object, with no metadata.
+        """
+        if header.is_cff:
+            outline_format = "cff"
+        elif header.is_true_type:
+            outline_format = "ttf"
+        else:
+            outline_format = None
+
+        return cls(
+            header.file,
+            is_valid=True,
+            flavor=header.flavor,
+            outline_format=outline_format,
+            is_variable=header.is_variable,
+            required_tables_found=header.has_required_tables(),
+        )
+
+    @classmethod
+    def from_font(cls, font):
+        """
+        Creates a FontRecord from a Font object, with header and metadata fields filled.
+
+        :param font: a Font object
+        :return: A FontRecord object.
+        """
+        record = cls(
+            font.file,
+            is_valid=True,
+            flavor=font.flavor,
+            outline_format="cff" if font.is_cff else "ttf" if font.is_true_type else None,
+            is_variable=font.is_variable,
+            required_tables_found=True,
+        )
+        record.update_metadata(font)
+        return record
+
+    def update_metadata(self, font) -> None:
+        """
+        Reads the metadata fields from a Font object.
+
+        :param font: a Font object
+        """
+        self.family_name = font.guess_family_name()
+        self.subfamily_name = font.guess_subfamily_name()
+        self.best_family_name = font.name_table.getBestFamilyName()
+        self.best_subfamily_name = font.name_table.getBestSubFamilyName()
+        self.full_name = font.name_table.getDebugName(4)
+        self.postscript_name = font.name_table.getDebugName(6)
+        self.version_string = font.name_table.getDebugName(5)
+        self.manufacturer = font.name_table.getDebugName(8)
+        self.vendor_id = font.os_2_table.achVendID
+        if font.is_cff:
+            self.cff_font_name = font["CFF "].cff.fontNames[0]
+            self.cff_full_name = getattr(font["CFF "].cff.topDictIndex[0], "FullName", None)
+        self.us_width_class = font.os_2_table.usWidthClass
+        self.us_weight_class = font.os_2_table.usWeightClass
+        self.is_bold = font.is_bold
+        self.is_italic = font.is_italic
+        self.is_oblique = font.is_oblique
+        self.has_metadata = True
+
+    @property
+    def is_cff(self) -> bool:
+        return self.outline_format == "cff"
+
+    @property
+    def is_true_type(self) -> bool:
+        return self.outline_format == "ttf"
+
+    @property
+    def is_static(self) -> bool:
+        return not self.is_variable
+
+    def has_required_tables(self) -> bool:
+        return bool(self.required_tables_found)
+
+    def get_real_extension(self) -> str:
+        if self.flavor is not None:
+            return f".{self.flavor}"
+        elif self.is_true_type:
+            return ".ttf"
+        elif self.is_cff:
+            return ".otf"
+
+    def get_file_name(self, source) -> str:
+        """
+        Returns the font's file name according to the passed source. See ``Font.get_file_name``.
+
+        :param source: The namerecord or combination of namerecords from which to build the file name.
+        :return: The file name of the font.
+        """
+        if self.is_true_type:
+            if source in (4, 5):
+                source = 1
+
+        if source == 1:
+            return f"{self.family_name}-{self.subfamily_name}".replace(" ", "")
+        elif source == 2:
+            return self.postscript_name
+        elif source == 3:
+            return self.full_name
+        elif source == 4:
+            return self.cff_font_name
+        elif source == 5:
+            return self.cff_full_name
+        else:
+            return os.path.basename(os.path.splitext(self.file)[0])
+
+
+class FontsIndex(object):
+    """
+    A SQLite database that caches the data of the font files found in a directory, so that unchanged files don't need
+    to be parsed again. Records are keyed on the file path, and are invalidated when the file size or modification time
+    changes.
+
+    Can be used as a context manager: pending changes are committed on exit.
+    """
+
+    def __init__(self, index_file):
+        self.file = index_file
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        self.connection = sqlite3.connect(self.file, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.__pending_writes = 0
+
+        (user_version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if user_version != SCHEMA_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS fonts")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.execute(CREATE_TABLE_QUERY)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_record(self, file, with_metadata=False) -> FontRecord:
+        """
+        Returns the record of a font file. The file is read only if it's not in the index, if it has changed since it
+        was indexed, or if metadata is requested but it has not been read yet.
+
+        :param file: the path to the font file
+        :param with_metadata: if True, the metadata fields of the record are filled
+        :return: A FontRecord object. ``is_valid`` is False if the file is not a valid font file.
+        """
+        file = os.path.abspath(file)
+        stat = os.stat(file)
+
+        record = self.__find_record(file, stat)
+        if record is not None:
+            if not with_metadata or record.has_metadata or not record.is_valid:
+                return record
+        else:
+            record = self.read_header(file)
+
+        if with_metadata and record.is_valid:
+            from ftCLI.Lib.Font import Font
+
+            font = Font(file)
+            record.update_metadata(font)
+            font.close()
+
+        self.__save_record(record, stat)
+        return record
+
+    @staticmethod
+    def read_header(file) -> FontRecord:
+        """
+        Reads the header of a font file.
+
+        :param file: the path to the font file
+        :return: A FontRecord object, with ``is_valid`` set to False if the header can't be read.
+        """
+        try:
+            return FontRecord.from_header(FontHeader(file))
+        except Exception:
+            return FontRecord(file, is_valid=False)
+
+    def rename(self, old_file, new_file) -> None:
+        """
+        Updates the path of an indexed file after it has been moved or renamed.
+
+        :param old_file: the old path of the file
+        :param new_file: the new path of the file
+        """
+        self.connection.execute("DELETE FROM fonts WHERE path = ?", (os.path.abspath(new_file),))
+        self.connection.execute(
+            "UPDATE fonts SET path = ? WHERE path = ?", (os.path.abspath(new_file), os.path.abspath(old_file))
+        )
+        self.__count_write()
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self.__pending_writes = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
+
+    def __find_record(self, file, stat: os.stat_result):
+        row = self.connection.execute("SELECT * FROM fonts WHERE path = ?", (file,)).fetchone()
+        if row is not None and row["size"] == stat.st_size and row["mtime_ns"] == stat.st_mtime_ns:
+            return self.__row_to_record(row)
+
+    def __save_record(self, record: FontRecord, stat: os.stat_result) -> None:
+        fields = ("path", "size", "mtime_ns", "has_metadata") + HEADER_FIELDS + METADATA_FIELDS
+        values = [record.file, stat.st_size, stat.st_mtime_ns, record.has_metadata]
+        values.extend(getattr(record, field) for field in HEADER_FIELDS + METADATA_FIELDS)
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO fonts ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+            values,
+        )
+        self.__count_write()
+
+    def __count_write(self) -> None:
+        self.__pending_writes += 1
+        if self.__pending_writes >= COMMIT_INTERVAL:
+            self.commit()
+
+    @staticmethod
+    def __row_to_record(row: sqlite3.Row) -> FontRecord:
+        data = {k: row[k] for k in row.keys() if k not in ("path", "size", "mtime_ns")}
+        for k in BOOLEAN_FIELDS:
+            if data[k] is not None:
+                data[k] = bool(data[k])
+        return FontRecord(row["path"], **data)
+
+
+def open_fonts_index(index_file):
+    """
+    Opens the fonts index, or returns None if it can't be opened (for example, because the directory is read-only).
+
+    :param index_file: the path to the index file
+    :return: A FontsIndex object, or None.
+    """
+    try:
+        return FontsIndex(index_file)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def get_font_record(file, index: FontsIndex = None) -> FontRecord:
+    """
+    Returns the record of a font file, with metadata. If no index is passed, the font file is parsed.
+
+    :param file: the path to the font file
+    :param index: a FontsIndex object, or None
+    :return: A FontRecord object.
+    """
+    if index is not None:
+        return index.get_record(file, with_metadata=True)
+
+    from ftCLI.Lib.Font import Font
+
+    font = Font(file)
+    record = FontRecord.from_font(font)
+    font.close()
+    return record
@@ -0,0 +1,85 @@
+import os
+import struct
+import zlib
+
+from ftCLI.Lib.utils.font_header import FontHeader
+
+# Memory used by a job regardless of the font it processes: the worker interpreter, fontTools and ftCLI modules.
+JOB_BASE_MEMORY = 48 * 1024 * 1024
+
+# Rough peak memory of each operation type, as (bytes per byte of the uncompressed font, bytes per glyph). The first
+# term covers the raw and decompiled tables, the second one the glyph objects and the outlines drawn by the pens.
+# "edit" is any command that loads a font, modifies some tables and saves it.
+JOB_MEMORY_COSTS = {
+    "edit": (4, 2 * 1024),
+    "ft2wf": (8, 4 * 1024),
+    "wf2ft": (6, 4 * 1024),
+    "ttc2sfnt": (6, 4 * 1024),
+    "otf2ttf": (10, 24 * 1024),
+    "ttf2otf": (12, 32 * 1024),
+    "var2static": (24, 48 * 1024),
+}
+
+# How much larger than the file a WOFF or WOFF2 font is once decompressed, used when the tables can't be read
+WEB_FONT_EXPANSION = {"woff": 2, "woff2": 3}
+
+
+def estimate_job_memory(file, operation: str = "edit") -> int:
+    """
+    Estimates the peak memory, in bytes, used to process a font file.
+
+    The estimate is based on the size of the file, on the number of glyphs read from the ``maxp`` table, and on the
+    operation type. It's a rough upper bound, meant to keep the jobs of a parallel run under a memory budget, not an
+    accurate measure.
+
+    :param file: the path to the font file
+    :param operation: one of the keys of ``JOB_MEMORY_COSTS``. Unknown operations are treated as "edit"
+    :return: The estimated peak memory in bytes.
+    """
+    bytes_per_byte, bytes_per_glyph = JOB_MEMORY_COSTS.get(operation, JOB_MEMORY_COSTS["edit"])
+
+    try:
+        file_size = os.path.getsize(file)
+    except OSError:
+        return JOB_BASE_MEMORY
+
+    num_glyphs = 0
+    try:
+        header = FontHeader(file)
+        file_size *= WEB_FONT_EXPANSION.get(header.flavor, 1)
+        num_glyphs = read_num_glyphs(header)
+    except Exception:
+        # Font collections and damaged files are estimated from their size only
+        pass
+
+    return JOB_BASE_MEMORY + file_size * bytes_per_byte + num_glyphs * bytes_per_glyph
+
+
+def read_num_glyphs(header: FontHeader) -> int:
+    """
+    Reads ``maxp.numGlyphs`` without loading the font.
+
+    :param header: the FontHeader of the font file
+    :return: The number of glyphs, or 0 if it can't be read (for example, in WOFF2 fonts, whose tables are stored in a
+        single compressed stream).
+    """
+    if "maxp" not in header:
+        return 0
+    offset, length = header.tables["maxp"]
+    if offset is None:
+        return 0
+
+    with open(header.file, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+
+    if header.is_woff:
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            # Tables that don't shrink when compressed are stored as they are
+            pass
+
+    if len(data) < 6:
+        return 0
+    return struct.unpack(">H", data[4:6])[0]
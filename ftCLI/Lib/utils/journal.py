@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import time
+
+# Size of the blocks read when hashing a file.
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class Journal(object):
+    """
+    An append-only JSON lines file that records the input files completed by the commands run on a directory.
+
+    Each line stores the path and the SHA-256 hash of a completed file, the command and a fingerprint of its options.
+    A file is completed for a command if the journal contains an entry with the same path, hash and fingerprint, so a
+    file that has been modified since, or a run with different options, is processed again. Files edited in place are
+    hashed after being saved, so that they are recognized when the run is resumed.
+    """
+
+    def __init__(self, journal_file, command: str, params: dict):
+        self.file = journal_file
+        self.command = command
+        self.fingerprint = get_options_fingerprint(command, params)
+        self.__completed = None
+
+    def is_completed(self, file) -> bool:
+        """
+        Checks if a file has been completed by a previous run of the same command with the same options.
+
+        :param file: the path to the input file
+        :return: True if the file is recorded in the journal and hasn't changed since then.
+        """
+        if self.__completed is None:
+            self.__completed = self.__read_entries()
+        hashes = self.__completed.get(os.path.abspath(file))
+        if not hashes:
+            return False
+        try:
+            return get_file_hash(file) in hashes
+        except OSError:
+            return False
+
+    def add(self, file) -> None:
+        """
+        Records a completed file. Each entry is written and flushed immediately, so that it survives a crash of the run.
+
+        :param file: the path to the input file
+        """
+        path = os.path.abspath(file)
+        entry = dict(
+            path=path,
+            hash=get_file_hash(file),
+            command=self.command,
+            fingerprint=self.fingerprint,
+            time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+        with open(self.file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        if self.__completed is not None:
+            self.__completed.setdefault(path, set()).add(entry["hash"])
+
+    def __read_entries(self) -> dict:
+        completed = {}
+        try:
+            with open(self.file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # The last line is truncated if the run has been killed while writing it
+                        continue
+                    if isinstance(entry, dict) and entry.get("fingerprint") == self.fingerprint:
+                        completed.setdefault(entry.get("path"), set()).add(entry.get("hash"))
+        except OSError:
+            pass
+        return completed
+
+
+def get_file_hash(file) -> str:
+    """
+    Returns the SHA-256 hash of the content of a file.
+
+    :param file: the path to the file
+    :return: The hexadecimal digest.
+    """
+    file_hash = hashlib.sha256()
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def get_options_fingerprint(command: str, params: dict) -> str:
+    """
+    Returns a short hash of a command and its options.
+
+    :param command: the command path (e.g.: "ftcli converter ttf2otf")
+    :param params: the options of the command
+    :return: The hexadecimal digest.
+    """
+    data = json.dumps([command, sorted(params.items())], default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def open_journal(journal_file, command: str, params: dict):
+    """
+    Opens the journal, or returns None if it can't be written (for example, because the directory is read-only).
+
+    :param journal_file: the path to the journal file
+    :param command: the command path
+    :param params: the options of the command
+    :return: A Journal object, or None.
+    """
+    try:
+        os.makedirs(os.path.dirname(journal_file), exist_ok=True)
+        with open(journal_file, "a", encoding="utf-8"):
+            pass
+    except OSError:
+        return None
+    return Journal(journal_file, command, params)
@@ -0,0 +1,44 @@
+import contextlib
+import os
+import tempfile
+
+
+@contextlib.contextmanager
+def build_makeotf_font(font):
+    """
+    Converts a font to Type 1 with tx and back to OpenType with makeotf, to read the values that makeotf calculates
+    (the Unicode and codepage ranges, the caret offset...).
+
+    The font is saved to a temporary folder before running tx, so that the edits that have not been saved yet (for
+    example, by the previous steps of a ``ftcli run`` recipe) are taken into account. The temporary files are removed
+    on exit.
+
+    :param font: a Font object
+    :return: A context manager yielding the Font object built by makeotf.
+    """
+    from afdko.fdkutils import run_shell_command
+
+    from ftCLI.Lib.Font import Font
+
+    with tempfile.TemporaryDirectory(prefix="ftCLI-") as temp_dir:
+        temp_source_file = os.path.join(temp_dir, "source" + os.path.splitext(font.file)[1])
+        temp_t1_file = os.path.join(temp_dir, "source.t1")
+        temp_otf_file = os.path.join(temp_dir, "makeotf.otf")
+
+        # The bounding boxes and the timestamp are left untouched, so that saving the copy doesn't change the font
+        recalc_bboxes, recalc_timestamp = font.recalcBBoxes, font.recalcTimestamp
+        font.recalcBBoxes = font.recalcTimestamp = False
+        try:
+            with open(temp_source_file, "wb") as f:
+                font.save(f)
+        finally:
+            font.recalcBBoxes, font.recalcTimestamp = recalc_bboxes, recalc_timestamp
+
+        run_shell_command(["tx", "-t1", temp_source_file, temp_t1_file], suppress_output=True)
+        run_shell_command(["makeotf", "-f", temp_t1_file, "-o", temp_otf_file], suppress_output=True)
+
+        temp_font = Font(temp_otf_file)
+        try:
+            yield temp_font
+        finally:
+            temp_font.close()
@@ -0,0 +1,334 @@
+import atexit
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from io import BytesIO
+
+from ftCLI.Lib.utils.click_tools import file_saved_message, generic_error_message
+from ftCLI.Lib.utils.profiler import get_current_profile, measure
+
+# Maximum number of compiled fonts waiting to be written. Saving a font blocks when the queue is full, so that fonts
+# compiled faster than they can be written don't pile up in memory.
+WRITER_QUEUE_SIZE = 4
+
+# The umask can only be read by setting it, which is not thread-safe, so it's read once, before the writer thread is
+# started (see _get_umask).
+_umask = None
+_umask_lock = threading.Lock()
+
+_start_lock = threading.Lock()
+
+
+class OutputWriter(object):
+    """
+    Writes the output files on a background thread, so that writing a font to disk overlaps with the compilation of the
+    following output files.
+
+    Files are written atomically (see ``write_file_atomically``). Errors are stored and raised by ``flush()``, which
+    must be called before the output files are read, or returned by the future of ``checkpoint()``. ``process_files``
+    takes a checkpoint after each input file, so that a file is recorded as completed only when its output files are
+    on disk, without waiting for them before processing the next file. Each thread only gets the errors of the files
+    it has queued.
+
+    The saved message of a queued file is deferred (see ``defer_saved_message``) and printed by the thread taking the
+    checkpoint, once the file has been written (see ``report_output_files``).
+
+    :param max_size: the maximum number of files waiting to be written
+    :param fsync: if True, each file is flushed to disk before being renamed to its target path
+    """
+
+    def __init__(self, max_size: int = WRITER_QUEUE_SIZE, fsync=False):
+        self.max_size = max_size
+        self.fsync = fsync
+        self.__pid = None
+        self.__queue = None
+        self.__thread = None
+        self.__errors = {}
+        self.__written = {}
+        self.__queued = {}
+        self.__deferred = {}
+        self.__lock = threading.Lock()
+
+    def write(self, file, data: bytes) -> None:
+        """
+        Queues a file to be written. Blocks if the queue is full.
+
+        :param file: the path to the output file
+        :param data: the content of the file
+        """
+        self.__start()
+        file = os.path.abspath(file)
+        thread_id = threading.get_ident()
+        with self.__lock:
+            self.__queued.setdefault(thread_id, set()).add(file)
+        with measure("wait"):
+            self.__queue.put((file, data, thread_id, get_current_profile()))
+
+    def defer_saved_message(self, file) -> bool:
+        """
+        Defers the saved message of a file queued by the current thread since the previous checkpoint, until the file
+        has been written.
+
+        :param file: the path to the output file
+        :return: True if the message has been deferred, False if the file has not been queued.
+        """
+        if self.__pid != os.getpid():
+            return False
+        file = os.path.abspath(file)
+        thread_id = threading.get_ident()
+        with self.__lock:
+            if file not in self.__queued.get(thread_id, ()):
+                return False
+            deferred = self.__deferred.setdefault(thread_id, [])
+            if file not in deferred:
+                deferred.append(file)
+        return True
+
+    def checkpoint(self) -> Future:
+        """
+        Returns a future that is done when all the files queued by the current thread have been written. Doesn't
+        block.
+
+        :return: A Future object, whose result is a tuple with the files written since the previous checkpoint whose
+            saved message has been deferred, and the first error of the files queued by the current thread since the
+            previous checkpoint, or None.
+        """
+        future = Future()
+        if self.__pid != os.getpid():
+            future.set_result(([], None))
+            return future
+        thread_id = threading.get_ident()
+        with self.__lock:
+            self.__queued.pop(thread_id, None)
+            deferred = self.__deferred.pop(thread_id, [])
+        self.__queue.put((None, (future, deferred), thread_id, None))
+        return future
+
+    def flush(self) -> None:
+        """
+        Waits until all the queued files have been written.
+
+        :raises OSError: if a file queued by the current thread couldn't be written. Only the first error is raised.
+        """
+        if self.__pid != os.getpid():
+            return
+        self.__queue.join()
+        with self.__lock:
+            errors = self.__errors.pop(threading.get_ident(), [])
+        if errors:
+            raise errors[0]
+
+    def __start(self) -> None:
+        # Threads are not copied to forked worker processes, so each process starts its own writer thread
+        if self.__pid == os.getpid():
+            return
+        with _start_lock:
+            if self.__pid != os.getpid():
+                _get_umask()
+                self.__lock = threading.Lock()
+                self.__queue = queue.Queue(maxsize=self.max_size)
+                self.__errors = {}
+                self.__written = {}
+                self.__queued = {}
+                self.__deferred = {}
+                self.__thread = threading.Thread(target=self.__run, name="ftCLI output writer", daemon=True)
+                self.__thread.start()
+                self.__pid = os.getpid()
+
+    def __run(self) -> None:
+        while True:
+            file, data, thread_id, profile = self.__queue.get()
+            if file is None:
+                self.__end_checkpoint(data, thread_id)
+                continue
+            try:
+                start = time.perf_counter()
+                write_file_atomically(file, data, fsync=self.fsync)
+                if profile is not None:
+                    profile.add("write", time.perf_counter() - start)
+                with self.__lock:
+                    self.__written.setdefault(thread_id, set()).add(file)
+            except Exception as e:
+                with self.__lock:
+                    self.__errors.setdefault(thread_id, []).append(e)
+            finally:
+                self.__queue.task_done()
+
+    def __end_checkpoint(self, checkpoint: tuple, thread_id: int) -> None:
+        future, deferred = checkpoint
+        try:
+            with self.__lock:
+                errors = self.__errors.pop(thread_id, [])
+                written = self.__written.pop(thread_id, set())
+            future.set_result(([file for file in deferred if file in written], errors[0] if errors else None))
+        finally:
+            self.__queue.task_done()
+
+
+# The output writer of the current process.
+output_writer = OutputWriter()
+
+
+@atexit.register
+def write_pending_output_files() -> bool:
+    """
+    Waits until the output files queued by the current thread have been written, and prints their saved messages, or
+    the error of the first file that couldn't be written. ftcli calls it before exiting, to exit with an error status if
+    a file couldn't be written.
+
+    :return: True if all the files have been written.
+    """
+    return report_output_files(output_writer.checkpoint())
+
+
+def report_output_files(checkpoint: Future, report_error=True) -> bool:
+    """
+    Waits for a checkpoint of the output writer, and prints the deferred saved messages of the files written before it,
+    and the error of the first file that couldn't be written, if any.
+
+    :param checkpoint: a future returned by ``get_output_files_checkpoint()``
+    :param report_error: if False, the error is not printed (for example, because it would follow the error of the
+        function that has queued the files)
+    :return: True if all the files have been written.
+    """
+    saved_files, error = checkpoint.result()
+    for file in saved_files:
+        file_saved_message(file, defer=False)
+    if error is None:
+        return True
+    if report_error:
+        generic_error_message(error)
+    return False
+
+
+def save_font(font, file, **kwargs) -> None:
+    """
+    Compiles a font and queues it to be written by the output writer. Fonts are compiled immediately, so the font can
+    be modified, or saved again, as soon as this function returns.
+
+    :param font: a TTFont object
+    :param file: the output file path, or a writable file object. File objects are written immediately
+    :param kwargs: the keyword arguments of ``TTFont.save()``
+    """
+    with measure("write"):
+        if hasattr(file, "write"):
+            font.save(file, **kwargs)
+            return
+        buffer = BytesIO()
+        font.save(buffer, **kwargs)
+    output_writer.write(file, buffer.getvalue())
+
+
+def write_file(file, data: bytes) -> None:
+    """
+    Queues a file to be written by the output writer.
+
+    :param file: the path to the output file
+    :param data: the content of the file
+    """
+    output_writer.write(file, data)
+
+
+def flush_output_files() -> None:
+    """
+    Waits until the output files queued by the current process have been written. See ``OutputWriter.flush()``.
+    """
+    output_writer.flush()
+
+
+def get_output_files_checkpoint() -> Future:
+    """
+    Returns a future that is done when the output files queued by the current thread have been written. See
+    ``OutputWriter.checkpoint()``.
+    """
+    return output_writer.checkpoint()
+
+
+def defer_saved_message(file) -> bool:
+    """
+    Defers the saved message of a file queued by the current thread. See ``OutputWriter.defer_saved_message()``.
+    """
+    return output_writer.defer_saved_message(file)
+
+
+def set_fsync(enabled: bool) -> None:
+    """
+    Sets whether the output files are flushed to disk before being renamed to their target path. Flushing makes the
+    saved files survive a power failure, but makes saving much slower.
+    """
+    output_writer.fsync = enabled
+
+
+def is_fsync_enabled() -> bool:
+    return output_writer.fsync
+
+
+def write_file_atomically(file, data: bytes, fsync=False) -> None:
+    """
+    Writes a file to a temporary file in the same directory, and then renames it to the target path, so that a crash
+    while writing never leaves a truncated file, and concurrent writers never mix their data.
+
+    :param file: the path to the output file
+    :param data: the content of the file
+    :param fsync: if True, the temporary file is flushed to disk before being renamed, so that the file also survives a
+        power failure
+    """
+    temp_file = get_temp_file_path(file)
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        replace_file(temp_file, file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def get_temp_file_path(file) -> str:
+    """
+    Creates an empty temporary file next to ``file``, with the same permissions if ``file`` exists.
+
+    :param file: the path to the target file
+    :return: The path to the temporary file.
+    """
+    file = os.path.abspath(file)
+    fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(file), prefix=f".{os.path.basename(file)}.", suffix=".tmp")
+    os.close(fd)
+    if os.path.exists(file):
+        shutil.copymode(file, temp_file)
+    else:
+        # mkstemp creates files readable only by the owner, new output files get the default permissions instead
+        os.chmod(temp_file, 0o666 & ~_get_umask())
+    return temp_file
+
+
+def _get_umask() -> int:
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            _umask = os.umask(0)
+            os.umask(_umask)
+    return _umask
+
+
+def replace_file(temp_file, file) -> None:
+    """
+    Renames ``temp_file`` to ``file``, replacing it atomically.
+
+    On Windows, a file that is still open (for example, the source file of a font that is being overwritten) can't be
+    replaced. In that case, the content of ``temp_file`` is copied to ``file``, which is not atomic.
+    """
+    try:
+        os.replace(temp_file, file)
+    except PermissionError:
+        if os.name != "nt":
+            raise
+        shutil.copyfile(temp_file, file)
+        os.remove(temp_file)
@@ -0,0 +1,142 @@
+import _thread
+import contextlib
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Seconds between two checks of the peak RSS of a process with a memory limit.
+RSS_CHECK_INTERVAL = 0.05
+
+# Exit status of a worker process stopped because its peak RSS has exceeded the memory limit.
+MAX_RSS_EXIT_CODE = 75
+
+_PROC_STATUS_FILE = "/proc/self/status"
+_PROC_CLEAR_REFS_FILE = "/proc/self/clear_refs"
+
+
+class MaxRssExceeded(Exception):
+    """
+    Raised in the main thread when the peak RSS of the process has exceeded the memory limit.
+    """
+
+    def __init__(self, peak_rss: int, max_rss: int):
+        super().__init__(f"the memory used by the process has exceeded the limit of {format_size(max_rss)}")
+        self.peak_rss = peak_rss
+        self.max_rss = max_rss
+
+
+def get_peak_rss():
+    """
+    Returns the peak resident set size (RSS) of the current process, in bytes.
+
+    :return: The peak RSS since the process has started, or since the last call to ``reset_peak_rss()``. None if it
+        can't be read on this system.
+    """
+    try:
+        with open(_PROC_STATUS_FILE, "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Sets the peak RSS of the current process to its current RSS. Only supported on Linux.
+
+    :return: True if the peak RSS has been reset.
+    """
+    try:
+        with open(_PROC_CLEAR_REFS_FILE, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+class RssGuard(object):
+    """
+    A thread that checks the peak RSS of the current process every ``RSS_CHECK_INTERVAL`` seconds, and calls
+    ``on_exceeded(peak_rss)`` once, when it exceeds ``max_rss``.
+
+    :param max_rss: the memory limit, in bytes
+    :param on_exceeded: the function called when the limit is exceeded
+    """
+
+    def __init__(self, max_rss: int, on_exceeded):
+        self.max_rss = max_rss
+        self.on_exceeded = on_exceeded
+        self.peak_rss = None
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="ftCLI RSS guard", daemon=True)
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__thread.join()
+
+    @property
+    def is_exceeded(self) -> bool:
+        return self.peak_rss is not None
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(RSS_CHECK_INTERVAL):
+            peak_rss = get_peak_rss()
+            if peak_rss is not None and peak_rss > self.max_rss:
+                self.peak_rss = peak_rss
+                self.on_exceeded(peak_rss)
+                return
+
+
+@contextlib.contextmanager
+def limit_rss(max_rss: int = None):
+    """
+    Interrupts the main thread when the peak RSS of the process exceeds ``max_rss`` while the block is running. Must be
+    used in the main thread.
+
+    :param max_rss: the memory limit, in bytes. If None, the block runs without limit
+    :raises MaxRssExceeded: if the limit has been exceeded
+    """
+    if max_rss is None:
+        yield
+        return
+
+    guard = RssGuard(max_rss, on_exceeded=lambda peak_rss: _thread.interrupt_main())
+    guard.start()
+    try:
+        yield
+    except KeyboardInterrupt:
+        if not guard.is_exceeded:
+            raise
+        raise MaxRssExceeded(guard.peak_rss, max_rss) from None
+    finally:
+        guard.stop()
+
+
+def exit_on_max_rss(max_rss: int = None) -> None:
+    """
+    Starts a guard that exits the current process with status ``MAX_RSS_EXIT_CODE`` as soon as its peak RSS exceeds
+    ``max_rss``. Used by the worker processes that process a single file.
+
+    :param max_rss: the memory limit, in bytes. If None, nothing is done
+    """
+    if max_rss is None:
+        return
+    RssGuard(max_rss, on_exceeded=lambda peak_rss: os._exit(MAX_RSS_EXIT_CODE)).start()
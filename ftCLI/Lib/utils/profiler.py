@@ -0,0 +1,327 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from fontTools.ttLib import TTFont
+from fontTools.misc.textTools import Tag
+
+from ftCLI.Lib.utils.process_memory import get_peak_rss, reset_peak_rss
+
+# Number of decimal places of the times written in the profile reports (microseconds).
+PROFILE_TIME_PRECISION = 6
+
+_local = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+_memory_tracking = False
+
+# Time spent finding each input file, recorded by ``time_discovery`` and read when the file's profile is written
+_discovery_times = {}
+
+
+class FileProfile(object):
+    """
+    The time spent in each stage of the processing of a file:
+
+    - load: opening the font and reading its table directory;
+    - decompile: decompiling each table, by tag;
+    - compile: compiling each table, by tag;
+    - write: assembling the font file (and compressing it, for web fonts) and writing it to disk. Output files are
+      written on a background thread, so this time can overlap with the other stages;
+    - transform: everything else, that is the work done by the command itself.
+
+    Each stage is measured without the nested stages (for example, a table decompiled while compiling another one is
+    not counted as compile time).
+
+    :param track_memory: if True, the peak memory of each stage is measured too (see ``MemoryProfile``)
+    """
+
+    def __init__(self, track_memory=False):
+        self.load = 0.0
+        self.decompile = {}
+        self.transform = 0.0
+        self.compile = {}
+        self.write = 0.0
+        self.total = 0.0
+        self.memory = MemoryProfile() if track_memory else None
+        self.__nested_times = []
+        self.__lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, tag: str = None) -> None:
+        with self.__lock:
+            if tag is None:
+                setattr(self, stage, getattr(self, stage) + seconds)
+            else:
+                times = getattr(self, stage)
+                times[tag] = times.get(tag, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def measure(self, stage: str, tag: str = None):
+        start = time.perf_counter()
+        self.__nested_times.append(0.0)
+        if self.memory is not None:
+            self.memory.start_stage()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested_time = self.__nested_times.pop()
+            if self.__nested_times:
+                self.__nested_times[-1] += elapsed
+            # Stages named "wait" are left out of the profile, and of the time of the stage they're nested in
+            if stage != "wait":
+                self.add(stage, elapsed - nested_time, tag)
+            if self.memory is not None:
+                self.memory.end_stage(stage, tag)
+
+    def to_dict(self) -> dict:
+        def round_time(seconds):
+            return round(seconds, PROFILE_TIME_PRECISION)
+
+        profile = dict(
+            load=round_time(self.load),
+            decompile={tag: round_time(t) for tag, t in self.decompile.items()},
+            transform=round_time(self.transform),
+            compile={tag: round_time(t) for tag, t in self.compile.items()},
+            write=round_time(self.write),
+            total=round_time(self.total),
+        )
+        if self.memory is not None:
+            profile["memory"] = self.memory.to_dict()
+        return profile
+
+
+class MemoryProfile(object):
+    """
+    The peak memory of each stage of the processing of a file (see ``FileProfile``), in bytes:
+
+    - traced: the peak size of the memory blocks allocated by Python, as traced by ``tracemalloc``;
+    - rss: the peak resident set size of the process, that is the memory actually used, including the memory allocated
+      by C extensions and by the interpreter itself.
+
+    Like the times, the peak of each stage is measured without the nested stages, and the peak of a stage run more than
+    once (for example, a table compiled twice) is the highest one. The peak of the whole file is the highest peak of
+    its stages.
+
+    Measuring the peak of each stage requires resetting the peaks when a stage starts or ends, which is only possible
+    with Python 3.9 or later for the traced memory, and on Linux for the RSS. Elsewhere, the stages are left out, and
+    the peak of the file is the peak since the start of the file (traced memory) or since the start of the process
+    (RSS).
+    """
+
+    def __init__(self):
+        self.traced = 0
+        self.rss = 0
+        self.stages = {}
+        self.__can_reset_traced = hasattr(tracemalloc, "reset_peak")
+        self.__can_reset_rss = reset_peak_rss()
+        self.__has_rss = get_peak_rss() is not None
+        self.__open_stages = []
+        if not self.__can_reset_traced:
+            tracemalloc.clear_traces()
+
+    def start_stage(self) -> None:
+        self.__end_period()
+        self.__open_stages.append([0, 0])
+
+    def end_stage(self, stage: str, tag: str = None) -> None:
+        self.__end_period()
+        traced, rss = self.__open_stages.pop()
+        if stage == "wait":
+            return
+        peaks = self.stages.setdefault(stage, {})
+        if tag is not None:
+            peaks = peaks.setdefault(tag, {})
+        if self.__can_reset_traced:
+            peaks["traced"] = max(peaks.get("traced", 0), traced)
+        if self.__can_reset_rss:
+            peaks["rss"] = max(peaks.get("rss", 0), rss)
+
+    def to_dict(self) -> dict:
+        stages = {stage: peaks for stage, peaks in self.stages.items() if peaks}
+        return dict(traced=self.traced, rss=self.rss if self.__has_rss else None, **stages)
+
+    def __end_period(self) -> None:
+        # The peaks since the last stage started or ended belong to the innermost running stage
+        traced = tracemalloc.get_traced_memory()[1]
+        rss = get_peak_rss() or 0
+        self.traced, self.rss = max(self.traced, traced), max(self.rss, rss)
+        if self.__open_stages:
+            peaks = self.__open_stages[-1]
+            peaks[0], peaks[1] = max(peaks[0], traced), max(peaks[1], rss)
+        if self.__can_reset_traced:
+            tracemalloc.reset_peak()
+        if self.__can_reset_rss:
+            reset_peak_rss()
+
+
+class ProfileReport(object):
+    """
+    A JSON lines file where the profile of each processed file is appended. Each line is written and flushed
+    immediately, so that the report of a run that has been interrupted is still complete up to the last file.
+    """
+
+    def __init__(self, report_file, command: str):
+        self.file = report_file
+        self.command = command
+
+    def add(self, file, profile: dict, completed: bool) -> None:
+        """
+        Appends the profile of a file to the report.
+
+        :param file: the path to the input file
+        :param profile: the stages of the file, as returned by ``FileProfile.to_dict()``
+        :param completed: True if the file has been processed without errors
+        """
+        discovery = round(_discovery_times.pop(os.path.abspath(file), 0.0), PROFILE_TIME_PRECISION)
+        entry = dict(
+            file=os.path.abspath(file),
+            command=self.command,
+            completed=completed,
+            time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            discovery=discovery,
+            **profile,
+        )
+        entry["total"] = round(entry["total"] + discovery, PROFILE_TIME_PRECISION)
+        entry.pop("memory", None)
+        with open(self.file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class MemoryReport(object):
+    """
+    A JSON lines file where the peak memory of each processed file is appended, written like a ``ProfileReport``.
+    """
+
+    def __init__(self, report_file, command: str):
+        self.file = report_file
+        self.command = command
+
+    def add(self, file, memory: dict, completed: bool) -> None:
+        """
+        Appends the peak memory of a file to the report.
+
+        :param file: the path to the input file
+        :param memory: the peaks of the file, as returned by ``MemoryProfile.to_dict()``
+        :param completed: True if the file has been processed without errors
+        """
+        entry = dict(
+            file=os.path.abspath(file),
+            command=self.command,
+            completed=completed,
+            time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **memory,
+        )
+        with open(self.file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def enable_profiling(track_memory=False) -> None:
+    """
+    Installs the hooks that measure the load, decompile and compile time of the fonts. The hooks only measure the
+    fonts used inside ``profile_file()``, and cost a single check elsewhere.
+
+    :param track_memory: if True, the peak memory of each stage is measured too, and ``tracemalloc`` is started. Tracing
+        the memory allocations makes the processing much slower
+    """
+    global _hooks_installed, _memory_tracking
+    if track_memory and not _memory_tracking:
+        tracemalloc.start()
+        _memory_tracking = True
+
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+
+        init, read_table, get_table_data = TTFont.__init__, TTFont._readTable, TTFont.getTableData
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            with measure("load"):
+                init(self, *args, **kwargs)
+
+        @functools.wraps(read_table)
+        def _readTable(self, tag):
+            with measure("decompile", tag):
+                return read_table(self, tag)
+
+        @functools.wraps(get_table_data)
+        def getTableData(self, tag):
+            if not self.isLoaded(tag):
+                return get_table_data(self, tag)
+            with measure("compile", Tag(tag)):
+                return get_table_data(self, tag)
+
+        TTFont.__init__, TTFont._readTable, TTFont.getTableData = __init__, _readTable, getTableData
+        _hooks_installed = True
+
+
+def is_profiling_enabled() -> bool:
+    return _hooks_installed
+
+
+def is_memory_tracking_enabled() -> bool:
+    return _memory_tracking
+
+
+def get_current_profile():
+    """
+    Returns the profile of the file being processed by the current thread, or None.
+    """
+    return getattr(_local, "profile", None)
+
+
+@contextlib.contextmanager
+def profile_file():
+    """
+    Measures the processing of a file in the current thread. The time not spent in any other stage is the transform
+    time.
+
+    :return: A context manager yielding the FileProfile object.
+    """
+    profile = FileProfile(track_memory=_memory_tracking)
+    _local.profile = profile
+    start = time.perf_counter()
+    try:
+        with profile.measure("transform"):
+            yield profile
+    finally:
+        profile.total = time.perf_counter() - start
+        _local.profile = None
+
+
+@contextlib.contextmanager
+def measure(stage: str, tag: str = None):
+    """
+    Adds the time spent in the block to a stage of the profile of the current thread, if any.
+
+    :param stage: the stage name (an attribute of FileProfile), or "wait" for time that must not be counted
+    :param tag: the table tag, for the "decompile" and "compile" stages
+    """
+    profile = get_current_profile()
+    if profile is None:
+        yield
+        return
+    with profile.measure(stage, tag):
+        yield
+
+
+def time_discovery(files):
+    """
+    Yields the files found by a directory scan, recording the time spent finding each one.
+
+    :param files: an iterator over the files. Items can also be tuples whose last item is the file
+    """
+    files = iter(files)
+    while True:
+        start = time.perf_counter()
+        file = next(files, None)
+        if file is None:
+            return
+        path = file[-1] if isinstance(file, tuple) else file
+        _discovery_times[os.path.abspath(path)] = time.perf_counter() - start
+        yield file
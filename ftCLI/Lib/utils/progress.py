@@ -0,0 +1,248 @@
+import os
+import sys
+import threading
+import time
+from typing import Iterator
+
+from ftCLI.Lib.utils.click_tools import get_log_options, progress_message
+from ftCLI.Lib.utils.font_header import FontHeader
+from ftCLI.Lib.utils.job_memory import read_num_glyphs
+
+# Seconds between two progress lines, when the progress can't be displayed live.
+PROGRESS_LOG_INTERVAL = 10.0
+
+# Number of times per second the live progress display is refreshed.
+PROGRESS_REFRESH_RATE = 4
+
+
+class ProgressDisplay(object):
+    """
+    Shows the progress of a batch processed by ``process_files``: the number of processed files, the files, glyphs and
+    bytes processed per second, the estimated time remaining, and the files being processed by each worker.
+
+    When the standard output is a terminal and the messages are printed as text, the progress is displayed live under
+    the messages, with ``rich``. Otherwise, a progress line (or a "progress" event, with ``--log-format ndjson``) is
+    printed every ``PROGRESS_LOG_INTERVAL`` seconds. Nothing is printed with ``--quiet``.
+
+    The files can be counted while they are processed (see ``count_files``), so that a lazy scan of the input files is
+    not listed beforehand: the total and the estimated time remaining are shown when the last file has been found.
+
+    :param total_files: the number of files to process, if known
+    """
+
+    def __init__(self, total_files: int = None):
+        self.total_files = total_files
+        self.found_files = 0
+        self.done_files = 0
+        self.done_glyphs = 0
+        self.done_bytes = 0
+        self.running = {}
+        self.start_time = time.monotonic()
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__live = None
+
+    def __enter__(self):
+        log_options = get_log_options()
+        if log_options["quiet"]:
+            return self
+        if log_options["log_format"] == "text" and sys.stdout.isatty():
+            self.__live = _LiveProgress(self)
+            self.__live.start()
+        else:
+            self.__thread = threading.Thread(target=self.__log_progress, name="ftCLI progress", daemon=True)
+            self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        if self.__live is not None:
+            self.__live.stop()
+
+    def count_files(self, files) -> Iterator:
+        """
+        Yields the files, and sets the total number of files when the last one has been found.
+
+        :param files: the files to process, an iterable. Items can also be tuples whose last item is the file to process
+        """
+        for file in files:
+            with self.__lock:
+                self.found_files += 1
+            yield file
+        with self.__lock:
+            self.total_files = self.found_files
+
+    def start(self, file, worker: str = None) -> None:
+        """
+        Records that a file has been assigned to a worker.
+
+        :param file: the file
+        :param worker: the name of the worker, if known
+        """
+        with self.__lock:
+            self.running[_get_path(file)] = (worker, time.monotonic())
+
+    def finish(self, file) -> None:
+        """
+        Records that a file has been processed.
+        """
+        path = _get_path(file)
+        num_glyphs = _get_num_glyphs(path)
+        with self.__lock:
+            self.running.pop(path, None)
+            self.done_files += 1
+            self.done_glyphs += num_glyphs
+            self.done_bytes += _get_file_size(path)
+        if self.__live is not None:
+            self.__live.update()
+
+    def get_stats(self) -> dict:
+        """
+        Returns the progress of the batch: the processed files, the files, glyphs and bytes processed per second, and
+        the estimated seconds remaining (None until the first file is done, or while the total is unknown).
+        """
+        with self.__lock:
+            elapsed = max(time.monotonic() - self.start_time, 1e-6)
+            # The time remaining is estimated from the number of files: with few large files mixed with many small
+            # ones, an estimate based on the bytes or the glyphs is thrown off by the time spent loading each file
+            eta = None
+            if self.done_files and self.total_files is not None:
+                eta = elapsed * (self.total_files - self.done_files) / self.done_files
+            return dict(
+                done_files=self.done_files,
+                total_files=self.total_files,
+                files_per_second=self.done_files / elapsed,
+                glyphs_per_second=self.done_glyphs / elapsed,
+                bytes_per_second=self.done_bytes / elapsed,
+                eta=eta,
+            )
+
+    def get_running_files(self) -> list:
+        """
+        Returns the files being processed, as a list of (file, worker, seconds since the file was assigned).
+        """
+        now = time.monotonic()
+        with self.__lock:
+            return [(file, worker, now - start) for file, (worker, start) in self.running.items()]
+
+    def __log_progress(self) -> None:
+        while not self.__stopped.wait(PROGRESS_LOG_INTERVAL):
+            stats = self.get_stats()
+            running = self.get_running_files()
+            text = _format_stats(stats)
+            if running:
+                text += f", processing {', '.join(_format_running_file(*running_file) for running_file in running)}"
+            progress_message(
+                text,
+                done_files=stats["done_files"],
+                total_files=stats["total_files"],
+                files_per_second=round(stats["files_per_second"], 3),
+                glyphs_per_second=round(stats["glyphs_per_second"], 3),
+                bytes_per_second=round(stats["bytes_per_second"], 3),
+                eta=round(stats["eta"], 3) if stats["eta"] is not None else None,
+                running=[dict(path=os.path.abspath(file), worker=worker) for file, worker, _ in running],
+            )
+
+
+class _LiveProgress(object):
+    # The live display of a ProgressDisplay: a progress bar with the time remaining, a line with the throughput, and a
+    # line for each file being processed
+
+    def __init__(self, display: ProgressDisplay):
+        from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+        from rich.text import Text
+
+        self.display = display
+
+        class _Progress(Progress):
+            def get_renderables(self):
+                yield self.make_tasks_table(self.tasks)
+                for task in self.tasks:
+                    yield Text(task.fields["stats"], style="cyan")
+                yield _get_running_files_table(display.get_running_files())
+
+        self.progress = _Progress(
+            TextColumn("[cyan]Processing"),
+            BarColumn(bar_width=30),
+            MofNCompleteColumn(),
+            TextColumn("ETA {task.fields[eta]}"),
+            refresh_per_second=PROGRESS_REFRESH_RATE,
+            transient=True,
+        )
+        self.task = self.progress.add_task("", total=display.total_files, eta=_format_duration(None), stats="")
+
+    def start(self) -> None:
+        self.progress.start()
+
+    def stop(self) -> None:
+        self.update()
+        self.progress.stop()
+
+    def update(self) -> None:
+        stats = self.display.get_stats()
+        self.progress.update(
+            self.task,
+            total=stats["total_files"],
+            completed=stats["done_files"],
+            eta=_format_duration(stats["eta"]),
+            stats=_format_throughput(stats),
+        )
+
+
+def _get_running_files_table(running: list):
+    from rich.table import Table
+
+    table = Table.grid(padding=(0, 2))
+    for file, worker, elapsed in running:
+        table.add_row(worker or "", os.path.basename(file), f"{elapsed:.0f} s", style="dim")
+    return table
+
+
+def _format_stats(stats: dict) -> str:
+    total_files = stats["total_files"] if stats["total_files"] is not None else "?"
+    return (
+        f"{stats['done_files']}/{total_files} files, {_format_throughput(stats)}, "
+        f"ETA {_format_duration(stats['eta'])}"
+    )
+
+
+def _format_throughput(stats: dict) -> str:
+    return (
+        f"{stats['files_per_second']:.2f} files/s, {stats['glyphs_per_second']:.0f} glyphs/s, "
+        f"{stats['bytes_per_second'] / 1024 ** 2:.2f} MB/s"
+    )
+
+
+def _format_running_file(file, worker: str, elapsed: float) -> str:
+    name = f"{os.path.basename(file)} ({elapsed:.0f} s)"
+    return f"{worker}: {name}" if worker else name
+
+
+def _format_duration(seconds) -> str:
+    if seconds is None:
+        return "--:--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def _get_path(file):
+    return file[-1] if isinstance(file, tuple) else file
+
+
+def _get_file_size(file) -> int:
+    try:
+        return os.path.getsize(file)
+    except OSError:
+        return 0
+
+
+def _get_num_glyphs(file) -> int:
+    try:
+        return read_num_glyphs(FontHeader(file))
+    except Exception:
+        # Font collections and damaged files are counted without glyphs
+        return 0
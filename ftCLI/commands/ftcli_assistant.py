@@ -1,5 +1,5 @@
 import os
-from copy import copy, deepcopy
+from copy import copy
 
 import click
 from fontTools.misc.cliTools import makeOutputFileName
@@ -373,13 +373,8 @@ def commit(
         try:
             font = Font(file, recalcTimestamp=recalcTimestamp)
 
-            name_table_copy = deepcopy(font.name_table)
             os_2_table_copy = copy(font.os_2_table)
             head_table_copy = copy(font.head_table)
-            if not font.is_cff:
-                cff_table_copy = None
-            else:
-                cff_table_copy = deepcopy(font["CFF "])
 
             fonts_data_file.write_data_to_font(
                 font=font,
@@ -406,15 +401,14 @@ def commit(
                 font_has_changed = True
             if font.head_table != head_table_copy:
                 font_has_changed = True
-            if font.name_table.compile(font) != name_table_copy.compile(font):
+            if font.is_table_changed("name"):
+                font_has_changed = True
+            if font.is_table_changed("CFF "):
                 font_has_changed = True
-            if cff_table_copy:
-                if cff_table_copy.compile(font) != font["CFF "].compile(font):
-                    font_has_changed = True
 
             if font_has_changed:
                 output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
+                font.save_tables(output_file, tags=["name", "OS/2", "head", "CFF "])
                 file_saved_message(output_file)
             else:
                 file_not_changed_message(file)
@@ -1,16 +1,10 @@
-from copy import deepcopy
-
 import click
-from fontTools.misc.cliTools import makeOutputFileName
 
-from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_input_path, check_output_dir
+from ftCLI.Lib.utils.cli_tools import check_input_path, check_output_dir, process_files, edit_font_file
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
     generic_error_message,
-    file_saved_message,
-    file_not_changed_message,
 )
 
 
@@ -41,28 +35,37 @@ def del_names(input_path, recalcTimestamp=False, outputDir=None, overWrite=True,
     files = check_input_path(input_path, allow_ttf=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cff_table = font["CFF "]
-            cff_table_copy = deepcopy(cff_table)
-            top_dict = cff_table.cff.topDictIndex[0]
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_del_names,
+        params=params,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            for k in params.keys():
-                try:
-                    del top_dict.rawDict[k]
-                except KeyError:
-                    pass
 
-            if cff_table.compile(font) != cff_table_copy.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+def apply_del_names(font, **kwargs) -> list:
+    """
+    Deletes CFF names from a font.
+
+    :param font: a Font object
+    :param kwargs: the options of the ``del-names`` command, the names whose option is False are not deleted
+    :return: The tags of the modified tables.
+    """
+    cff_table = font["CFF "]
+    top_dict = cff_table.cff.topDictIndex[0]
+
+    for k, v in kwargs.items():
+        if not v:
+            continue
+        try:
+            del top_dict.rawDict[k]
+        except KeyError:
+            pass
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["CFF "])
 
 
 @click.group()
@@ -101,29 +104,37 @@ def set_names(input_path, recalcTimestamp=False, outputDir=None, overWrite=True,
     files = check_input_path(input_path, allow_ttf=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cff_table = font["CFF "]
-            cff_table_copy = deepcopy(cff_table)
-            top_dict = cff_table.cff.topDictIndex[0]
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_set_names,
+        params=params,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_set_names(font, **kwargs) -> list:
+    """
+    Sets CFF names of a font.
 
-            if "fontNames" in params.keys():
-                cff_table.cff.fontNames = [params.get("fontNames")]
-                del params["fontNames"]
+    :param font: a Font object
+    :param kwargs: the options of the ``set-names`` command, options set to None are ignored
+    :return: The tags of the modified tables.
+    """
+    params = {k: v for k, v in kwargs.items() if v is not None}
+    cff_table = font["CFF "]
+    top_dict = cff_table.cff.topDictIndex[0]
 
-            for attr_name, attr_value in params.items():
-                setattr(top_dict, attr_name, attr_value)
+    if "fontNames" in params.keys():
+        cff_table.cff.fontNames = [params.get("fontNames")]
+        del params["fontNames"]
 
-            if cff_table.compile(font) != cff_table_copy.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    for attr_name, attr_value in params.items():
+        setattr(top_dict, attr_name, attr_value)
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["CFF "])
 
 
 @click.group()
@@ -158,41 +169,49 @@ def find_replace(
     files = check_input_path(input_path, allow_ttf=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_find_replace,
+        params={"old_string": old_string, "new_string": new_string},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_find_replace(font, old_string, new_string) -> list:
+    """
+    Finds a string in the CFF names of a font and replaces it with a new string.
+
+    :param font: a Font object
+    :param old_string: the string to be replaced
+    :param new_string: the string to replace the old string with
+    :return: The tags of the modified tables.
+    """
+    cff_table = font["CFF "]
+    cff_font_name = cff_table.cff.fontNames[0]
+    cff_table.cff.fontNames = [cff_font_name.replace(old_string, new_string).replace("  ", " ").strip()]
+
+    top_dict = cff_table.cff.topDictIndex[0]
+    attr_list = [
+        "version",
+        "FullName",
+        "FamilyName",
+        "Weight",
+        "Copyright",
+        "Notice",
+    ]
+
+    for attr_name in attr_list:
         try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cff_table = font["CFF "]
-            cff_table_copy = deepcopy(cff_table)
-            cff_font_name = cff_table.cff.fontNames[0]
-            cff_table.cff.fontNames = [cff_font_name.replace(old_string, new_string).replace("  ", " ").strip()]
-
-            top_dict = cff_table.cff.topDictIndex[0]
-            attr_list = [
-                "version",
-                "FullName",
-                "FamilyName",
-                "Weight",
-                "Copyright",
-                "Notice",
-            ]
-
-            for attr_name in attr_list:
-                try:
-                    old_value = str(getattr(top_dict, attr_name))
-                    new_value = old_value.replace(old_string, new_string).replace("  ", " ").strip()
-                    setattr(top_dict, attr_name, new_value)
-                except AttributeError:
-                    pass
-
-            if cff_table.compile(font) != cff_table_copy.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
-
-        except Exception as e:
-            generic_error_message(e)
+            old_value = str(getattr(top_dict, attr_name))
+            new_value = old_value.replace(old_string, new_string).replace("  ", " ").strip()
+            setattr(top_dict, attr_name, new_value)
+        except AttributeError:
+            pass
+
+    return font.get_changed_tables(["CFF "])
 
 
 @click.group()
@@ -213,21 +232,25 @@ def fix_version(input_path, recalcTimestamp=False, outputDir=None, overWrite=Tru
     files = check_input_path(input_path, allow_ttf=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cff_table = font["CFF "]
-            cff_table_copy = deepcopy(cff_table)
-            font.fix_cff_top_dict_version()
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_fix_version,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_fix_version(font) -> list:
+    """
+    Aligns the CFF topDict version string of a font to the head.fontRevision value.
 
-            if cff_table_copy.compile(font) != cff_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
-        except Exception as e:
-            generic_error_message(e)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    font.fix_cff_top_dict_version()
+    return font.get_changed_tables(["CFF "])
 
 
 cli = click.CommandCollection(
@@ -241,3 +264,12 @@ cli = click.CommandCollection(
 Command line CFF table editor.
 """,
 )
+
+# Functions applying each subcommand to a single font, with the font criteria of the subcommand. Used by `ftcli run` to
+# apply the subcommands as recipe steps.
+FONT_OPERATIONS = {
+    "fix-version": (apply_fix_version, {"allow_ttf": False}),
+    "set-names": (apply_set_names, {"allow_ttf": False}),
+    "del-names": (apply_del_names, {"allow_ttf": False}),
+    "find-replace": (apply_find_replace, {"allow_ttf": False}),
+}
@@ -4,14 +4,27 @@ import time
 import click
 import fontTools.ttLib
 
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
+from ftCLI.Lib.converters.manifest import ConversionManifest, get_manifest_file_path, skip_up_to_date_files
+from ftCLI.Lib.utils.cli_tools import (
+    check_output_dir,
+    check_input_path,
+    get_scan_options,
+    walk_files,
+    process_files,
+    record_files,
+    PROCESSING_OPTIONS,
+)
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
+    add_backend_option,
+    add_incremental_option,
+    blank_line,
     generic_error_message,
     generic_info_message,
     select_instance_coordinates,
 )
+from ftCLI.Lib.utils.journal import get_options_fingerprint
 
 
 @click.group()
@@ -74,6 +87,8 @@ def ttf_to_otf():
               Performs optional outline quality checks and removes overlaps with afdko.checkoutlinesufo
               """,
 )
+@add_incremental_option()
+@add_backend_option()
 @add_common_options()
 def ttf2otf(
     input_path,
@@ -83,6 +98,8 @@ def ttf2otf(
     remove_glyphs=False,
     subroutinize=True,
     check_outlines=False,
+    incremental=False,
+    backend="process",
     outputDir=None,
     recalcTimestamp=False,
     overWrite=True,
@@ -105,6 +122,8 @@ def ttf2otf(
     converter.options.remove_glyphs = remove_glyphs
     converter.options.scale_upm = scale_upm
     converter.options.recalc_timestamp = recalcTimestamp
+    converter.options.incremental = incremental
+    converter.options.backend = backend
     converter.run(files=files)
 
 
@@ -118,8 +137,12 @@ def otf_2_ttf():
 @click.option(
     "--max-err", type=click.FloatRange(0.1, 3.0), default=1.0, help="""Approximation error, measured in UPEM"""
 )
+@add_incremental_option()
+@add_backend_option()
 @add_common_options()
-def otf2ttf(input_path, max_err, outputDir=None, recalcTimestamp=False, overWrite=True):
+def otf2ttf(
+    input_path, max_err, incremental=False, backend="process", outputDir=None, recalcTimestamp=False, overWrite=True
+):
     """
     Converts fonts from OTF to TTF format.
     """
@@ -133,6 +156,8 @@ def otf2ttf(input_path, max_err, outputDir=None, recalcTimestamp=False, overWrit
     converter.options.recalc_timestamp = recalcTimestamp
     converter.options.output_dir = output_dir
     converter.options.overwrite = overWrite
+    converter.options.incremental = incremental
+    converter.options.backend = backend
     converter.run(files=files)
 
 
@@ -152,10 +177,12 @@ def web_to_sfnt():
               OpenType). Use this option to convert only woff or woff2 flavored web fonts.
               """,
 )
+@add_backend_option()
 @add_common_options()
 def wf2ft(
     input_path,
     flavor=None,
+    backend="process",
     outputDir=None,
     recalcTimestamp=False,
     overWrite=True,
@@ -184,6 +211,7 @@ def wf2ft(
     converter.options.recalc_timestamp = recalcTimestamp
     converter.options.output_dir = output_dir
     converter.options.overwrite = overWrite
+    converter.options.backend = backend
     converter.run(files=files)
 
 
@@ -203,8 +231,12 @@ def sfnt_to_web():
               fonts. Use this option to create only woff (--flavor woff) or woff2 (--flavor woff2) files.
               """,
 )
+@add_incremental_option()
+@add_backend_option()
 @add_common_options()
-def ft2wf(input_path, flavor=None, outputDir=None, recalcTimestamp=False, overWrite=True):
+def ft2wf(
+    input_path, flavor=None, incremental=False, backend="process", outputDir=None, recalcTimestamp=False, overWrite=True
+):
     """
     Converts SFNT fonts (TTF or OTF) to web fonts (WOFF and/or WOFF2)
     """
@@ -224,6 +256,8 @@ def ft2wf(input_path, flavor=None, outputDir=None, recalcTimestamp=False, overWr
     converter.options.recalc_timestamp = recalcTimestamp
     converter.options.output_dir = output_dir
     converter.options.overwrite = overWrite
+    converter.options.incremental = incremental
+    converter.options.backend = backend
     converter.run(files=files)
 
 
@@ -234,23 +268,24 @@ def ttc_to_sfnt():
 
 @ttc_to_sfnt.command()
 @add_file_or_path_argument()
+@add_backend_option()
 @add_common_options()
-def ttc2sfnt(input_path, outputDir=None, recalcTimestamp=False, overWrite=True):
+def ttc2sfnt(input_path, backend="process", outputDir=None, recalcTimestamp=False, overWrite=True):
     """
     Extracts each font from a TTC file, and saves it as a TTF or OTF file.
     """
     from fontTools.ttLib import TTCollection
 
-    if os.path.isfile(input_path):
-        files = [input_path]
-    elif os.path.isdir(input_path):
-        files = [os.path.join(input_path, file) for file in os.listdir(input_path)]
-    else:
+    if not os.path.exists(input_path):
         generic_error_message(f"Invalid path: {input_path}")
         return
 
+    scan_options = get_scan_options()
+    for name in PROCESSING_OPTIONS:
+        scan_options.pop(name, None)
+
     ttc_files = []
-    for file in files:
+    for file in walk_files(input_path, **scan_options):
         try:
             ttc_font = TTCollection(file)
             ttc_files.append(file)
@@ -269,6 +304,7 @@ def ttc2sfnt(input_path, outputDir=None, recalcTimestamp=False, overWrite=True):
     converter.options.recalc_timestamp = recalcTimestamp
     converter.options.output_dir = output_dir
     converter.options.overwrite = overWrite
+    converter.options.backend = backend
     converter.run(files=ttc_files)
 
 
@@ -309,12 +345,14 @@ def variable_to_static():
               Tables.
               """,
 )
+@add_incremental_option()
 @add_common_options()
 def var2static(
     input_path,
     select_instance=False,
     cleanup=True,
     update_name_table=True,
+    incremental=False,
     outputDir=None,
     recalcTimestamp=False,
     overWrite=True,
@@ -323,58 +361,95 @@ def var2static(
     Exports static instances from variable fonts.
     """
 
-    from ftCLI.Lib.VFont import VariableFont
-    from ftCLI.Lib.converters.variable_to_static import VariableToStatic
-    from fontTools.ttLib.tables._f_v_a_r import NamedInstance
-
     files = check_input_path(input_path, allow_static=False, allow_cff=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
     start_time = time.time()
-    for file in files:
-        print()
-        generic_info_message(f"Converting file {os.path.basename(file)}")
-        try:
-            variable_font = VariableFont(file, recalcTimestamp=recalcTimestamp)
-
-            converter = VariableToStatic()
-            converter.options.cleanup = cleanup
-            converter.options.update_name_table = update_name_table
-            converter.options.output_dir = output_dir
-            converter.options.overwrite = overWrite
-
-            instances = variable_font.get_instances()
-            if select_instance:
-                axes = variable_font.get_axes()
-                selected_coordinates = select_instance_coordinates(axes)
-                is_named_instance = selected_coordinates in [i.coordinates for i in instances]
-                if not is_named_instance:
-                    # Set update_name_table value to False because we won't find this Axis Value in the STAT table.
-                    converter.options.update_name_table = False
-                    selected_instance = NamedInstance()
-                    selected_instance.coordinates = selected_coordinates
-                else:
-                    # In case there are several instances with the same coordinates, return only the first one.
-                    #
-                    # From https://learn.microsoft.com/en-us/typography/opentype/spec/fvar#instancerecord:
-                    #
-                    # All the instance records in a font should have distinct coordinates and distinct
-                    # subfamilyNameID and postScriptName ID values. If two or more records share the same coordinates,
-                    # the same nameID values or the same postScriptNameID values, then all but the first can be ignored.
-                    selected_instance = [i for i in instances if i.coordinates == selected_coordinates][0]
-
-                instances = [selected_instance]
-
-            converter.run(variable_font=variable_font, instances=instances)
-
-        except Exception as e:
-            generic_error_message(e)
-
-    print()
-    generic_info_message(f"Total files  : {len(files)}")
+
+    # The instance coordinates are selected interactively, so they can't be part of the fingerprint of the conversion
+    manifest = None
+    if incremental and not select_instance:
+        manifest = ConversionManifest(get_manifest_file_path(output_dir))
+        fingerprint = get_options_fingerprint(
+            "var2static",
+            dict(cleanup=cleanup, update_name_table=update_name_table, output_dir=output_dir, overwrite=overWrite),
+        )
+        files = skip_up_to_date_files(files, manifest, fingerprint)
+
+    # Instance coordinates are selected interactively, so files can't be converted by worker processes
+    processed_files = []
+    results = process_files(
+        var2static_file,
+        record_files(files, processed_files),
+        backend="serial" if select_instance else "process",
+        operation="var2static",
+        select_instance=select_instance,
+        cleanup=cleanup,
+        update_name_table=update_name_table,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+    if manifest is not None:
+        for file, output_files in zip(processed_files, results):
+            if output_files is not None:
+                manifest.update(file, fingerprint, output_files)
+        manifest.save()
+
+    blank_line()
+    generic_info_message(f"Total files  : {len(processed_files)}")
     generic_info_message(f"Elapsed time : {round(time.time() - start_time, 3)} seconds")
 
 
+def var2static_file(
+    file,
+    select_instance=False,
+    cleanup=True,
+    update_name_table=True,
+    output_dir=None,
+    recalcTimestamp=False,
+    overWrite=True,
+) -> list:
+    from ftCLI.Lib.VFont import VariableFont
+    from ftCLI.Lib.converters.variable_to_static import VariableToStatic
+    from fontTools.ttLib.tables._f_v_a_r import NamedInstance
+
+    blank_line()
+    generic_info_message(f"Converting file {os.path.basename(file)}")
+    variable_font = VariableFont(file, recalcTimestamp=recalcTimestamp)
+
+    converter = VariableToStatic()
+    converter.options.cleanup = cleanup
+    converter.options.update_name_table = update_name_table
+    converter.options.output_dir = output_dir
+    converter.options.overwrite = overWrite
+
+    instances = variable_font.get_instances()
+    if select_instance:
+        axes = variable_font.get_axes()
+        selected_coordinates = select_instance_coordinates(axes)
+        is_named_instance = selected_coordinates in [i.coordinates for i in instances]
+        if not is_named_instance:
+            # Set update_name_table value to False because we won't find this Axis Value in the STAT table.
+            converter.options.update_name_table = False
+            selected_instance = NamedInstance()
+            selected_instance.coordinates = selected_coordinates
+        else:
+            # In case there are several instances with the same coordinates, return only the first one.
+            #
+            # From https://learn.microsoft.com/en-us/typography/opentype/spec/fvar#instancerecord:
+            #
+            # All the instance records in a font should have distinct coordinates and distinct
+            # subfamilyNameID and postScriptName ID values. If two or more records share the same coordinates,
+            # the same nameID values or the same postScriptNameID values, then all but the first can be ignored.
+            selected_instance = [i for i in instances if i.coordinates == selected_coordinates][0]
+
+        instances = [selected_instance]
+
+    return converter.run(variable_font=variable_font, instances=instances)
+
+
 cli = click.CommandCollection(
     sources=[
         otf_2_ttf,
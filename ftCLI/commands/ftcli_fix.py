@@ -1,22 +1,16 @@
 import os
-from copy import deepcopy
 
 import click
-from afdko.fdkutils import run_shell_command
-from fontTools.misc.cliTools import makeOutputFileName
 
-from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
+from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path, process_files, edit_font_file
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
-    generic_error_message,
-    file_saved_message,
-    file_not_changed_message,
     generic_warning_message,
     generic_success_message,
     generic_info_message,
 )
+from ftCLI.Lib.utils.makeotf import build_makeotf_font
 
 
 @click.group()
@@ -42,49 +36,37 @@ def monospace(input_path, outputDir=None, recalcTimestamp=False, overWrite=True)
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_monospace,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            post_table_copy = deepcopy(font.post_table)
-            os2_table_copy = deepcopy(font.os_2_table)
 
-            font.post_table.set_fixed_pitch(True)
-
-            if font.os_2_table.panose.bProportion != 9:
-                font.os_2_table.panose.bProportion = 9
-                # Ensure that panose.bFamilyType is non-zero when panose.bProportion is 9
-                if font.os_2_table.panose.bFamilyType == 0:
-                    font.os_2_table.panose.bFamilyType = 2
-
-            post_table_changed = False
-            if post_table_copy.compile(font) != font.post_table.compile(font):
-                post_table_changed = True
-
-            os2_table_changed = False
-            if os2_table_copy.compile(font) != font.os_2_table.compile(font):
-                os2_table_changed = True
+def apply_monospace(font) -> list:
+    """
+    Sets the monospace flags of a font.
 
-            cff_table_changed = False
-            if font.is_cff:
-                cff_table = font["CFF "]
-                cff_table_copy = deepcopy(cff_table)
-                top_dict = cff_table.cff.topDictIndex[0]
-                setattr(top_dict, "isFixedPitch", True)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    font.post_table.set_fixed_pitch(True)
 
-                if cff_table_copy.compile(font) != cff_table.compile(font):
-                    cff_table_changed = True
+    if font.os_2_table.panose.bProportion != 9:
+        font.os_2_table.panose.bProportion = 9
+        # Ensure that panose.bFamilyType is non-zero when panose.bProportion is 9
+        if font.os_2_table.panose.bFamilyType == 0:
+            font.os_2_table.panose.bFamilyType = 2
 
-            if post_table_changed or os2_table_changed or cff_table_changed:
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(file)
+    if font.is_cff:
+        cff_table = font["CFF "]
+        top_dict = cff_table.cff.topDictIndex[0]
+        setattr(top_dict, "isFixedPitch", True)
 
-            else:
-                file_not_changed_message(file)
-
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["post", "OS/2", "CFF "])
 
 
 @click.group()
@@ -105,42 +87,33 @@ def os2_ranges(input_path, outputDir=None, recalcTimestamp=False, overWrite=True
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-
-            os_2_table_copy = deepcopy(font.os_2_table)
-
-            temp_t1_file = makeOutputFileName(output_file, outputDir=output_dir, extension=".t1", overWrite=True)
-            command = ["tx", "-t1", file, temp_t1_file]
-            run_shell_command(command, suppress_output=True)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_os2_ranges,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            temp_otf_file = makeOutputFileName(output_file, outputDir=output_dir, suffix="_tmp", overWrite=True)
-            command = ["makeotf", "-f", temp_t1_file, "-o", temp_otf_file]
-            run_shell_command(command, suppress_output=True)
 
-            temp_font = Font(temp_otf_file)
-            unicode_ranges = temp_font.os_2_table.getUnicodeRanges()
-            ul_codepage_range_1 = temp_font.os_2_table.ulCodePageRange1
-            ul_codepage_range_2 = temp_font.os_2_table.ulCodePageRange2
-
-            temp_font.close()
-            os.remove(temp_t1_file)
-            os.remove(temp_otf_file)
+def apply_os2_ranges(font) -> list:
+    """
+    Recalculates the Unicode and codepage ranges of a font with tx and makeotf.
 
-            font.os_2_table.setUnicodeRanges(unicode_ranges)
-            font.os_2_table.ulCodePageRange1 = ul_codepage_range_1
-            font.os_2_table.ulCodePageRange2 = ul_codepage_range_2
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    with build_makeotf_font(font) as temp_font:
+        unicode_ranges = temp_font.os_2_table.getUnicodeRanges()
+        ul_codepage_range_1 = temp_font.os_2_table.ulCodePageRange1
+        ul_codepage_range_2 = temp_font.os_2_table.ulCodePageRange2
 
-            if os_2_table_copy.compile(font) != font.os_2_table.compile(font):
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    font.os_2_table.setUnicodeRanges(unicode_ranges)
+    font.os_2_table.ulCodePageRange1 = ul_codepage_range_1
+    font.os_2_table.ulCodePageRange2 = ul_codepage_range_2
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["OS/2"])
 
 
 @click.group()
@@ -161,27 +134,30 @@ def nbsp_width(input_path, outputDir=None, recalcTimestamp=False, overWrite=True
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            hmtx_table = font["hmtx"]
-            hmtx_table_copy = deepcopy(hmtx_table)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_nbsp_width,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
 
-            best_cmap = font.getBestCmap()
-            space_name = best_cmap[0x0020]
-            nbspace_name = best_cmap[0x00A0]
+def apply_nbsp_width(font) -> list:
+    """
+    Sets the width of the 'nbspace' glyph of a font to the width of the 'space' glyph.
 
-            font["hmtx"][nbspace_name] = font["hmtx"][space_name]
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    best_cmap = font.getBestCmap()
+    space_name = best_cmap[0x0020]
+    nbspace_name = best_cmap[0x00A0]
 
-            if hmtx_table_copy.compile(font) != hmtx_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    font["hmtx"][nbspace_name] = font["hmtx"][space_name]
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["hmtx"])
 
 
 @click.group()
@@ -200,46 +176,39 @@ def caret_offset(input_path, recalcTimestamp=False, outputDir=None, overWrite=Tr
     files = check_input_path(input_path, allow_variable=False, allow_extensions=[".ttf", ".otf"])
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        print()
-        generic_info_message(f"Checking file: {os.path.basename(file)}")
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-
-            offset = font.hhea_table.caretOffset
-
-            temp_t1_file = makeOutputFileName(file, extension=".t1", suffix="_tmp", overWrite=True)
-            temp_otf_file = makeOutputFileName(file, extension=".otf", suffix="_tmp", overWrite=True)
-            run_shell_command(["tx", "-t1", file, temp_t1_file], suppress_output=True)
-            run_shell_command(
-                ["makeotf", "-f", temp_t1_file, "-o", temp_otf_file],
-                suppress_output=True,
-            )
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_caret_offset,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+        show_file_name=True,
+    )
 
-            temp_font = Font(temp_otf_file)
-            calculated_offset = temp_font.hhea_table.caretOffset
 
-            temp_font.close()
-            os.remove(temp_t1_file)
-            os.remove(temp_otf_file)
+def apply_caret_offset(font) -> list:
+    """
+    Recalculates the hhea.caretOffset value of a font with tx and makeotf.
 
-            offset_ok = offset == calculated_offset
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    offset = font.hhea_table.caretOffset
 
-            if offset_ok:
-                generic_success_message(f"hhea.caretOffset: {click.style(offset, fg='green', bold=True)}")
-                file_not_changed_message(os.path.basename(file))
-            else:
-                font.hhea_table.caretOffset = calculated_offset
-                generic_warning_message(
-                    f"hhea.caretOffset: {click.style(offset, fg='red', bold=True)} -> "
-                    f"{click.style(calculated_offset, fg='green', bold=True)}"
-                )
-                font.save(output_file)
-                file_saved_message(os.path.basename(file))
+    with build_makeotf_font(font) as temp_font:
+        calculated_offset = temp_font.hhea_table.caretOffset
+
+    if offset == calculated_offset:
+        generic_success_message(f"hhea.caretOffset: {click.style(offset, fg='green', bold=True)}")
+        return []
 
-        except Exception as e:
-            generic_error_message(e)
+    font.hhea_table.caretOffset = calculated_offset
+    generic_warning_message(
+        f"hhea.caretOffset: {click.style(offset, fg='red', bold=True)} -> "
+        f"{click.style(calculated_offset, fg='green', bold=True)}"
+    )
+    return ["hhea"]
 
 
 @click.group()
@@ -270,121 +239,123 @@ def italic_angle(input_path, mode, recalcTimestamp=False, outputDir=None, overWr
     files = check_input_path(input_path, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        print()
-        generic_info_message(f"Checking file: {os.path.basename(file)}")
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-
-            # Check post.italicAngle
-            post_italic_angle = font.post_table.italicAngle
-            calculated_post_italic_angle = font.calculate_italic_angle()
-            post_italic_angle_ok = font.check_italic_angle()
-            if post_italic_angle_ok:
-                generic_success_message(
-                    f"post.italicAngle    : {click.style(post_italic_angle, fg='green', bold=True)}"
-                )
-            else:
-                font.post_table.set_italic_angle(calculated_post_italic_angle)
-                generic_warning_message(
-                    f"post.italicAngle    : "
-                    f"{click.style(post_italic_angle, fg='red', bold=True)} -> "
-                    f"{click.style(calculated_post_italic_angle, fg='green', bold=True)}"
-                )
-
-            calculated_rise = font.calculate_caret_slope_rise()
-            calculated_run = font.calculate_caret_slope_run()
-
-            # Check hhea italic angle
-            rise = font.hhea_table.caretSlopeRise
-            run = font.hhea_table.caretSlopeRun
-            hhea_italic_angle = font.calculate_run_rise_angle()
-            hhea_italic_angle_ok = abs(font.post_table.italicAngle - hhea_italic_angle) < 0.1
-            if hhea_italic_angle_ok:
-                generic_success_message(f"hhea.caretSlopeRise : {click.style(rise, fg='green', bold=True)}")
-                generic_success_message(f"hhea.caretSlopeRun  : {(click.style(run, fg='green', bold=True))}")
-            else:
-                font.hhea_table.caretSlopeRise = calculated_rise
-                generic_warning_message(
-                    f"hhea.caretSlopeRise : {click.style(rise, fg='red', bold=True)} -> "
-                    f"{click.style(calculated_rise, fg='green', bold=True)}"
-                )
-                font.hhea_table.caretSlopeRun = calculated_run
-                generic_warning_message(
-                    f"hhea.caretSlopeRun  : {click.style(run, fg='red', bold=True)} -> "
-                    f"{click.style(calculated_run, fg='green', bold=True)}"
-                )
-
-            # Check CFF italic angle
-            if font.is_cff:
-                cff_table = font["CFF "]
-                cff_italic_angle = cff_table.cff.topDictIndex[0].ItalicAngle
-                cff_italic_angle_ok = cff_italic_angle == round(font.post_table.italicAngle)
-
-                if cff_italic_angle_ok:
-                    generic_success_message(
-                        f"CFF.ItalicAngle     : " f"{click.style(cff_italic_angle, fg='green', bold=True)}"
-                    )
-                else:
-                    cff_table.cff.topDictIndex[0].ItalicAngle = round(font.post_table.italicAngle)
-                    generic_warning_message(
-                        f"CFF.ItalicAngle     : "
-                        f"{click.style(cff_italic_angle, fg='red', bold=True)} -> "
-                        f"{click.style(cff_table.cff.topDictIndex[0].ItalicAngle, fg='green', bold=True)}"
-                    )
-            else:
-                cff_italic_angle_ok = True
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_italic_angle,
+        params={"mode": mode},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+        show_file_name=True,
+    )
 
-            # Set or clear italic/oblique bits according to post.italicAngle
-            is_italic = font.is_italic
-            is_oblique = font.is_oblique
-            font.calculate_italic_bits(mode=mode)
 
-            if font.is_italic == is_italic:
-                italic_bits_ok = True
-            else:
-                italic_bits_ok = False
-
-            if font.is_oblique == is_oblique:
-                oblique_bit_ok = True
-            else:
-                oblique_bit_ok = False
+def apply_italic_angle(font, mode=1) -> list:
+    """
+    Recalculates the italic angle values of a font and sets or clears the italic/oblique bits accordingly.
 
-            if italic_bits_ok:
-                generic_success_message(f"Italic              : " f"{click.style(is_italic, fg='green', bold=True)}")
-            else:
-                generic_info_message(
-                    f"Italic              : "
-                    f"{click.style(is_italic, fg='red', bold=True)} -> "
-                    f"{click.style(font.is_italic, fg='green', bold=True)}"
-                )
-
-            if oblique_bit_ok:
-                generic_success_message(f"Oblique             : " f"{click.style(is_oblique, fg='green', bold=True)}")
-            else:
-                generic_info_message(
-                    f"Oblique             : "
-                    f"{click.style(is_oblique, fg='red', bold=True)} -> "
-                    f"{click.style(font.is_oblique, fg='green', bold=True)}"
-                )
-
-            # Don't save the file if nothing has been modified
-            if (
-                post_italic_angle_ok
-                and hhea_italic_angle_ok
-                and cff_italic_angle_ok
-                and italic_bits_ok
-                and oblique_bit_ok
-            ):
-                file_not_changed_message(file)
-                continue
-
-            font.save(output_file)
-            file_saved_message(output_file)
-
-        except Exception as e:
-            generic_error_message(e)
+    :param font: a Font object
+    :param mode: see the ``--mode`` option of the ``italic-angle`` command
+    :return: The tags of the modified tables.
+    """
+    # Check post.italicAngle
+    post_italic_angle = font.post_table.italicAngle
+    calculated_post_italic_angle = font.calculate_italic_angle()
+    post_italic_angle_ok = font.check_italic_angle()
+    if post_italic_angle_ok:
+        generic_success_message(
+            f"post.italicAngle    : {click.style(post_italic_angle, fg='green', bold=True)}"
+        )
+    else:
+        font.post_table.set_italic_angle(calculated_post_italic_angle)
+        generic_warning_message(
+            f"post.italicAngle    : "
+            f"{click.style(post_italic_angle, fg='red', bold=True)} -> "
+            f"{click.style(calculated_post_italic_angle, fg='green', bold=True)}"
+        )
+
+    calculated_rise = font.calculate_caret_slope_rise()
+    calculated_run = font.calculate_caret_slope_run()
+
+    # Check hhea italic angle
+    rise = font.hhea_table.caretSlopeRise
+    run = font.hhea_table.caretSlopeRun
+    hhea_italic_angle = font.calculate_run_rise_angle()
+    hhea_italic_angle_ok = abs(font.post_table.italicAngle - hhea_italic_angle) < 0.1
+    if hhea_italic_angle_ok:
+        generic_success_message(f"hhea.caretSlopeRise : {click.style(rise, fg='green', bold=True)}")
+        generic_success_message(f"hhea.caretSlopeRun  : {(click.style(run, fg='green', bold=True))}")
+    else:
+        font.hhea_table.caretSlopeRise = calculated_rise
+        generic_warning_message(
+            f"hhea.caretSlopeRise : {click.style(rise, fg='red', bold=True)} -> "
+            f"{click.style(calculated_rise, fg='green', bold=True)}"
+        )
+        font.hhea_table.caretSlopeRun = calculated_run
+        generic_warning_message(
+            f"hhea.caretSlopeRun  : {click.style(run, fg='red', bold=True)} -> "
+            f"{click.style(calculated_run, fg='green', bold=True)}"
+        )
+
+    # Check CFF italic angle
+    if font.is_cff:
+        cff_table = font["CFF "]
+        cff_italic_angle = cff_table.cff.topDictIndex[0].ItalicAngle
+        cff_italic_angle_ok = cff_italic_angle == round(font.post_table.italicAngle)
+
+        if cff_italic_angle_ok:
+            generic_success_message(
+                f"CFF.ItalicAngle     : " f"{click.style(cff_italic_angle, fg='green', bold=True)}"
+            )
+        else:
+            cff_table.cff.topDictIndex[0].ItalicAngle = round(font.post_table.italicAngle)
+            generic_warning_message(
+                f"CFF.ItalicAngle     : "
+                f"{click.style(cff_italic_angle, fg='red', bold=True)} -> "
+                f"{click.style(cff_table.cff.topDictIndex[0].ItalicAngle, fg='green', bold=True)}"
+            )
+    else:
+        cff_italic_angle_ok = True
+
+    # Set or clear italic/oblique bits according to post.italicAngle
+    is_italic = font.is_italic
+    is_oblique = font.is_oblique
+    font.calculate_italic_bits(mode=mode)
+
+    if font.is_italic == is_italic:
+        italic_bits_ok = True
+    else:
+        italic_bits_ok = False
+
+    if font.is_oblique == is_oblique:
+        oblique_bit_ok = True
+    else:
+        oblique_bit_ok = False
+
+    if italic_bits_ok:
+        generic_success_message(f"Italic              : " f"{click.style(is_italic, fg='green', bold=True)}")
+    else:
+        generic_info_message(
+            f"Italic              : "
+            f"{click.style(is_italic, fg='red', bold=True)} -> "
+            f"{click.style(font.is_italic, fg='green', bold=True)}"
+        )
+
+    if oblique_bit_ok:
+        generic_success_message(f"Oblique             : " f"{click.style(is_oblique, fg='green', bold=True)}")
+    else:
+        generic_info_message(
+            f"Oblique             : "
+            f"{click.style(is_oblique, fg='red', bold=True)} -> "
+            f"{click.style(font.is_oblique, fg='green', bold=True)}"
+        )
+
+    # Don't save the file if nothing has been modified
+    if post_italic_angle_ok and hhea_italic_angle_ok and cff_italic_angle_ok and italic_bits_ok and oblique_bit_ok:
+        return []
+
+    return ["post", "hhea", "OS/2", "head", "CFF "]
 
 
 @click.group()
@@ -403,27 +374,32 @@ def nbsp_missing(input_path, recalcTimestamp=False, outputDir=None, overWrite=Tr
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_nbsp_missing,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            cmap_table = font["cmap"]
-            cmap_table_copy = deepcopy(cmap_table)
 
-            for t in cmap_table.tables:
-                if t.isUnicode():
-                    if 0xA0 not in t.cmap.keys():
-                        t.cmap[0xA0] = "space"
+def apply_nbsp_missing(font) -> list:
+    """
+    Maps the non-breaking space character to the 'space' glyph in the Unicode cmap subtables of a font where it's
+    missing.
 
-            if cmap_table_copy.compile(font) != cmap_table.compile(font):
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    cmap_table = font["cmap"]
+
+    for t in cmap_table.tables:
+        if t.isUnicode():
+            if 0xA0 not in t.cmap.keys():
+                t.cmap[0xA0] = "space"
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["cmap"])
 
 
 @click.group()
@@ -441,63 +417,67 @@ def decompose_transformed(input_path, recalcTimestamp=False, outputDir=None, ove
     fontbakery check id: com.google.fonts/check/transformed_components
     """
 
+    files = check_input_path(input_path, allow_cff=False, allow_variable=False)
+    output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
+
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_decompose_transformed,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_decompose_transformed(font) -> list:
+    """
+    Decomposes the composite glyphs of a font that have transformed components.
+
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
     from fontTools.pens.recordingPen import DecomposingRecordingPen
     from fontTools.pens.ttGlyphPen import TTGlyphPen
     import pathops
 
-    files = check_input_path(input_path, allow_cff=False, allow_variable=False)
-    output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
-
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-
-            glyph_set = font.getGlyphSet()
-            glyph_table = font["glyf"]
-            glyph_table_copy = deepcopy(glyph_table)
-
-            for glyph_name in glyph_set.keys():
-                decompose = False
-                glyf = glyph_table[glyph_name]
-                if not glyf.isComposite():
-                    continue
-                for component in glyf.components:
-                    _, transform = component.getComponentInfo()
-
-                    # Font is hinted, decompose glyphs with *any* transformations
-                    if font.is_hinted_ttf:
-                        if transform[0:4] != (1, 0, 0, 1):
-                            decompose = True
-                    # Font is unhinted, decompose only glyphs with transformations where only one dimension is flipped
-                    # while the other isn't. Otherwise the outline direction is intact and since the font is unhinted,
-                    # no rendering problems are to be expected
-                    else:
-                        if transform[0] * transform[3] < 0:
-                            decompose = True
-
-                if decompose:
-                    dc_pen = DecomposingRecordingPen(glyph_set)
-                    glyph_set[glyph_name].draw(dc_pen)
-
-                    path = pathops.Path()
-                    path_pen = path.getPen()
-                    dc_pen.replay(path_pen)
-
-                    path.simplify()
-
-                    ttPen = TTGlyphPen(None)
-                    path.draw(ttPen)
-                    glyph_table[glyph_name] = ttPen.glyph()
-
-            if glyph_table_copy.compile(font) != glyph_table.compile(font):
-                font.save(output_file)
-                file_saved_message(output_file)
+    glyph_set = font.getGlyphSet()
+    glyph_table = font["glyf"]
+
+    for glyph_name in glyph_set.keys():
+        decompose = False
+        glyf = glyph_table[glyph_name]
+        if not glyf.isComposite():
+            continue
+        for component in glyf.components:
+            _, transform = component.getComponentInfo()
+
+            # Font is hinted, decompose glyphs with *any* transformations
+            if font.is_hinted_ttf:
+                if transform[0:4] != (1, 0, 0, 1):
+                    decompose = True
+            # Font is unhinted, decompose only glyphs with transformations where only one dimension is flipped
+            # while the other isn't. Otherwise the outline direction is intact and since the font is unhinted,
+            # no rendering problems are to be expected
             else:
-                file_not_changed_message(file)
+                if transform[0] * transform[3] < 0:
+                    decompose = True
+
+        if decompose:
+            dc_pen = DecomposingRecordingPen(glyph_set)
+            glyph_set[glyph_name].draw(dc_pen)
 
-        except Exception as e:
-            generic_error_message(e)
+            path = pathops.Path()
+            path_pen = path.getPen()
+            dc_pen.replay(path_pen)
+
+            path.simplify()
+
+            ttPen = TTGlyphPen(None)
+            path.draw(ttPen)
+            glyph_table[glyph_name] = ttPen.glyph()
+
+    return font.get_changed_tables(["glyf"])
 
 
 @click.group()
@@ -518,41 +498,43 @@ def duplicate_components(input_path, recalcTimestamp=False, outputDir=None, over
     files = check_input_path(input_path, allow_cff=False, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-
-            glyph_table = font["glyf"]
-            glyph_table_copy = deepcopy(glyph_table)
-
-            for glyph_name in glyph_table.keys():
-                glyf = glyph_table[glyph_name]
-                if not glyf.isComposite():
-                    continue
-
-                seen = []
-
-                for comp in glyf.components:
-                    comp_info = {
-                        "glyph": glyph_name,
-                        "component": comp.glyphName,
-                        "x": comp.x,
-                        "y": comp.y,
-                    }
-                    if comp_info in seen:
-                        glyf.components.remove(comp)
-                    else:
-                        seen.append(comp_info)
-
-            if glyph_table_copy.compile(font) != glyph_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_duplicate_components,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
 
-        except Exception as e:
-            generic_error_message(e)
+def apply_duplicate_components(font) -> list:
+    """
+    Removes the duplicate components of the composite glyphs of a font.
+
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    glyph_table = font["glyf"]
+
+    for glyph_name in glyph_table.keys():
+        glyf = glyph_table[glyph_name]
+        if not glyf.isComposite():
+            continue
+
+        seen = set()
+        components = []
+
+        for comp in glyf.components:
+            comp_info = (comp.glyphName, comp.x, comp.y)
+            if comp_info not in seen:
+                seen.add(comp_info)
+                components.append(comp)
+
+        if len(components) < len(glyf.components):
+            glyf.components = components
+
+    return font.get_changed_tables(["glyf"])
 
 
 @click.group()
@@ -576,43 +558,48 @@ def kern_table(input_path, recalcTimestamp=False, outputDir=None, overWrite=True
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            if "kern" not in font:
-                continue
-
-            kern = font["kern"]
-
-            if all(kernTable.format != 0 for kernTable in kern.kernTables):
-                generic_warning_message(f"{os.path.basename(file)} The 'kern' table doesn't have any format-0 subtable")
-                continue
-
-            kern_table_copy = deepcopy(kern)
-
-            character_glyphs = set()
-            for table in font["cmap"].tables:
-                character_glyphs.update(table.cmap.values())
-
-            for table in kern.kernTables:
-                if table.format == 0:
-                    pairs_to_delete = []
-                    for left_glyph, right_glyph in table.kernTable.keys():
-                        if left_glyph not in character_glyphs or right_glyph not in character_glyphs:
-                            pairs_to_delete.append((left_glyph, right_glyph))
-                    if len(pairs_to_delete) > 0:
-                        for pair in pairs_to_delete:
-                            del table.kernTable[pair]
-
-            if kern_table_copy.compile(font) != kern.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_kern_table,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+
+def apply_kern_table(font) -> list:
+    """
+    Deletes the kerning pairs of the format 0 kern subtables of a font where one of the two glyphs is not in the cmap
+    table.
+
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    if "kern" not in font:
+        return []
+
+    kern = font["kern"]
+
+    if all(kernTable.format != 0 for kernTable in kern.kernTables):
+        generic_warning_message(f"{os.path.basename(font.file)} The 'kern' table doesn't have any format-0 subtable")
+        return []
+
+    character_glyphs = set()
+    for table in font["cmap"].tables:
+        character_glyphs.update(table.cmap.values())
+
+    for table in kern.kernTables:
+        if table.format == 0:
+            pairs_to_delete = []
+            for left_glyph, right_glyph in table.kernTable.keys():
+                if left_glyph not in character_glyphs or right_glyph not in character_glyphs:
+                    pairs_to_delete.append((left_glyph, right_glyph))
+            if len(pairs_to_delete) > 0:
+                for pair in pairs_to_delete:
+                    del table.kernTable[pair]
+
+    return font.get_changed_tables(["kern"])
 
 
 @click.group()
@@ -632,24 +619,25 @@ def strip_names(input_path, recalcTimestamp=False, outputDir=None, overWrite=Tru
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-
-            name_table_copy = deepcopy(font.name_table)
-
-            font.name_table.remove_leading_trailing_spaces()
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_strip_names,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            if name_table_copy.compile(font) != font.name_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
 
-            else:
-                file_not_changed_message(file)
+def apply_strip_names(font) -> list:
+    """
+    Removes leading and trailing spaces from all the namerecords of a font.
 
-        except Exception as e:
-            generic_error_message(e)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    font.name_table.remove_leading_trailing_spaces()
+    return font.get_changed_tables(["name"])
 
 
 @click.group()
@@ -678,46 +666,36 @@ def uprights(input_path, recalcTimestamp=False, outputDir=None, overWrite=True):
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            post_table_copy = deepcopy(font.post_table)
-            hhea_table = font.hhea_table
-            hhea_table_copy = deepcopy(hhea_table)
-
-            font_has_changed = False
-
-            if not font.is_italic:
-                font.post_table.set_italic_angle(0)
-                if font.is_cff:
-                    cff_table = font["CFF "]
-                    cff_table_copy = deepcopy(font["CFF "])
-                    font["CFF "].cff.topDictIndex[0].ItalicAngle = 0
-                else:
-                    cff_table = None
-                    cff_table_copy = None
-
-                hhea_table.caretSlopeRise = 1
-                hhea_table.caretSlopeRun = 0
-                hhea_table.caretOffset = 0
-
-                if cff_table and cff_table_copy:
-                    if cff_table_copy.compile(font) != cff_table.compile(font):
-                        font_has_changed = True
-                if post_table_copy.compile(font) != font.post_table.compile(font):
-                    font_has_changed = True
-                if hhea_table_copy.compile(font) != hhea_table.compile(font):
-                    font_has_changed = True
-
-            if font_has_changed:
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_uprights,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_uprights(font) -> list:
+    """
+    Sets the italic angle values of an upright font to zero.
 
-        except Exception as e:
-            generic_error_message(e)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    if font.is_italic:
+        return []
+
+    hhea_table = font.hhea_table
+    font.post_table.set_italic_angle(0)
+    if font.is_cff:
+        font["CFF "].cff.topDictIndex[0].ItalicAngle = 0
+
+    hhea_table.caretSlopeRise = 1
+    hhea_table.caretSlopeRun = 0
+    hhea_table.caretOffset = 0
+
+    return font.get_changed_tables(["post", "hhea", "CFF "])
 
 
 cli = click.CommandCollection(
@@ -738,3 +716,19 @@ cli = click.CommandCollection(
     A set of commands to detect and automatically fix font errors.
     """,
 )
+
+# Functions applying each subcommand to a single font, with the font criteria of the subcommand. Used by `ftcli run` to
+# apply the subcommands as recipe steps.
+FONT_OPERATIONS = {
+    "monospace": (apply_monospace, {}),
+    "os2-ranges": (apply_os2_ranges, {}),
+    "nbsp-width": (apply_nbsp_width, {}),
+    "caret-offset": (apply_caret_offset, {"allow_variable": False, "allow_extensions": [".ttf", ".otf"]}),
+    "italic-angle": (apply_italic_angle, {"allow_variable": False}),
+    "nbsp-missing": (apply_nbsp_missing, {}),
+    "decompose-transformed": (apply_decompose_transformed, {"allow_cff": False, "allow_variable": False}),
+    "duplicate-components": (apply_duplicate_components, {"allow_cff": False, "allow_variable": False}),
+    "kern-table": (apply_kern_table, {}),
+    "strip-names": (apply_strip_names, {}),
+    "uprights": (apply_uprights, {}),
+}
@@ -1,17 +1,9 @@
 from copy import copy
 
 import click
-from fontTools.misc.cliTools import makeOutputFileName
-
-from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
-from ftCLI.Lib.utils.click_tools import (
-    add_file_or_path_argument,
-    add_common_options,
-    file_saved_message,
-    file_not_changed_message,
-    generic_error_message,
-)
+
+from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path, process_files, edit_font_file
+from ftCLI.Lib.utils.click_tools import add_file_or_path_argument, add_common_options, generic_error_message
 
 
 @click.command()
@@ -71,35 +63,48 @@ def cli(input_path, recalcTimestamp, outputDir, overWrite, **kwargs):
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            hhea_table_copy = copy(font.hhea_table)
-
-            if "rise" in params.keys():
-                font.hhea_table.set_caret_slope_rise(params.get("rise"))
+    # All the options change fixed-size fields, so fonts are patched in place when possible
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_hhea,
+        params=params,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+        patch_in_place=True,
+    )
+
+
+def apply_hhea(font, **kwargs) -> list:
+    """
+    Applies the hhea table editor options to a font.
+
+    :param font: a Font or FontPatcher object
+    :param kwargs: the options of the ``hhea`` command, options set to None are ignored
+    :return: The tags of the modified tables.
+    """
+    params = {k: v for k, v in kwargs.items() if v is not None}
+    hhea_table_copy = copy(font.hhea_table)
 
-            if "run" in params.keys():
-                font.hhea_table.set_caret_slope_run(params.get("run"))
+    if "rise" in params.keys():
+        font.hhea_table.set_caret_slope_rise(params.get("rise"))
 
-            if "offset" in params.keys():
-                font.hhea_table.set_caret_offset(params.get("offset"))
+    if "run" in params.keys():
+        font.hhea_table.set_caret_slope_run(params.get("run"))
 
-            if "ascent" in params.keys():
-                font.hhea_table.set_ascent(params.get("ascent"))
+    if "offset" in params.keys():
+        font.hhea_table.set_caret_offset(params.get("offset"))
 
-            if "descent" in params.keys():
-                font.hhea_table.set_descent(params.get("descent"))
+    if "ascent" in params.keys():
+        font.hhea_table.set_ascent(params.get("ascent"))
 
-            if "linegap" in params.keys():
-                font.hhea_table.set_linegap(params.get("linegap"))
+    if "descent" in params.keys():
+        font.hhea_table.set_descent(params.get("descent"))
 
-            if font.hhea_table != hhea_table_copy:
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    if "linegap" in params.keys():
+        font.hhea_table.set_linegap(params.get("linegap"))
 
-        except Exception as e:
-            generic_error_message(e)
+    if font.hhea_table != hhea_table_copy:
+        return ["hhea"]
+    return []
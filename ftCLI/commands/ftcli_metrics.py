@@ -5,7 +5,7 @@ import click
 from fontTools.misc.cliTools import makeOutputFileName
 
 from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
+from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path, process_files, edit_font_file
 from ftCLI.Lib.utils.click_tools import (
     add_common_options,
     file_saved_message,
@@ -39,27 +39,32 @@ def set_linegap(input_path, percent, outputDir=None, recalcTimestamp=False, over
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_linegap_percent,
+        params={"percent": percent},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            hhea_table_copy = copy(font.hhea_table)
-            os2_table_copy = copy(font.os_2_table)
 
-            font.modify_linegap_percent(percent=percent)
+def apply_linegap_percent(font, percent: int) -> list:
+    """
+    Modifies the line spacing metrics of a font. See the ``set-linegap`` command for the parameters.
 
-            hhea_modified = hhea_table_copy != font.hhea_table
-            os2_modified = os2_table_copy != font.os_2_table
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    hhea_table_copy = copy(font.hhea_table)
+    os2_table_copy = copy(font.os_2_table)
 
-            if hhea_modified or os2_modified:
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(file)
-            else:
-                file_not_changed_message(file)
+    font.modify_linegap_percent(percent=percent)
 
-        except Exception as e:
-            generic_error_message(e)
+    if hhea_table_copy != font.hhea_table or os2_table_copy != font.os_2_table:
+        return ["hhea", "OS/2"]
+    return []
 
 
 @click.group()
@@ -163,8 +168,8 @@ def align(input_path, with_linegap=False, outputDir=None, recalcTimestamp=False,
 
             if hhea_modified or os2_modified:
                 output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(font.file)
+                font.save_tables(output_file, tags=["hhea", "OS/2"])
+                file_saved_message(output_file)
 
             else:
                 file_not_changed_message(font.file)
@@ -233,48 +238,59 @@ def copy_metrics(source_file, destination, outputDir=None, recalcTimestamp=False
     try:
         source_font = Font(source_file)
 
-        ascender = source_font.hhea_table.ascender
-        descender = source_font.hhea_table.descender
-        lineGap = source_font.hhea_table.lineGap
-
-        usWinAscent = source_font.os_2_table.usWinAscent
-        usWinDescent = source_font.os_2_table.usWinDescent
-        sTypoAscender = source_font.os_2_table.sTypoAscender
-        sTypoDescender = source_font.os_2_table.sTypoDescender
-        sTypoLineGap = source_font.os_2_table.sTypoLineGap
+        metrics = dict(
+            ascender=source_font.hhea_table.ascender,
+            descender=source_font.hhea_table.descender,
+            lineGap=source_font.hhea_table.lineGap,
+            usWinAscent=source_font.os_2_table.usWinAscent,
+            usWinDescent=source_font.os_2_table.usWinDescent,
+            sTypoAscender=source_font.os_2_table.sTypoAscender,
+            sTypoDescender=source_font.os_2_table.sTypoDescender,
+            sTypoLineGap=source_font.os_2_table.sTypoLineGap,
+        )
 
     except Exception as e:
-        click.secho("ERROR: {}".format(e), fg="red")
+        generic_error_message(e)
         sys.exit()
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            hhea_table_copy = copy(font.hhea_table)
-            os2_table_copy = copy(font.os_2_table)
-
-            font.hhea_table.ascender = ascender
-            font.hhea_table.descender = descender
-            font.hhea_table.lineGap = lineGap
-
-            font.os_2_table.usWinAscent = usWinAscent
-            font.os_2_table.usWinDescent = usWinDescent
-            font.os_2_table.sTypoAscender = sTypoAscender
-            font.os_2_table.sTypoDescender = sTypoDescender
-            font.os_2_table.sTypoLineGap = sTypoLineGap
-
-            hhea_modified = hhea_table_copy != font.hhea_table
-            os2_modified = os2_table_copy != font.os_2_table
-
-            if hhea_modified or os2_modified:
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    # Vertical metrics are fixed-size fields, so fonts are patched in place when possible
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_vertical_metrics,
+        params=metrics,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+        patch_in_place=True,
+    )
+
+
+def apply_vertical_metrics(
+    font, ascender, descender, lineGap, usWinAscent, usWinDescent, sTypoAscender, sTypoDescender, sTypoLineGap
+) -> list:
+    """
+    Sets the vertical metrics of a font.
 
-        except Exception as e:
-            generic_error_message(e)
+    :param font: a Font or FontPatcher object
+    :return: The tags of the modified tables.
+    """
+    hhea_table_copy = copy(font.hhea_table)
+    os2_table_copy = copy(font.os_2_table)
+
+    font.hhea_table.ascender = ascender
+    font.hhea_table.descender = descender
+    font.hhea_table.lineGap = lineGap
+
+    font.os_2_table.usWinAscent = usWinAscent
+    font.os_2_table.usWinDescent = usWinDescent
+    font.os_2_table.sTypoAscender = sTypoAscender
+    font.os_2_table.sTypoDescender = sTypoDescender
+    font.os_2_table.sTypoLineGap = sTypoLineGap
+
+    if hhea_table_copy != font.hhea_table or os2_table_copy != font.os_2_table:
+        return ["hhea", "OS/2"]
+    return []
 
 
 cli = click.CommandCollection(
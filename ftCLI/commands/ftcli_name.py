@@ -1,16 +1,10 @@
-from copy import deepcopy
-
 import click
-from fontTools.misc.cliTools import makeOutputFileName
 
 from ftCLI.Lib import constants
-from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_input_path, check_output_dir
+from ftCLI.Lib.utils.cli_tools import check_input_path, check_output_dir, process_files, edit_font_file
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
-    file_saved_message,
-    file_not_changed_message,
     generic_error_message,
 )
 
@@ -77,35 +71,37 @@ def set_name(
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    # platform_id must be converted to integer because click.Choice() doesn't accept integers (only strings)
-    if platform_id is not None:
-        platform_id = int(platform_id)
-
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_set_name,
+        params={"name_id": name_id, "platform_id": platform_id, "language_string": language_string, "string": string},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-            name_table_copy = deepcopy(font.name_table)
 
-            font.name_table.add_name(
-                string=string,
-                font=font,
-                name_id=name_id,
-                platform_id=platform_id,
-                language_string=language_string,
-            )
+def apply_set_name(font, name_id, platform_id, language_string, string) -> list:
+    """
+    Adds a namerecord to a font. See the ``set-name`` command for the parameters.
 
-            # The copied, and the current `name` tables must be compiled to reorder namerecords before comparison.
-            if font.name_table.compile(font) != name_table_copy.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    # platform_id must be converted to integer because click.Choice() doesn't accept integers (only strings)
+    if platform_id is not None:
+        platform_id = int(platform_id)
 
-            else:
-                file_not_changed_message(file)
+    font.name_table.add_name(
+        string=string,
+        font=font,
+        name_id=name_id,
+        platform_id=platform_id,
+        language_string=language_string,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["name"])
 
 
 @click.group()
@@ -136,29 +132,35 @@ def del_mac_names(input_path, del_all=False, recalcTimestamp=False, outputDir=No
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            name_table_copy = deepcopy(font.name_table)
-            name_ids = set(name.nameID for name in font.name_table.names if name.platformID == 1)
-            if not del_all:
-                for n in (1, 2, 4, 5, 6):
-                    try:
-                        name_ids.remove(n)
-                    except KeyError:
-                        pass
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_del_mac_names,
+        params={"del_all": del_all},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_del_mac_names(font, del_all=False) -> list:
+    """
+    Deletes the Macintosh namerecords of a font. See the ``del-mac-names`` command for the parameters.
 
-            font.name_table.del_names(name_ids=name_ids, platform_id=1)
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    name_ids = set(name.nameID for name in font.name_table.names if name.platformID == 1)
+    if not del_all:
+        for n in (1, 2, 4, 5, 6):
+            try:
+                name_ids.remove(n)
+            except KeyError:
+                pass
 
-            if name_table_copy.compile(font) != font.name_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    font.name_table.del_names(name_ids=name_ids, platform_id=1)
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["name"])
 
 
 @click.group()
@@ -226,30 +228,34 @@ def del_names(
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    if platform_id is not None:
-        platform_id = int(platform_id)
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_del_names,
+        params={"name_ids": name_ids, "platform_id": platform_id, "language_string": language_string},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
 
-            name_table_copy = deepcopy(font.name_table)
+def apply_del_names(font, name_ids, platform_id, language_string) -> list:
+    """
+    Deletes one or more namerecords from a font. See the ``del-names`` command for the parameters.
 
-            font.name_table.del_names(
-                name_ids=name_ids,
-                platform_id=platform_id,
-                language_string=language_string,
-            )
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
+    if platform_id is not None:
+        platform_id = int(platform_id)
 
-            if name_table_copy.compile(font) != font.name_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    font.name_table.del_names(
+        name_ids=name_ids,
+        platform_id=platform_id,
+        language_string=language_string,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["name"])
 
 
 @click.group()
@@ -321,33 +327,44 @@ def append(
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_append,
+        params={
+            "name_ids": name_ids,
+            "platform_id": platform_id,
+            "language_string": language_string,
+            "prefix": prefix,
+            "suffix": suffix,
+        },
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_append(font, name_ids, platform_id, language_string, prefix, suffix) -> list:
+    """
+    Appends a prefix, or a suffix to the specified namerecords of a font. See the ``append`` command for the
+    parameters.
+
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
     # Convert to integer because click.Choice() doesn't accept integers
     if platform_id is not None:
         platform_id = int(platform_id)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-
-            name_table_copy = deepcopy(font.name_table)
-
-            font.name_table.append_string(
-                name_ids=name_ids,
-                platform_id=platform_id,
-                language_string=language_string,
-                prefix=prefix,
-                suffix=suffix,
-            )
-
-            # Compile the copy, and the current `name` tables and compare.
-            # `if name_table_copy != font.name_table` doesn't work in this case.
-            if font.name_table.compile(font) != name_table_copy.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
+    font.name_table.append_string(
+        name_ids=name_ids,
+        platform_id=platform_id,
+        language_string=language_string,
+        prefix=prefix,
+        suffix=suffix,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["name"])
 
 
 @click.group()
@@ -415,33 +432,43 @@ def find_replace(
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_find_replace,
+        params={
+            "old_string": old_string,
+            "new_string": new_string,
+            "name_ids": name_ids,
+            "platform_id": platform_id,
+            "exclude_name_id": exclude_name_id,
+        },
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_find_replace(font, old_string, new_string, name_ids, platform_id, exclude_name_id) -> list:
+    """
+    Finds a string in the specified namerecords of a font and replaces it with a new string. See the ``find-replace``
+    command for the parameters.
+
+    :param font: a Font object
+    :return: The tags of the modified tables.
+    """
     if platform_id is not None:
         platform_id = int(platform_id)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-
-            name_table_copy = deepcopy(font.name_table)
+    font.name_table.find_replace(
+        old_string=old_string,
+        new_string=new_string,
+        name_ids_to_include=name_ids,
+        name_ids_to_skip=exclude_name_id,
+        platform_id=platform_id,
+    )
 
-            font.name_table.find_replace(
-                old_string=old_string,
-                new_string=new_string,
-                name_ids_to_include=name_ids,
-                name_ids_to_skip=exclude_name_id,
-                platform_id=platform_id,
-            )
-
-            if name_table_copy.compile(font) != font.name_table.compile(font):
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-
-            else:
-                file_not_changed_message(file)
-
-        except Exception as e:
-            generic_error_message(e)
+    return font.get_changed_tables(["name"])
 
 
 cli = click.CommandCollection(
@@ -456,3 +483,13 @@ cli = click.CommandCollection(
     Command line name table editor.
     """,
 )
+
+# Functions applying each subcommand to a single font, with the font criteria of the subcommand. Used by `ftcli run` to
+# apply the subcommands as recipe steps.
+FONT_OPERATIONS = {
+    "set-name": (apply_set_name, {}),
+    "del-mac-names": (apply_del_mac_names, {}),
+    "del-names": (apply_del_names, {}),
+    "append": (apply_append, {}),
+    "find-replace": (apply_find_replace, {}),
+}
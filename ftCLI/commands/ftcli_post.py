@@ -1,10 +1,8 @@
-from copy import copy
-
 import click
 from fontTools.misc.cliTools import makeOutputFileName
 
 from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
+from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path, process_files
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
@@ -12,6 +10,7 @@ from ftCLI.Lib.utils.click_tools import (
     file_not_changed_message,
     generic_error_message,
 )
+from ftCLI.Lib.utils.font_patcher import get_font_patcher
 
 
 @click.command()
@@ -57,55 +56,58 @@ def cli(input_path, recalcTimestamp, outputDir, overWrite, **kwargs):
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-
-            # Using copy instead of deepcopy and avoid compiling `post` table is faster
-
-            # Make a copy of the `post` table to check later if it has been modified
-            post_table_copy = copy(font.post_table)
-            if font.is_cff:
-                cff_table_copy = copy(font["CFF "])
-            else:
-                cff_table_copy = None
-
-            # Process the arguments
-            if "italic_angle" in params.keys():
-                font.post_table.set_italic_angle(params.get("italic_angle"))
-                if font.is_cff:
-                    font["CFF "].cff.topDictIndex[0].ItalicAngle = int(params.get("italic_angle"))
-
-            if "ul_position" in params.keys():
-                font.post_table.set_underline_position(params.get("ul_position"))
-
-            if "ul_thickness" in params.keys():
-                font.post_table.set_underline_thickness(params.get("ul_thickness"))
-
-            if "fixed_pitch" in params.keys():
-                font.post_table.set_fixed_pitch(params.get("fixed_pitch"))
-
-            font.save(output_file)
-
-            # Check if tables have changed before saving the font. No need to compile here.
-            if not font.is_cff:
-                if (font.post_table.compile(font)) != post_table_copy.compile(font):
-                    font.save(output_file)
-                    file_saved_message(output_file)
-                else:
-                    file_not_changed_message(file)
-
-            else:
-                if cff_table_copy:
-                    if (font.post_table.compile(font), font["CFF "].compile(font)) != (
-                        post_table_copy.compile(font),
-                        cff_table_copy.compile(font),
-                    ):
-                        font.save(output_file)
-                        file_saved_message(output_file)
-                else:
-                    file_not_changed_message(file)
-
-        except Exception as e:
-            generic_error_message(e)
+    process_files(
+        edit_post_file,
+        files,
+        params=params,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def edit_post_file(file, params: dict, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    """
+    Applies the post table editor options to a font file. See ``edit_font_file`` for the parameters.
+    """
+    # The italic angle of CFF fonts is also stored in the CFF table, which can't be patched in place
+    font = get_font_patcher(file, recalcTimestamp=recalcTimestamp)
+    if font is not None and font.is_cff and "italic_angle" in params.keys():
+        font = None
+    if font is None:
+        font = Font(file, recalcTimestamp=recalcTimestamp)
+
+    changed_tables = apply_post(font, **params)
+    if changed_tables:
+        output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+        font.save_tables(output_file, tags=changed_tables)
+        file_saved_message(output_file)
+    else:
+        file_not_changed_message(file)
+
+
+def apply_post(font, **kwargs) -> list:
+    """
+    Applies the post table editor options to a font.
+
+    :param font: a Font or FontPatcher object
+    :param kwargs: the options of the ``post`` command, options set to None are ignored
+    :return: The tags of the modified tables.
+    """
+    params = {k: v for k, v in kwargs.items() if v is not None}
+
+    if "italic_angle" in params.keys():
+        font.post_table.set_italic_angle(params.get("italic_angle"))
+        if font.is_cff:
+            font["CFF "].cff.topDictIndex[0].ItalicAngle = int(params.get("italic_angle"))
+
+    if "ul_position" in params.keys():
+        font.post_table.set_underline_position(params.get("ul_position"))
+
+    if "ul_thickness" in params.keys():
+        font.post_table.set_underline_thickness(params.get("ul_thickness"))
+
+    if "fixed_pitch" in params.keys():
+        font.post_table.set_fixed_pitch(params.get("fixed_pitch"))
+
+    return font.get_changed_tables(["post", "CFF "])
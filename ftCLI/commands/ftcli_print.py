@@ -2,7 +2,7 @@ import click
 
 from ftCLI.Lib.Font import Font
 from ftCLI.Lib.cui import CUI
-from ftCLI.Lib.utils.cli_tools import check_input_path
+from ftCLI.Lib.utils.cli_tools import check_input_path, get_fonts_index
 from ftCLI.Lib.utils.click_tools import generic_error_message, add_file_or_path_argument
 
 
@@ -18,7 +18,7 @@ def fonts_list(input_path):
     Prints a list of fonts with basic information.
     """
     files = check_input_path(input_path)
-    CUI.print_fonts_list(files)
+    CUI.print_fonts_list(files, index=get_fonts_index(input_path))
 
 
 @click.group()
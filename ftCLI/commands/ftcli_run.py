@@ -0,0 +1,191 @@
+import json
+import os
+
+import click
+
+from ftCLI.Lib.utils.cli_tools import (
+    check_input_path,
+    check_output_dir,
+    is_matching_font,
+    process_files,
+    edit_font_file,
+)
+from ftCLI.Lib.utils.click_tools import add_file_or_path_argument, add_common_options, generic_error_message
+from ftCLI.Lib.utils.font_header import FontHeader
+
+# Parameters of the commands that are set by the `run` command itself and can't be used in recipe steps
+RUN_PARAMETERS = ("input_path", "recalcTimestamp", "outputDir", "overWrite")
+
+
+class RecipeStep(object):
+    """
+    A recipe step: a command, or a subcommand, of the ``os2``, ``fix``, ``name`` or ``cff`` commands and its options,
+    validated by the command itself.
+    """
+
+    def __init__(self, name: str, function, params: dict, criteria: dict):
+        self.name = name
+        self.function = function
+        self.params = params
+        self.criteria = criteria
+
+    def apply(self, font, header: FontHeader) -> list:
+        """
+        Applies the step to a font, if the font matches the criteria of the command.
+
+        :param font: a Font object
+        :param header: the FontHeader of the font file
+        :return: The tags of the modified tables.
+        """
+        if not is_matching_font(header, **self.criteria):
+            return []
+        return self.function(font, **self.params)
+
+
+def load_recipe(recipe_file) -> list:
+    """
+    Reads the steps of a JSON or YAML recipe. YAML recipes require PyYAML.
+
+    :param recipe_file: the path to the recipe file
+    :return: A list of steps, each one a dictionary with a "command" and an optional "options" item.
+    """
+    with open(recipe_file, encoding="utf-8") as f:
+        if os.path.splitext(recipe_file)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise click.ClickException("PyYAML is required to read YAML recipes: pip install pyyaml")
+            recipe = yaml.safe_load(f)
+        else:
+            recipe = json.load(f)
+
+    steps = recipe.get("steps") if isinstance(recipe, dict) else recipe
+    if not isinstance(steps, list) or len(steps) == 0:
+        raise click.ClickException("The recipe must contain a non-empty list of steps")
+
+    return [{"command": step} if isinstance(step, str) else step for step in steps]
+
+
+def get_recipe_step(step: dict, input_path) -> RecipeStep:
+    """
+    Finds the command of a recipe step and validates its options, parsing them with the command itself.
+
+    :param step: a dictionary with a "command" item (e.g.: "os2", "fix nbsp-width") and an optional "options"
+        dictionary, whose keys are the long option names of the command (e.g.: "old-string")
+    :param input_path: the INPUT_PATH of the run command, used to build the command context
+    :return: A RecipeStep object.
+    """
+    if not isinstance(step, dict) or not isinstance(step.get("command"), str):
+        raise click.ClickException(f"Invalid recipe step: {step}")
+
+    step_name = " ".join(step["command"].split())
+    command_name, _, subcommand_name = step_name.replace("_", "-").partition(" ")
+    try:
+        mod = __import__(f"ftCLI.commands.ftcli_{command_name}", None, None, ["cli"])
+    except ImportError:
+        raise click.ClickException(f"Unknown command: {command_name}")
+
+    font_operations = getattr(mod, "FONT_OPERATIONS", {})
+    operation = font_operations.get(subcommand_name or None)
+    if operation is None:
+        raise click.ClickException(
+            f"'{step_name}' can't be used in a recipe. Available steps: "
+            f"{', '.join(f'{command_name} {name}'.strip() for name in font_operations) or 'none'}"
+        )
+    function, criteria = operation
+
+    command = mod.cli
+    if subcommand_name:
+        command = command.get_command(click.get_current_context(), subcommand_name)
+
+    options = step.get("options") or {}
+    if not isinstance(options, dict):
+        raise click.ClickException(f"{step_name}: options must be a dictionary")
+
+    param_names = {}
+    for param in command.params:
+        if isinstance(param, click.Option) and param.expose_value and param.name not in RUN_PARAMETERS:
+            param_names[param.name] = param.name
+            for opt in param.opts:
+                param_names[opt.lstrip("-").replace("-", "_")] = param.name
+
+    default_map = {}
+    for key, value in options.items():
+        param_name = param_names.get(str(key).lstrip("-").replace("-", "_"))
+        if param_name is None:
+            raise click.ClickException(f"{step_name}: no such option: {key}")
+        default_map[param_name] = value
+
+    # The options are passed as defaults, so that click converts and validates them as if they were typed
+    try:
+        ctx = command.make_context(f"ftcli {step_name}", [input_path], default_map=default_map)
+    except click.ClickException as e:
+        raise click.ClickException(f"{step_name}: {e.format_message()}")
+
+    params = {k: v for k, v in ctx.params.items() if k not in RUN_PARAMETERS}
+    return RecipeStep(step_name, function, params, criteria)
+
+
+@click.command()
+@click.argument("recipe", type=click.Path(exists=True, dir_okay=False, resolve_path=True))
+@add_file_or_path_argument()
+@add_common_options()
+def cli(recipe, input_path, recalcTimestamp=False, outputDir=None, overWrite=True):
+    """
+    Applies the steps of a recipe to one or more fonts, loading and saving each font only once.
+
+    RECIPE is a JSON file (or a YAML file, if PyYAML is installed) containing a list of steps. Each step is a command,
+    or a subcommand, of the `os2`, `fix`, `name` and `cff` commands, with its options. Option names are the long option
+    names of the command, without the leading dashes. For example:
+
+    \b
+    {
+      "steps": [
+        {"command": "os2", "options": {"weight": 400, "italic": false}},
+        {"command": "fix nbsp-width"},
+        {"command": "name find-replace", "options": {"old-string": "Foo", "new-string": "Bar"}},
+        {"command": "cff fix-version"}
+      ]
+    }
+
+    Steps are applied in the given order. Steps that don't apply to a font (for example, CFF steps and TrueType fonts)
+    are skipped. The font is saved only if at least one step has changed it.
+    """
+
+    try:
+        steps = [get_recipe_step(step, input_path) for step in load_recipe(recipe)]
+    except (OSError, ValueError, click.ClickException) as e:
+        generic_error_message(e.format_message() if isinstance(e, click.ClickException) else e)
+        return
+
+    files = check_input_path(input_path)
+    output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
+
+    process_files(
+        edit_font_file,
+        files,
+        apply_function=apply_recipe,
+        params={"steps": steps},
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def apply_recipe(font, steps: list) -> list:
+    """
+    Applies the steps of a recipe to a font.
+
+    :param font: a Font object
+    :param steps: a list of RecipeStep objects
+    :return: The tags of the tables modified by any of the steps.
+    """
+    header = FontHeader(font.file)
+
+    changed_tables = []
+    for step in steps:
+        for tag in step.apply(font, header):
+            if tag not in changed_tables:
+                changed_tables.append(tag)
+
+    return changed_tables
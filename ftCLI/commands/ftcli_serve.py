@@ -0,0 +1,52 @@
+import click
+
+from ftCLI.Lib.utils.click_tools import generic_error_message
+from ftCLI.Lib.utils.daemon import get_socket_path, is_supported, serve
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, resolve_path=True),
+    help="""
+    Path to the server socket. If not specified, the FTCLI_SOCKET environment variable is used, or a file in the runtime
+    directory of the user.""",
+)
+@click.option(
+    "--preload/--no-preload",
+    default=True,
+    help="""
+    Import the optional modules used by the commands (fontTools instancer, psautohint, ttfautohint, skia-pathops...) at
+    startup. By default, they are imported.""",
+)
+def cli(socket_path=None, preload=True):
+    """
+    Runs a server that keeps the ftCLI modules loaded and runs commands sent by `ftcli --client`.
+
+    Starting the interpreter and importing fontTools and the other modules used by the commands often takes longer than
+    processing a font. The server imports them once, and runs each command in a process forked from itself, so that
+    commands start immediately and can't affect each other. Commands read and write the standard streams of the client,
+    run in its working directory and with its environment variables, and their exit status is returned by the client.
+
+    Example:
+
+        ftcli serve &
+
+        ftcli --client os2 --weight 400 ./fonts
+
+    When no server is running, `ftcli --client` runs the command by itself. The server is stopped with CTRL+C.
+
+    Only available on systems supporting Unix domain sockets and fork() (Linux, macOS).
+    """
+    if not is_supported():
+        generic_error_message("The server requires Unix domain sockets and fork(), not available on this system")
+        raise SystemExit(1)
+
+    try:
+        serve(socket_path or get_socket_path(), preload=preload)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        generic_error_message(e)
+        raise SystemExit(1)
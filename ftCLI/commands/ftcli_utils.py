@@ -2,25 +2,22 @@ import os
 import time
 from io import BytesIO
 
-import cffsubr
 import click
-from afdko import checkoutlinesufo
-from dehinter.font import dehint
-from fontTools.cffLib.specializer import specializeProgram
 from fontTools.misc.cliTools import makeOutputFileName
-from fontTools.ttLib.removeOverlaps import removeOverlaps
-from pathvalidate import sanitize_filepath, sanitize_filename
 
 from ftCLI.Lib.Font import Font
-from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path
+from ftCLI.Lib.utils.cli_tools import check_output_dir, check_input_path, get_fonts_index, process_files
 from ftCLI.Lib.utils.click_tools import (
     add_file_or_path_argument,
     add_common_options,
+    blank_line,
     generic_error_message,
     file_saved_message,
     file_not_changed_message,
     generic_info_message,
 )
+from ftCLI.Lib.utils.fonts_index import get_font_record
+from ftCLI.Lib.utils.output_writer import save_font, flush_output_files
 from ftCLI.Lib.utils.subsetter import BaseSubsetter
 
 
@@ -40,18 +37,18 @@ def add_dsig(input_path, outputDir=None, recalcTimestamp=False, overWrite=True):
     files = check_input_path(input_path, allow_extensions=[".otf", ".ttf", ".woff"])
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            if "DSIG" not in font:
-                font.add_dummy_dsig()
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(f"DSIG table is already present in {os.path.basename(file)}")
-        except Exception as e:
-            generic_error_message(e)
+    process_files(add_dsig_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite)
+
+
+def add_dsig_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    if "DSIG" not in font:
+        font.add_dummy_dsig()
+        output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+        save_font(font, output_file)
+        file_saved_message(output_file)
+    else:
+        file_not_changed_message(f"DSIG table is already present in {os.path.basename(file)}")
 
 
 @click.group()
@@ -98,26 +95,29 @@ def font_organizer(
     Family name + Version (optional: -v, --version), and a subdirectory named after the font's extension (optional: -e,
     --extension).
     """
+    from pathvalidate import sanitize_filepath
 
-    files = check_input_path(input_path)
+    # Files are moved while processing them: the list is built before, so that moved files are not found again.
+    files = list(check_input_path(input_path))
+    index = get_fonts_index(input_path)
 
     for file in files:
         try:
-            font = Font(file)
-            family_name = font.guess_family_name()
-            extension = font.get_real_extension()
+            record = get_font_record(file, index=index)
+            family_name = record.family_name
+            extension = record.get_real_extension()
             file_name = os.path.basename(file)
             if rename_source:
-                file_name = f"{font.get_file_name(source=int(rename_source))}{extension}"
+                file_name = f"{record.get_file_name(source=int(rename_source))}{extension}"
 
-            version_string = font.name_table.getDebugName(5).replace("Version ", "v").split(";")[0]
+            version_string = record.version_string.replace("Version ", "v").split(";")[0]
 
             output_dir = os.path.join(os.path.dirname(file))
 
             if sort_by_manufacturer:
-                manufacturer = font.name_table.getDebugName(8).strip()
+                manufacturer = record.manufacturer.strip()
                 if manufacturer == "":
-                    manufacturer = font.os_2_table.achVendID.strip().strip("\x00")
+                    manufacturer = record.vendor_id.strip().strip("\x00")
                 if manufacturer != "":
                     output_dir = os.path.join(output_dir, manufacturer)
 
@@ -132,6 +132,8 @@ def font_organizer(
             output_file = makeOutputFileName(file_name, outputDir=output_dir, overWrite=False)
             output_file = sanitize_filepath(output_file, platform="auto")
             os.renames(file, output_file)
+            if index is not None:
+                index.rename(file, output_file)
             generic_info_message(f"{os.path.basename(file)} moved")
 
         except Exception as e:
@@ -168,25 +170,27 @@ def font_renamer(input_path, source):
     `--source` parameter passed by the user, and renames the font file to match the metadata, adding the correct
     extension.
     """
+    from pathvalidate import sanitize_filename
 
-    files = check_input_path(input_path)
+    files = list(check_input_path(input_path))
+    index = get_fonts_index(input_path)
 
     # Conversion to integer is needed because click.Choice() only accepts strings
     source = int(source)
 
     for file in files:
         try:
-            font = Font(file)
+            record = get_font_record(file, index=index)
 
             # Read the PostScript Name if the user passed 4 or 5 but the font isn't CFF
-            if font.is_true_type:
+            if record.is_true_type:
                 if source in (4, 5):
                     source = 1
 
-            old_file_name, old_extension = os.path.splitext(os.path.basename(font.file))
+            old_file_name, old_extension = os.path.splitext(os.path.basename(file))
 
-            new_file_name = sanitize_filename(font.get_file_name(source=source), platform="auto")
-            new_extension = font.get_real_extension()
+            new_file_name = sanitize_filename(record.get_file_name(source=source), platform="auto")
+            new_extension = record.get_real_extension()
 
             output_file = os.path.join(os.path.dirname(file), f"{new_file_name}{new_extension}")
 
@@ -197,6 +201,8 @@ def font_renamer(input_path, source):
                 except FileExistsError:
                     output_file = makeOutputFileName(output_file, outputDir=os.path.dirname(file), overWrite=False)
                     os.renames(file, output_file)
+                if index is not None:
+                    index.rename(file, output_file)
                 file_saved_message(f"{os.path.basename(file)} --> {os.path.basename(output_file)}")
             else:
                 file_not_changed_message(file)
@@ -225,34 +231,40 @@ def del_table(input_path, table_tag, recalcTimestamp=False, outputDir=None, over
     Deletes the tables specified in the table_tag argument(s).
     """
 
-    # Use TTFont instead of Font to avoid exceptions when subclassed tables are not present
-    from fontTools.ttLib.ttFont import TTFont
-
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
     table_tag = [tag.ljust(4, " ") for tag in table_tag]
 
-    for file in files:
-        try:
-            font = TTFont(file, recalcTimestamp=recalcTimestamp)
-            count = 0
-            for tag in table_tag:
-                if tag in font.keys():
-                    del font[tag]
-                    count += 1
-                else:
-                    continue
-
-            if count > 0:
-                output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-                font.save(output_file)
-                file_saved_message(output_file)
-            else:
-                file_not_changed_message(file)
+    process_files(
+        del_table_file,
+        files,
+        table_tag=table_tag,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+
+def del_table_file(file, table_tag: list, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    # Use TTFont instead of Font to avoid exceptions when subclassed tables are not present
+    from fontTools.ttLib.ttFont import TTFont
+
+    font = TTFont(file, recalcTimestamp=recalcTimestamp)
+    count = 0
+    for tag in table_tag:
+        if tag in font.keys():
+            del font[tag]
+            count += 1
+        else:
+            continue
+
+    if count > 0:
+        output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+        save_font(font, output_file)
+        file_saved_message(output_file)
+    else:
+        file_not_changed_message(file)
 
 
 @click.group()
@@ -268,25 +280,27 @@ def ttf_autohint(input_path, outputDir=None, recalcTimestamp=False, overWrite=Tr
     Autohints TrueType fonts using ttfautohint-py.
     """
 
-    from ttfautohint import ttfautohint
-
     files = check_input_path(input_path, allow_cff=False, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            buf = BytesIO()
-            font.save(buf)
-            data = ttfautohint(in_buffer=buf.getvalue(), no_info=True)
-            hinted_font = Font(BytesIO(data))
-            if recalcTimestamp is False:
-                hinted_font.head_table.modified = font.get_modified_timestamp()
-            output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
-            hinted_font.save(output_file)
-            file_saved_message(output_file)
-        except Exception as e:
-            generic_error_message(e)
+    process_files(
+        ttf_autohint_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite
+    )
+
+
+def ttf_autohint_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    from ttfautohint import ttfautohint
+
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    buf = BytesIO()
+    font.save(buf)
+    data = ttfautohint(in_buffer=buf.getvalue(), no_info=True)
+    hinted_font = Font(BytesIO(data))
+    if recalcTimestamp is False:
+        hinted_font.head_table.modified = font.get_modified_timestamp()
+    output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
+    save_font(hinted_font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -337,30 +351,38 @@ def ttf_dehint(
     files = check_input_path(input_path, allow_cff=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            dehint(
-                font,
-                keep_cvar=keep_cvar,
-                keep_cvt=keep_cvt,
-                keep_fpgm=keep_fpgm,
-                keep_gasp=keep_gasp,
-                keep_glyf=keep_glyf,
-                keep_head=keep_head,
-                keep_hdmx=keep_hdmx,
-                keep_ltsh=keep_ltsh,
-                keep_maxp=keep_maxp,
-                keep_prep=keep_prep,
-                keep_ttfa=keep_ttfa,
-                keep_vdmx=keep_vdmx,
-                verbose=verbose,
-            )
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            file_saved_message(output_file)
-        except Exception as e:
-            generic_error_message(e)
+    process_files(
+        ttf_dehint_file,
+        files,
+        dehint_options=dict(
+            keep_cvar=keep_cvar,
+            keep_cvt=keep_cvt,
+            keep_fpgm=keep_fpgm,
+            keep_gasp=keep_gasp,
+            keep_glyf=keep_glyf,
+            keep_head=keep_head,
+            keep_hdmx=keep_hdmx,
+            keep_ltsh=keep_ltsh,
+            keep_maxp=keep_maxp,
+            keep_prep=keep_prep,
+            keep_ttfa=keep_ttfa,
+            keep_vdmx=keep_vdmx,
+            verbose=verbose,
+        ),
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+
+def ttf_dehint_file(file, dehint_options: dict, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    from dehinter.font import dehint
+
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    dehint(font, **dehint_options)
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -386,16 +408,24 @@ def ttf_remove_overlaps(input_path, ignore_errors, outputDir=None, recalcTimesta
     files = check_input_path(input_path, allow_cff=False, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
-            removeOverlaps(font, removeHinting=True, ignoreErrors=ignore_errors)
-            font.save(output_file)
-            file_saved_message(output_file)
+    process_files(
+        ttf_remove_overlaps_file,
+        files,
+        ignore_errors=ignore_errors,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+
+def ttf_remove_overlaps_file(file, ignore_errors=False, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    from fontTools.ttLib.removeOverlaps import removeOverlaps
+
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
+    removeOverlaps(font, removeHinting=True, ignoreErrors=ignore_errors)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -414,18 +444,22 @@ def cff_check_outlines(input_path, outputDir=None, recalcTimestamp=False, overWr
     files = check_input_path(input_path, allow_ttf=False, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        print()
-        generic_info_message(f"Checking file {os.path.basename(file)}")
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            checkoutlinesufo.run(args=[output_file, "--error-correction-mode", "--quiet-mode"])
-            file_saved_message(output_file)
+    process_files(
+        cff_check_outlines_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite
+    )
 
-        except Exception as e:
-            generic_error_message(e)
+
+def cff_check_outlines_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    from afdko import checkoutlinesufo
+
+    blank_line()
+    generic_info_message(f"Checking file {os.path.basename(file)}")
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    flush_output_files()
+    checkoutlinesufo.run(args=[output_file, "--error-correction-mode", "--quiet-mode"])
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -513,65 +547,74 @@ def cff_autohint(
     Autohints CFF fonts with psautohint.
     """
 
-    from psautohint.autohint import ACOptions, hintFiles
-
     files = check_input_path(input_path, allow_extensions=[".otf"])
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
     start_time = time.time()
-    counter = 0
-    for file in files:
-        t = time.time()
-        counter += 1
-        try:
-            print()
-            generic_info_message(f"Autohinting file {os.path.basename(file)}: {counter} of {len(files)}")
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            original_timestamp = font.get_modified_timestamp()
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            font.close()
-
-            options = ACOptions()
-            options.inputPaths = [file]
-            options.outputPaths = [output_file]
-            options.reference_font = reference_font
-            options.allowChanges = allow_changes
-            options.round_coords = decimal
-            options.noFlex = no_flex
-            options.noHintSub = no_hint_sub
-            options.allow_no_blues = no_zones_stems
-
-            try:
-                hintFiles(options=options)
-            except Exception as e:
-                generic_error_message(e)
-                continue
-
-            if not recalcTimestamp:
-                tmp_font = Font(output_file, recalcTimestamp=False)
-                tmp_font.head_table.modified = original_timestamp
-                tmp_font.save(output_file)
-
-            if optimize:
-                generic_info_message("Performing charstrings optimization")
-                otf = Font(output_file, recalcTimestamp=recalcTimestamp)
-                top_dict = otf["CFF "].cff.topDictIndex[0]
-                charstrings = top_dict.CharStrings
-                for charstring in charstrings.values():
-                    charstring.decompile()
-                    charstring.program = specializeProgram(charstring.program)
-                cffsubr.subroutinize(otf, keep_glyph_names=False)
-                otf.save(output_file)
-
-            generic_info_message(f"Done in {round(time.time() - t, 3)}")
-            file_saved_message(output_file)
+    results = process_files(
+        cff_autohint_file,
+        files,
+        hinting_options=dict(
+            reference_font=reference_font,
+            allowChanges=allow_changes,
+            round_coords=decimal,
+            noFlex=no_flex,
+            noHintSub=no_hint_sub,
+            allow_no_blues=no_zones_stems,
+        ),
+        optimize=optimize,
+        output_dir=output_dir,
+        recalcTimestamp=recalcTimestamp,
+        overWrite=overWrite,
+    )
+
+    blank_line()
+    generic_info_message(f"Total files  : {len(results)}")
+    generic_info_message(f"Elapsed time : {round(time.time() - start_time, 3)} seconds")
 
-        except Exception as e:
-            generic_error_message(e)
 
-    print()
-    generic_info_message(f"Total files  : {len(files)}")
-    generic_info_message(f"Elapsed time : {round(time.time() - start_time, 3)} seconds")
+def cff_autohint_file(
+    file, hinting_options: dict, optimize=True, output_dir=None, recalcTimestamp=False, overWrite=True
+) -> None:
+    import cffsubr
+    from fontTools.cffLib.specializer import specializeProgram
+    from psautohint.autohint import ACOptions, hintFiles
+
+    t = time.time()
+    blank_line()
+    generic_info_message(f"Autohinting file {os.path.basename(file)}")
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    original_timestamp = font.get_modified_timestamp()
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    font.close()
+
+    options = ACOptions()
+    options.inputPaths = [file]
+    options.outputPaths = [output_file]
+    for k, v in hinting_options.items():
+        setattr(options, k, v)
+
+    hintFiles(options=options)
+
+    if not recalcTimestamp:
+        tmp_font = Font(output_file, recalcTimestamp=False)
+        tmp_font.head_table.modified = original_timestamp
+        save_font(tmp_font, output_file)
+
+    if optimize:
+        generic_info_message("Performing charstrings optimization")
+        flush_output_files()
+        otf = Font(output_file, recalcTimestamp=recalcTimestamp)
+        top_dict = otf["CFF "].cff.topDictIndex[0]
+        charstrings = top_dict.CharStrings
+        for charstring in charstrings.values():
+            charstring.decompile()
+            charstring.program = specializeProgram(charstring.program)
+        cffsubr.subroutinize(otf, keep_glyph_names=False)
+        save_font(otf, output_file)
+
+    generic_info_message(f"Done in {round(time.time() - t, 3)}")
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -589,18 +632,17 @@ def cff_dehint(input_path, outputDir=None, recalcTimestamp=False, overWrite=True
     files = check_input_path(input_path, allow_ttf=False, allow_variable=False)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            glyph_ids = [i for i in font.getReverseGlyphMap().values()]
-            subsetter = BaseSubsetter(glyph_ids=glyph_ids)
-            subsetter.subset(font)
-            output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            file_saved_message(output_file)
+    process_files(cff_dehint_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite)
 
-        except Exception as e:
-            generic_error_message(e)
+
+def cff_dehint_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    glyph_ids = [i for i in font.getReverseGlyphMap().values()]
+    subsetter = BaseSubsetter(glyph_ids=glyph_ids)
+    subsetter.subset(font)
+    output_file = makeOutputFileName(font.file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -619,15 +661,17 @@ def cff_subr(input_path, recalcTimestamp=False, outputDir=None, overWrite=True):
     files = check_input_path(input_path, allow_extensions=[".otf"])
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cffsubr.subroutinize(otf=font, keep_glyph_names=False)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            file_saved_message(output_file)
-        except Exception as e:
-            generic_error_message(e)
+    process_files(cff_subr_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite)
+
+
+def cff_subr_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    import cffsubr
+
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    cffsubr.subroutinize(otf=font, keep_glyph_names=False)
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -645,16 +689,17 @@ def cff_desubr(input_path, recalcTimestamp=False, outputDir=None, overWrite=True
     files = check_input_path(input_path, allow_extensions=[".otf"])
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = Font(file, recalcTimestamp=recalcTimestamp)
-            cffsubr.desubroutinize(otf=font)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            file_saved_message(output_file)
+    process_files(cff_desubr_file, files, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite)
 
-        except Exception as e:
-            generic_error_message(e)
+
+def cff_desubr_file(file, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    import cffsubr
+
+    font = Font(file, recalcTimestamp=recalcTimestamp)
+    cffsubr.desubroutinize(otf=font)
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 @click.group()
@@ -682,30 +727,33 @@ def scale_upm(input_path, upm=1000, recalcTimestamp=False, outputDir=None, overW
     ttf-autohint' to hint the scaled fonts. In addition, CFF scaled fonts are not subroutinized. Subroutines can be
     applied using the 'ftcli utils cff-subr' command.
     """
-    from fontTools.ttLib.scaleUpem import scale_upem
-    from fontTools.ttLib.ttFont import TTFont
 
     files = check_input_path(input_path)
     output_dir = check_output_dir(input_path=input_path, output_path=outputDir)
 
-    for file in files:
-        try:
-            font = TTFont(file, recalcTimestamp=recalcTimestamp)
-            if font["head"].unitsPerEm == upm:
-                file_not_changed_message(file)
-                continue
+    process_files(
+        scale_upm_file, files, upm=upm, output_dir=output_dir, recalcTimestamp=recalcTimestamp, overWrite=overWrite
+    )
 
-            # Remove overlaps and hinting from TrueType fonts.
-            if font.sfntVersion != "OTTO" and "fpgm" in font:
-                removeOverlaps(font, removeHinting=True)
 
-            scale_upem(font=font, new_upem=upm)
-            output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
-            font.save(output_file)
-            file_saved_message(output_file)
+def scale_upm_file(file, upm=1000, output_dir=None, recalcTimestamp=False, overWrite=True) -> None:
+    from fontTools.ttLib.removeOverlaps import removeOverlaps
+    from fontTools.ttLib.scaleUpem import scale_upem
+    from fontTools.ttLib.ttFont import TTFont
 
-        except Exception as e:
-            generic_error_message(e)
+    font = TTFont(file, recalcTimestamp=recalcTimestamp)
+    if font["head"].unitsPerEm == upm:
+        file_not_changed_message(file)
+        return
+
+    # Remove overlaps and hinting from TrueType fonts.
+    if font.sfntVersion != "OTTO" and "fpgm" in font:
+        removeOverlaps(font, removeHinting=True)
+
+    scale_upem(font=font, new_upem=upm)
+    output_file = makeOutputFileName(file, outputDir=output_dir, overWrite=overWrite)
+    save_font(font, output_file)
+    file_saved_message(output_file)
 
 
 cli = click.CommandCollection(
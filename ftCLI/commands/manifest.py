@@ -0,0 +1,21 @@
+# Generated by `python -m ftCLI.Lib.utils.commands_manifest`, do not edit. Run it again after adding a command, or
+# changing the first paragraph of the help of a command.
+
+COMMANDS = {
+    "assistant": (
+        "Helps to correctly fill name table, as well as other values as usWeightClass, usWidthClass, bold, italic and"
+        " oblique bits."
+    ),
+    "cff": "Command line CFF table editor.",
+    "converter": "Font converter.",
+    "fix": "A set of commands to detect and automatically fix font errors.",
+    "hhea": "Command line hhea table editor.",
+    "metrics": "Vertical metrics tools.",
+    "name": "Command line name table editor.",
+    "os2": "Command line OS/2 table editor.",
+    "post": "Command line post table editor.",
+    "print": "Prints various fonts information and tables.",
+    "run": "Applies the steps of a recipe to one or more fonts, loading and saving each font only once.",
+    "serve": "Runs a server that keeps the ftCLI modules loaded and runs commands sent by `ftcli --client`.",
+    "utils": "Miscellaneous utilities.",
+}
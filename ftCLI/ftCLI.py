@@ -1,18 +1,21 @@
-import os
+import sys
 
 import click
+from click.utils import make_default_short_help
 
-plugin_folder = os.path.join(os.path.dirname(__file__), "commands")
+from ftCLI.commands.manifest import COMMANDS
+from ftCLI.Lib.utils.click_tools import add_log_options
 
 
 class FtCLI(click.MultiCommand):
+    """
+    Loads the commands from the ``ftcli_<name>`` modules in the ``commands`` folder when they are run. The commands are
+    listed, with their help, from the generated ``commands/manifest.py`` file, so that ``ftcli --help`` doesn't import
+    them.
+    """
+
     def list_commands(self, ctx):
-        rv = []
-        for filename in os.listdir(plugin_folder):
-            if filename.endswith(".py") and filename.startswith("ftcli_"):
-                rv.append(filename[6:-3])
-        rv.sort()
-        return rv
+        return sorted(COMMANDS)
 
     def get_command(self, ctx, cmd_name):
         try:
@@ -23,9 +26,69 @@ class FtCLI(click.MultiCommand):
 
         return mod.cli
 
+    def format_commands(self, ctx, formatter):
+        commands = self.list_commands(ctx)
+        if not commands:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in commands)
+        rows = [(name, make_default_short_help(COMMANDS[name], limit)) for name in commands]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+cli = add_log_options()(
+    FtCLI(
+        help="""
+        A command line font editor.
+
+        Use `ftcli --client COMMAND ...` to run the command on the server started with `ftcli serve`, which keeps the
+        modules loaded between commands. If no server is running, the command runs as usual. `--client` can be placed
+        anywhere before the command name.
+
+        Use `ftcli --log-format ndjson COMMAND ...` to print the messages as JSON lines, to be read by other programs.
+        """
+    )
+)
 
-cli = FtCLI(help="A command line font editor.")
+
+def write_pending_output_files() -> bool:
+    """
+    Waits for the output files still being written in the background (see ``OutputWriter``), so that the exit status
+    is an error if one of them can't be written.
+
+    :return: True if all the output files have been written.
+    """
+    # The output writer is imported only by the commands that save files
+    output_writer = sys.modules.get("ftCLI.Lib.utils.output_writer")
+    return output_writer is None or output_writer.write_pending_output_files()
+
+
+def _pop_client_option(args: list) -> bool:
+    # --client is handled before click parses the arguments, so it's only looked for before the command name, where the
+    # options of ftcli are
+    for index, arg in enumerate(args):
+        if arg in COMMANDS or arg == "--":
+            return False
+        if arg == "--client":
+            del args[index]
+            return True
+    return False
 
 
 def main():
-    cli()
+    args = sys.argv[1:]
+    if _pop_client_option(args):
+        # The client is imported only when needed, and doesn't import the commands
+        from ftCLI.Lib.utils.daemon import run_client
+
+        status = run_client(args)
+        if status is not None:
+            sys.exit(status)
+
+    try:
+        cli(args=args)
+    except SystemExit as e:
+        if not write_pending_output_files() and not e.code:
+            sys.exit(1)
+        raise
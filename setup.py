@@ -14,7 +14,7 @@ setuptools.setup(
     author="ftCLI",
     author_email="ftcli@proton.me",
     url="https://github.com/ftCLI/ftCLI",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
     entry_points={"console_scripts": ["ftcli=ftCLI.ftCLI:main"]},
     install_requires=[